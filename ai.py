@@ -0,0 +1,237 @@
+"""
+ai.py
+
+CPU player drivers. A driver plugs in where the Controller would, setting a
+player's `dy` and `shoot` each frame from the current Model state. Drivers
+range from a random policy to a lookahead search over cloned Models.
+
+Classes:
+    RandomDriver: Moves and shoots at random.
+    HeuristicDriver: Lines up with the nearest alien heading for its side and shoots.
+    LookaheadDriver: Simulates each candidate action ahead on Model clones within a time budget.
+
+Functions:
+    simulate_tick(model, drivers): Advances a model by one frame the way game.main does.
+"""
+
+import random
+import time
+
+# Candidate (dy, shoot) actions considered by the lookahead search
+ACTIONS = [(dy, shoot) for dy in (-3, 0, 3) for shoot in (False, True)]
+
+
+def _own_player(model, player_id):
+    """
+    Get the player a driver controls and its strongest opponent.
+    Args:
+        model (Model): Game state.
+        player_id (int): ID of the controlled player.
+    Returns:
+        tuple: (player, opponent), where the opponent is the highest-scoring
+        player on the other side.
+    """
+    player = model.get_player(player_id)
+    opponent = max(model.opponents_of(player.side), key=lambda other: other.score)
+    return player, opponent
+
+
+def simulate_tick(model, drivers):
+    """
+    Advance the model by one frame, in the same order as the game loop.
+    Args:
+        model (Model): Game state to advance.
+        drivers (list): Drivers to consult before the frame.
+    """
+    for driver in drivers:
+        driver.update(model)
+    for player in model.players:
+        player.move()
+    model.fire_pending()
+    model.update()
+
+
+class RandomDriver:
+    """
+    Driver that changes direction and fires at random.
+
+    Attributes:
+        player_id (int): ID of the controlled player.
+        rng (random.Random): Random source for decisions.
+        change_every (int): Frames between direction changes.
+    """
+
+    def __init__(self, player_id, rng=None, change_every=20):
+        self.player_id = player_id
+        self.rng = rng or random.Random()
+        self.change_every = change_every
+        self._frames = 0
+        self._dy = 0
+
+    def update(self, model):
+        """
+        Set the controlled player's movement and shoot flag.
+        Args:
+            model (Model): Current game state.
+        """
+        player = model.get_player(self.player_id)
+        if self._frames % self.change_every == 0:
+            self._dy = self.rng.choice((-3, 0, 3))
+        self._frames += 1
+        player.dy = self._dy
+        player.shoot = self.rng.random() < 0.1
+
+
+class HeuristicDriver:
+    """
+    Driver that tracks the closest alien heading for its side of the screen
+    within reach of its lane, and fires once it is lined up.
+
+    Attributes:
+        player_id (int): ID of the controlled player.
+        deadzone (int): Vertical distance within which the player stops moving.
+    """
+
+    def __init__(self, player_id, deadzone=4):
+        self.player_id = player_id
+        self.deadzone = deadzone
+
+    def update(self, model):
+        """
+        Set the controlled player's movement and shoot flag.
+        Args:
+            model (Model): Current game state.
+        """
+        player = model.get_player(self.player_id)
+        heading = -1 if player.side == "left" else 1
+        top, bottom = player.lane[0] - 20, player.lane[1] + 20
+        target = None
+        for alien in model.aliens:
+            if (
+                alien.speed_x * heading > 0
+                and top <= alien.y <= bottom
+                and (
+                    target is None or abs(alien.x - player.x) < abs(target.x - player.x)
+                )
+            ):
+                target = alien
+        if target is None:
+            player.dy = 0
+            player.shoot = False
+            return
+        offset = target.y - player.y
+        if abs(offset) <= self.deadzone:
+            player.dy = 0
+        else:
+            player.dy = 3 if offset > 0 else -3
+        player.shoot = abs(offset) < 20
+
+
+class LookaheadDriver:
+    """
+    Driver that picks the action with the best simulated outcome.
+
+    Each candidate action is held for `commit_ticks` frames on a clone of the
+    model, after which both sides play the heuristic policy until `horizon`
+    frames have passed. The heuristic policy itself is the baseline candidate
+    and is only overridden by an action that simulates strictly better.
+    Rollouts are resumable, so a search is spread over as many frames as the
+    per-frame budget requires; the chosen action is played for at most
+    `commit_ticks` frames before falling back to the heuristic.
+
+    Attributes:
+        player_id (int): ID of the controlled player.
+        horizon (int): Frames simulated per candidate.
+        commit_ticks (int): Frames the candidate action is held for.
+        budget (float): Seconds of search allowed per frame.
+        action (tuple): (dy, shoot) currently being played, or None for the heuristic.
+    """
+
+    def __init__(self, player_id, horizon=240, commit_ticks=20, budget_ms=4.0):
+        self.player_id = player_id
+        self.horizon = horizon
+        self.commit_ticks = commit_ticks
+        self.budget = budget_ms / 1000
+        self.action = None
+        self._action_frames = 0
+        self._self_policy = HeuristicDriver(player_id)
+        self._other_policies = ()
+        self._root = None
+        self._pending = []
+        self._scores = {}
+        self._sim = None
+        self._sim_action = None
+        self._sim_ticks = 0
+
+    def update(self, model):
+        """
+        Continue the search within this frame's budget and play the best known action.
+        Args:
+            model (Model): Current game state.
+        """
+        deadline = time.perf_counter() + self.budget
+        if self._root is None:
+            self._root = model.clone()
+            self._other_policies = [
+                HeuristicDriver(other.player_id)
+                for other in model.players
+                if other.player_id != self.player_id
+            ]
+            self._pending = list(ACTIONS) + [None]
+            self._scores = {}
+
+        while self._sim is not None or self._pending:
+            if self._sim is None:
+                self._sim_action = self._pending.pop()
+                self._sim = self._root.clone()
+                self._sim_ticks = 0
+            if not self._advance_rollout(deadline):
+                break
+
+        if self._sim is None and not self._pending:
+            baseline = self._scores.pop(None)
+            best = max(self._scores, key=self._scores.get)
+            self.action = best if self._scores[best] > baseline else None
+            self._action_frames = 0
+            self._root = None
+
+        if self.action is not None and self._action_frames >= self.commit_ticks:
+            self.action = None
+        if self.action is None:
+            self._self_policy.update(model)
+        else:
+            player = model.get_player(self.player_id)
+            player.dy, player.shoot = self.action
+            self._action_frames += 1
+
+    def _advance_rollout(self, deadline):
+        """
+        Simulate the current rollout until it finishes or the deadline passes.
+        Args:
+            deadline (float): perf_counter time at which to stop.
+        Returns:
+            bool: True if the rollout finished.
+        """
+        sim = self._sim
+        player, opponent = _own_player(sim, self.player_id)
+        while self._sim_ticks < self.horizon and sim.get_winner() is None:
+            if time.perf_counter() >= deadline:
+                return False
+            if self._sim_action is not None and self._sim_ticks < self.commit_ticks:
+                player.dy, player.shoot = self._sim_action
+            else:
+                self._self_policy.update(sim)
+            simulate_tick(sim, self._other_policies)
+            self._sim_ticks += 1
+
+        heading = -1 if player.side == "left" else 1
+        threat = sum(
+            alien.health for alien in sim.aliens if alien.speed_x * heading > 0
+        )
+        self._scores[self._sim_action] = (
+            10 * (player.score - opponent.score)
+            + (player.health - opponent.health)
+            - 0.01 * threat
+        )
+        self._sim = None
+        return True
@@ -0,0 +1,175 @@
+"""
+assets.py
+
+Sprite loading backed by a packed asset bundle. An offline build step
+pre-scales every sprite to its in-game size and stores the raw pixels in a
+single file. At runtime the file is memory-mapped and surfaces are created
+straight from the mapped bytes, with no image decoding or scaling. When the
+bundle has not been built, sprites are loaded and scaled from the loose files.
+
+Usage:
+    python assets.py        # builds ASSET_BUNDLE_PATH
+
+Functions:
+    build_bundle(path): Packs every sprite into a bundle file.
+    open_bundle(path): Memory-maps a bundle and indexes its sprites.
+    load_sprite(name): Returns a sprite at its in-game size, loading it only once.
+"""
+
+# pylint: disable=no-member
+
+import json
+import mmap
+import struct
+import sys
+import pygame
+from settings import (
+    ALIEN_SIZE,
+    ASSET_BUNDLE_PATH,
+    BULLET_SIZE,
+    HEART_SIZE,
+    HEIGHT,
+    PLAYER_SIZE,
+    WIDTH,
+)
+
+# Name -> (source file, in-game size, pixel format). BGRA matches the layout
+# convert_alpha() produces on common displays, so bundled sprites blit as fast
+# as converted ones. The opaque background is stored as RGB and converted to
+# the display's layout once when loaded. Without a display, as on a headless
+# server, sprites are kept in their loaded format.
+SPRITES = {
+    "player1": ("assets/player1.png", PLAYER_SIZE, "BGRA"),
+    "player2": ("assets/player2.png", PLAYER_SIZE, "BGRA"),
+    "alien": ("assets/alien.png", ALIEN_SIZE, "BGRA"),
+    "bullet": ("assets/bullets.png", BULLET_SIZE, "BGRA"),
+    "green_heart": ("assets/greenh.png", HEART_SIZE, "BGRA"),
+    "red_heart": ("assets/redh.png", HEART_SIZE, "BGRA"),
+    "background": ("assets/space.jpg", (WIDTH, HEIGHT), "RGB"),
+}
+
+MAGIC = b"CCAB"
+HEADER = struct.Struct("<4sII")  # magic, version, index length
+VERSION = 1
+ALIGNMENT = 64
+
+_bundle = None
+_sprites = {}
+
+
+def _load_loose(name):
+    """
+    Decode and scale a sprite from its loose source file. It is converted to
+    the display's layout when a display mode has been set.
+    Args:
+        name (str): Sprite name from SPRITES.
+    Returns:
+        pygame.Surface: The sprite at its in-game size.
+    """
+    path, size, pixel_format = SPRITES[name]
+    image = pygame.image.load(path)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if pixel_format == "BGRA" else image.convert()
+    return pygame.transform.smoothscale(image, size)
+
+
+def build_bundle(path=ASSET_BUNDLE_PATH):
+    """
+    Pack every sprite, pre-scaled, into a single bundle file.
+    The layout is a header, a JSON index of name -> offset, size and format,
+    then the raw pixel rows of each sprite aligned to 64 bytes.
+    Args:
+        path (str): Output file.
+    Returns:
+        int: Size of the bundle in bytes.
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    for name, (source, size, pixel_format) in SPRITES.items():
+        image = pygame.image.load(source)
+        pixels = pygame.image.tobytes(
+            pygame.transform.smoothscale(image, size), pixel_format
+        )
+        index[name] = {
+            "offset": offset,
+            "size": list(size),
+            "format": pixel_format,
+            "length": len(pixels),
+        }
+        padding = -len(pixels) % ALIGNMENT
+        blobs.append(pixels + bytes(padding))
+        offset += len(pixels) + padding
+
+    index_bytes = json.dumps(index).encode("utf-8")
+    data_start = HEADER.size + len(index_bytes)
+    data_start += -data_start % ALIGNMENT
+    with open(path, "wb") as bundle_file:
+        bundle_file.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        bundle_file.write(index_bytes)
+        bundle_file.write(bytes(data_start - bundle_file.tell()))
+        for blob in blobs:
+            bundle_file.write(blob)
+    return data_start + offset
+
+
+def open_bundle(path=ASSET_BUNDLE_PATH):
+    """
+    Memory-map a bundle file and read its index.
+    Args:
+        path (str): Bundle file.
+    Returns:
+        tuple: (mmap, index dict, offset of the pixel data), or None if the
+        file is missing or was built by an incompatible version.
+    """
+    try:
+        with open(path, "rb") as bundle_file:
+            mapped = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic, version, index_length = HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != VERSION:
+        mapped.close()
+        return None
+    index = json.loads(mapped[HEADER.size : HEADER.size + index_length])
+    data_start = HEADER.size + index_length
+    data_start += -data_start % ALIGNMENT
+    return mapped, index, data_start
+
+
+def load_sprite(name):
+    """
+    Get a sprite at its in-game size. Sprites come straight from the mapped
+    bundle when it exists, and are decoded from the loose files otherwise or
+    when the bundle's entry no longer matches SPRITES. Each sprite is created
+    once and shared.
+    Args:
+        name (str): Sprite name from SPRITES.
+    Returns:
+        pygame.Surface: The sprite.
+    """
+    global _bundle  # pylint: disable=global-statement
+    sprite = _sprites.get(name)
+    if sprite is not None:
+        return sprite
+    if _bundle is None:
+        _bundle = open_bundle() or False
+    _, size, pixel_format = SPRITES[name]
+    entry = _bundle[1].get(name) if _bundle else None
+    if entry and tuple(entry["size"]) == size and entry["format"] == pixel_format:
+        mapped, _, data_start = _bundle
+        start = data_start + entry["offset"]
+        sprite = pygame.image.frombuffer(
+            memoryview(mapped)[start : start + entry["length"]], size, pixel_format
+        )
+        if pixel_format != "BGRA" and pygame.display.get_surface() is not None:
+            sprite = sprite.convert()  # 24-bit surfaces blit slowly
+    else:
+        sprite = _load_loose(name)
+    _sprites[name] = sprite
+    return sprite
+
+
+if __name__ == "__main__":
+    written = build_bundle(sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE_PATH)
+    print(f"Wrote {written} bytes")
@@ -0,0 +1,65 @@
+"""
+collision.py
+
+Pixel-accurate collision between sprites. Masks are built once per source
+image and on-screen size, and the mask overlap test only runs for pairs whose
+bounding boxes intersect, so accuracy costs little in the common case.
+
+Functions:
+    sprite_mask(image, size): Returns the cached mask of an image at a given size.
+    sprites_overlap(image_a, size_a, pos_a, image_b, size_b, pos_b): Tests two centred sprites for overlap.
+"""
+
+# pylint: disable=no-member
+
+import pygame
+
+_mask_cache = {}
+
+
+def sprite_mask(image, size):
+    """
+    Get the collision mask of an image scaled to its on-screen size, building it only once.
+    Args:
+        image (pygame.Surface): Source image.
+        size (tuple): On-screen (width, height).
+    Returns:
+        pygame.mask.Mask: The cached mask.
+    """
+    key = (image, size)
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = pygame.mask.from_surface(pygame.transform.scale(image, size))
+        _mask_cache[key] = mask
+    return mask
+
+
+def sprites_overlap(image_a, size_a, pos_a, image_b, size_b, pos_b):
+    """
+    Test whether two sprites drawn centred on the given positions share an opaque pixel.
+    Args:
+        image_a (pygame.Surface): Image of the first sprite.
+        size_a (tuple): On-screen (width, height) of the first sprite.
+        pos_a (tuple): Centre (x, y) of the first sprite.
+        image_b (pygame.Surface): Image of the second sprite.
+        size_b (tuple): On-screen (width, height) of the second sprite.
+        pos_b (tuple): Centre (x, y) of the second sprite.
+    Returns:
+        bool: True if the sprites overlap.
+    """
+    left_a = int(pos_a[0]) - size_a[0] // 2
+    top_a = int(pos_a[1]) - size_a[1] // 2
+    left_b = int(pos_b[0]) - size_b[0] // 2
+    top_b = int(pos_b[1]) - size_b[1] // 2
+    if (
+        left_b >= left_a + size_a[0]
+        or left_a >= left_b + size_b[0]
+        or top_b >= top_a + size_a[1]
+        or top_a >= top_b + size_b[1]
+    ):
+        return False
+    offset = (left_b - left_a, top_b - top_a)
+    return (
+        sprite_mask(image_a, size_a).overlap(sprite_mask(image_b, size_b), offset)
+        is not None
+    )
@@ -0,0 +1,216 @@
+"""
+eventlog.py
+
+Buffered binary log of what happens during a match. Events are packed into
+fixed-size records in a preallocated buffer during the tick, and full buffers
+are appended to disk in batches by a background writer thread. A log file
+starts with a header naming its format version; a file in another format is
+moved aside to PATH.old rather than appended to.
+
+Constants:
+    HEADER: Struct layout of the file header (magic, format version).
+    RECORD: Struct layout of one record (tick, kind, player, entity, x, y, value).
+        x and y are 32-bit world coordinates; value is 16-bit.
+    MATCH_START, SHOT, HIT, BOUNCE, ALIEN_DEATH, LIFE_LOST, SCORE, QUALITY,
+    INTERCEPT: Event kinds.
+    FRAME_TIME_MAX: Cap on the frame time a QUALITY record carries.
+
+Classes:
+    LoggedEvent: One decoded record.
+    EventLog: Writes records into a buffer and flushes them on a background thread.
+
+Functions:
+    read_events(path): Streams the records of a log file back as a generator.
+"""
+
+import os
+import queue
+import struct
+import threading
+from collections import namedtuple
+
+HEADER = struct.Struct("<4sI")
+MAGIC = b"CCEV"
+VERSION = 2  # Version 1 packed x and y as 16-bit, too narrow for wide worlds
+RECORD = struct.Struct("<IBBIiih")
+
+MATCH_START = 1
+SHOT = 2
+HIT = 3
+BOUNCE = 4
+ALIEN_DEATH = 5
+LIFE_LOST = 6
+SCORE = 7
+# QUALITY x: new quality tier, value: smoothed frame time in hundredths of a
+# millisecond, capped at FRAME_TIME_MAX
+QUALITY = 8
+INTERCEPT = 9  # player_id: rightward bullet's shooter, value: leftward bullet's
+
+FRAME_TIME_MAX = 32767  # Largest value a record holds
+
+KIND_NAMES = {
+    MATCH_START: "match_start",
+    SHOT: "shot",
+    HIT: "hit",
+    BOUNCE: "bounce",
+    ALIEN_DEATH: "alien_death",
+    LIFE_LOST: "life_lost",
+    SCORE: "score",
+    QUALITY: "quality",
+    INTERCEPT: "intercept",
+}
+
+LoggedEvent = namedtuple(
+    "LoggedEvent", ["tick", "kind", "player_id", "entity_id", "x", "y", "value"]
+)
+
+
+class EventLog:
+    """
+    Append-only binary event log with a background writer.
+
+    Attributes:
+        path (str): File the records are appended to.
+        capacity (int): Number of records held by one buffer.
+        tick (int): Tick stamped on every record, set by the Model each update.
+    """
+
+    def __init__(self, path, capacity=4096):
+        _start_file(path)
+        self.path = path
+        self.capacity = capacity
+        self.tick = 0
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._count = 0
+        self._free = queue.SimpleQueue()
+        self._pending = queue.SimpleQueue()
+        self._free.put(bytearray(capacity * RECORD.size))
+        self._writer = threading.Thread(target=self._write_batches, daemon=True)
+        self._writer.start()
+
+    def record(self, kind, player_id=0, entity_id=0, x=0, y=0, value=0):
+        """
+        Pack one event into the current buffer. Only a swap to a spare buffer
+        happens on the calling thread when the buffer fills; disk I/O never does.
+        Args:
+            kind (int): One of the event kind constants.
+            player_id (int): Player the event concerns, 0 if none.
+            entity_id (int): Alien the event concerns, 0 if none.
+            x (int): X-coordinate where it happened.
+            y (int): Y-coordinate where it happened.
+            value (int): Kind-specific payload such as remaining health or score.
+        """
+        if self._count == self.capacity:
+            self.flush()
+        RECORD.pack_into(
+            self._buffer,
+            self._count * RECORD.size,
+            self.tick,
+            kind,
+            player_id,
+            entity_id,
+            int(x),
+            int(y),
+            value,
+        )
+        self._count += 1
+
+    def write_batch(self, batch):
+        """
+        Append a batch of already packed records, such as a frame's events
+        from the event bus. Records keep the tick they were stamped with.
+        Args:
+            batch (EventBatch): Records to append.
+        """
+        data = batch.data
+        size = RECORD.size
+        done = 0
+        while done < batch.count:
+            if self._count == self.capacity:
+                self.flush()
+            take = min(self.capacity - self._count, batch.count - done)
+            start = self._count * size
+            self._buffer[start : start + take * size] = data[
+                done * size : (done + take) * size
+            ]
+            self._count += take
+            done += take
+
+    def flush(self):
+        """
+        Hand the records buffered so far to the writer thread.
+        """
+        if self._count == 0:
+            return
+        self._pending.put((self._buffer, self._count))
+        try:
+            self._buffer = self._free.get_nowait()
+        except queue.Empty:
+            self._buffer = bytearray(self.capacity * RECORD.size)
+        self._count = 0
+
+    def close(self):
+        """
+        Flush any buffered records and wait for the writer thread to finish.
+        """
+        self.flush()
+        self._pending.put(None)
+        self._writer.join()
+
+    def _write_batches(self):
+        """
+        Writer thread body: appends each handed-off buffer to the log file.
+        """
+        with open(self.path, "ab") as log_file:
+            while True:
+                batch = self._pending.get()
+                if batch is None:
+                    return
+                buffer, count = batch
+                log_file.write(memoryview(buffer)[: count * RECORD.size])
+                log_file.flush()
+                self._free.put(buffer)
+
+
+def _start_file(path):
+    """
+    Make a log file ready for appending: a missing or empty file gets the
+    header, and a file in another format is moved aside to path + ".old".
+    Args:
+        path (str): Log file.
+    """
+    header = HEADER.pack(MAGIC, VERSION)
+    try:
+        with open(path, "rb") as log_file:
+            existing = log_file.read(HEADER.size)
+    except FileNotFoundError:
+        existing = b""
+    if existing == header:
+        return
+    if existing:
+        os.replace(path, path + ".old")
+    with open(path, "wb") as log_file:
+        log_file.write(header)
+
+
+def read_events(path, batch_records=4096):
+    """
+    Stream the records of an event log file.
+    Args:
+        path (str): Log file to read.
+        batch_records (int): Records read from disk per batch.
+    Yields:
+        LoggedEvent: Each record in the order it was written.
+    Raises:
+        ValueError: If the file is not an event log of this format version.
+    """
+    with open(path, "rb") as log_file:
+        if log_file.read(HEADER.size) != HEADER.pack(MAGIC, VERSION):
+            raise ValueError(f"{path} is not a version {VERSION} event log")
+        while True:
+            chunk = log_file.read(batch_records * RECORD.size)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % RECORD.size
+            for fields in RECORD.iter_unpack(chunk[:usable]):
+                yield LoggedEvent(*fields)
@@ -0,0 +1,142 @@
+"""
+events.py
+
+Game event bus. The Model publishes what happens during a tick (shots, hits,
+bounces, deaths, lives lost, scores) into a preallocated buffer of fixed-size
+records, the same layout the event log writes to disk. Publishing packs one
+record in place: nothing is allocated and no subscriber runs inside the
+simulation loop.
+
+Once per frame the game calls dispatch(), which hands the whole batch to each
+subscriber (audio, particles, the event log, metrics) in turn and starts the
+next batch in a second preallocated buffer. Events published while
+subscribers run, or after dispatch, go into the next frame's batch.
+
+Classes:
+    EventBatch: Read-only view of the events published during one frame.
+    EventBus: Preallocated per-frame event queue with batch subscribers.
+"""
+
+from eventlog import RECORD, LoggedEvent
+
+
+class EventBatch:
+    """
+    Read-only view of the events published during one frame. It is only valid
+    during the dispatch() call that passes it to a subscriber.
+
+    Attributes:
+        data (memoryview): The packed records.
+        count (int): Number of records.
+    """
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """
+        Decode the records in the order they were published.
+        Yields:
+            LoggedEvent: Each event.
+        """
+        return map(LoggedEvent._make, RECORD.iter_unpack(self.data))
+
+    def of(self, *kinds):
+        """
+        Decode only the events of some kinds.
+        Args:
+            *kinds (int): Event kind constants.
+        Yields:
+            LoggedEvent: Each matching event.
+        """
+        return (event for event in self if event.kind in kinds)
+
+
+class EventBus:
+    """
+    Preallocated per-frame event queue with batch subscribers.
+
+    Attributes:
+        capacity (int): Most events held in one frame's batch.
+        tick (int): Tick stamped on every event, set by the Model each update.
+        dropped (int): Events refused because the batch was full.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.tick = 0
+        self.dropped = 0
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._spare = bytearray(capacity * RECORD.size)
+        self._count = 0
+        self._subscribers = []
+
+    def __len__(self):
+        return self._count
+
+    def subscribe(self, handler):
+        """
+        Register a function to receive each frame's batch.
+        Args:
+            handler (callable): Called with an EventBatch once per dispatch.
+        """
+        self._subscribers.append(handler)
+
+    def unsubscribe(self, handler):
+        """
+        Stop sending batches to a function.
+        Args:
+            handler (callable): A previously subscribed function.
+        """
+        self._subscribers.remove(handler)
+
+    def publish(self, kind, player_id=0, entity_id=0, x=0, y=0, value=0):
+        """
+        Pack one event into the current batch.
+        Args:
+            kind (int): One of the event kind constants from eventlog.py.
+            player_id (int): Player the event concerns, 0 if none.
+            entity_id (int): Alien the event concerns, 0 if none.
+            x (int): X-coordinate where it happened.
+            y (int): Y-coordinate where it happened.
+            value (int): Kind-specific payload such as remaining health or score.
+        """
+        if self._count == self.capacity:
+            self.dropped += 1
+            return
+        RECORD.pack_into(
+            self._buffer,
+            self._count * RECORD.size,
+            self.tick,
+            kind,
+            player_id,
+            entity_id,
+            int(x),
+            int(y),
+            value,
+        )
+        self._count += 1
+
+    def dispatch(self):
+        """
+        Hand the events published since the last dispatch to every subscriber
+        and start a new batch.
+        Returns:
+            int: Number of events dispatched.
+        """
+        count = self._count
+        if count == 0:
+            return 0
+        buffer = self._buffer
+        self._buffer, self._spare = self._spare, buffer
+        self._count = 0
+        batch = EventBatch(memoryview(buffer)[: count * RECORD.size], count)
+        for handler in self._subscribers:
+            handler(batch)
+        return count
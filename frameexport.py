@@ -0,0 +1,323 @@
+"""
+frameexport.py
+
+Headless export of matches to image sequences or raw video, faster than real
+time. Frames are drawn by view.render on the display surface of SDL's dummy
+video driver, which is an off-screen buffer, and never presented.
+
+Matches are exported from per-tick state recordings (see staterecord.py); a
+simulated bot match is first recorded to one. The recorded ticks are split
+into chunks and a pool of worker processes renders and encodes the chunks in
+parallel, each worker mapping the recording read-only, so no frame crosses a
+process boundary. Formats:
+
+    png  frame-000000.png ... numbered across the whole clip
+    raw  chunk-0000.raw ... each the chunk's frames back to back, written
+         straight from the surface's pixel buffer without a copy. The pixel
+         format and size are in frames.json, for example:
+         cat chunk-*.raw | ffmpeg -f rawvideo -pix_fmt bgr0 -s 1000x800 -r 60 -i - clip.mp4
+
+Highlights are found in the recording itself: every tick where a score
+changes, with some lead-in and follow-through, overlapping windows merged.
+
+Usage:
+    python frameexport.py simulate --seed 4 --out clips     # bot match highlights
+    python frameexport.py recording states/match-... --out clips --format raw
+
+Functions:
+    highlights(recording, before, after): Tick ranges around score changes.
+    export_clips(recording_path, clips, out_dir, ...): Renders clips in parallel.
+    record_bot_match(path, seed, max_ticks): Records a seeded headless bot match.
+    main(argv): Command-line entry point.
+"""
+
+# pylint: disable=no-member,wrong-import-position,import-outside-toplevel
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+from assets import load_sprite
+from settings import FPS
+from spectate import _SpriteEntity  # pylint: disable=protected-access
+from staterecord import StateRecorder, StateRecording
+
+
+def highlights(recording, before=2 * FPS, after=FPS):
+    """
+    Find the moments worth a clip: every tick where a player's score changes.
+    Args:
+        recording (StateRecording): The match.
+        before (int): Ticks of lead-in before the score change.
+        after (int): Ticks kept after it.
+    Returns:
+        list: (start_tick, stop_tick) ranges, overlapping ones merged.
+    """
+    ticks = recording.ticks
+    totals = np.asarray(recording.players()["player_score"]).sum(axis=1)
+    changes = ticks[1:][np.diff(totals) != 0]
+    clips = []
+    for tick in changes.tolist():
+        start, stop = max(tick - before, int(ticks[0])), tick + after
+        if clips and start <= clips[-1][1]:
+            clips[-1] = (clips[-1][0], stop)
+        else:
+            clips.append((start, stop))
+    return clips
+
+
+def _pixel_format(surface):
+    """
+    Name a 32-bit surface's pixel layout the way ffmpeg does.
+    Args:
+        surface (pygame.Surface): The surface.
+    Returns:
+        str: Layout such as "bgr0", one letter per byte in memory order.
+    """
+    names = {}
+    for name, mask, shift in zip("rgba", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            names[shift // 8] = name
+    layout = "".join(names.get(i, "0") for i in range(4))
+    return layout if sys.byteorder == "little" else layout[::-1]
+
+
+def _stand_in(recording, row):
+    """
+    Build the minimal model view.render needs for one recorded tick. Only
+    aliens are drawn from their own image; players and bullets use view's
+    sprites.
+    Args:
+        recording (StateRecording): The match.
+        row (int): Row of the tick in the recording.
+    Returns:
+        SimpleNamespace: Object with players, aliens and bullets.
+    """
+    columns = recording.columns
+    images = {"alien": load_sprite("alien"), "bullet": None}
+    players = [
+        _SpriteEntity(None, x, y, player_id, health)
+        for player_id, (x, y, health) in enumerate(
+            zip(
+                columns["player_x"][row].tolist(),
+                columns["player_y"][row].tolist(),
+                columns["player_health"][row].tolist(),
+            ),
+            start=1,
+        )
+    ]
+    entities = {}
+    for kind in ("alien", "bullet"):
+        offsets = columns[f"{kind}_offsets"]
+        rows = slice(int(offsets[row]), int(offsets[row + 1]))
+        entities[kind] = [
+            _SpriteEntity(images[kind], x, y)
+            for x, y in zip(
+                columns[f"{kind}_x"][rows].tolist(), columns[f"{kind}_y"][rows].tolist()
+            )
+        ]
+    return SimpleNamespace(
+        players=players,
+        player1=players[0],
+        player2=players[1],
+        aliens=entities["alien"],
+        bullets=entities["bullet"],
+    )
+
+
+def _render_chunk(task):
+    """
+    Worker body: render and encode one chunk of a clip.
+    Args:
+        task (tuple): (recording_path, first_row, stop_row, step, out_dir,
+            fmt, first_frame, chunk_index, names).
+    Returns:
+        int: Frames written.
+    """
+    path, first_row, stop_row, step, out_dir, fmt, first_frame, index, names = task
+    import pygame
+    import view
+
+    recording = StateRecording(path)
+    screen = view.screen
+    frames = 0
+    raw_file = None
+    if fmt == "raw":
+        # pylint: disable-next=consider-using-with
+        raw_file = open(os.path.join(out_dir, f"chunk-{index:04d}.raw"), "wb")
+    try:
+        for row in range(first_row, stop_row, step):
+            view.render(_stand_in(recording, row), *names, present=False)
+            if raw_file is not None:
+                raw_file.write(screen.get_view("2"))
+            else:
+                name = f"frame-{first_frame + frames:06d}.png"
+                pygame.image.save(screen, os.path.join(out_dir, name))
+            frames += 1
+    finally:
+        if raw_file is not None:
+            raw_file.close()
+    return frames
+
+
+def _surface_layout():
+    """
+    Get the size and pixel format frames are written in.
+    Returns:
+        dict: width, height and pix_fmt of the off-screen display surface.
+    """
+    import view
+
+    width, height = view.screen.get_size()
+    return {"width": width, "height": height, "pix_fmt": _pixel_format(view.screen)}
+
+
+def export_clips(
+    recording_path,
+    clips,
+    out_dir,
+    fmt="png",
+    step=1,
+    workers=None,
+    chunk_frames=60,
+    names=("Player 1", "Player 2"),
+):
+    """
+    Render clips of a recorded match, every clip's chunks sharing one pool.
+    Args:
+        recording_path (str): Directory of the recording.
+        clips (list): (start_tick, stop_tick) ranges, one output directory each.
+        out_dir (str): Directory the clip directories are created in.
+        fmt (str): "png" for an image sequence, "raw" for raw video.
+        step (int): Render every step-th tick; 2 gives 30 FPS clips.
+        workers (int): Worker processes. Defaults to one per core.
+        chunk_frames (int): Frames per work item.
+        names (tuple): Player names drawn in the score overlay.
+    Returns:
+        list: Output directory of each clip.
+    """
+    recording = StateRecording(recording_path)
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(workers)
+    layout = pool.apply(_surface_layout)
+    tasks = []
+    clip_dirs = []
+    for start_tick, stop_tick in clips:
+        clip_dir = os.path.join(out_dir, f"clip-{start_tick:06d}-{stop_tick:06d}")
+        os.makedirs(clip_dir, exist_ok=True)
+        clip_dirs.append(clip_dir)
+        rows = recording.rows(start_tick, stop_tick)
+        span = chunk_frames * step
+        for index, first_row in enumerate(range(rows.start, rows.stop, span)):
+            tasks.append(
+                (
+                    recording_path,
+                    first_row,
+                    min(first_row + span, rows.stop),
+                    step,
+                    clip_dir,
+                    fmt,
+                    index * chunk_frames,
+                    index,
+                    tuple(names),
+                )
+            )
+        info = dict(layout, format=fmt, frames=len(range(rows.start, rows.stop, step)))
+        info["fps"] = FPS / step
+        with open(os.path.join(clip_dir, "frames.json"), "w", encoding="utf-8") as out:
+            json.dump(info, out, indent=2)
+    try:
+        pool.map(_render_chunk, tasks, chunksize=1)
+    finally:
+        # Not terminate(): workers with pygame initialised ignore SIGTERM
+        pool.close()
+        pool.join()
+    return clip_dirs
+
+
+def record_bot_match(path, seed=0, max_ticks=36000):
+    """
+    Play a seeded headless match between a random and a heuristic bot and
+    record its state.
+    Args:
+        path (str): Directory of the recording.
+        seed (int): Seed for the model's RNG and the random bot.
+        max_ticks (int): Ticks after which an undecided match is abandoned.
+    Returns:
+        int: Ticks played.
+    """
+    from ai import HeuristicDriver, RandomDriver, simulate_tick
+    from model import Model
+
+    model = Model()
+    model.rng.seed(seed)
+    drivers = [RandomDriver(1, random.Random(seed)), HeuristicDriver(2)]
+    recorder = StateRecorder(path)
+    try:
+        for _ in range(max_ticks):
+            simulate_tick(model, drivers)
+            recorder.record(model)
+            if model.get_winner() is not None:
+                break
+    finally:
+        recorder.close()
+    return model.tick
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    Args:
+        argv (list): Arguments to parse. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Export Cosmic Clash matches")
+    parser.add_argument("source", choices=("simulate", "recording"))
+    parser.add_argument("path", nargs="?", help="recording directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="clips")
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--step", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--whole", action="store_true", help="export the whole match, not highlights"
+    )
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if args.source == "simulate":
+        path = os.path.join(args.out, f"match-seed{args.seed}")
+        ticks = record_bot_match(path, args.seed)
+        print(f"Recorded {ticks} ticks to {path}")
+    elif path is None:
+        parser.error("recording needs a path")
+    recording = StateRecording(path)
+    if args.whole:
+        clips = [(int(recording.ticks[0]), int(recording.ticks[-1]) + 1)]
+    else:
+        clips = highlights(recording)
+    start = time.perf_counter()
+    clip_dirs = export_clips(
+        path, clips, args.out, args.format, args.step, args.workers
+    )
+    elapsed = time.perf_counter() - start
+    frames = 0
+    for clip_dir in clip_dirs:
+        with open(os.path.join(clip_dir, "frames.json"), encoding="utf-8") as info:
+            frames += json.load(info)["frames"]
+    print(
+        f"Exported {len(clip_dirs)} clips, {frames} frames in {elapsed:.1f} s "
+        f"({frames / FPS * args.step / max(elapsed, 1e-9):.1f}x real time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
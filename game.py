@@ -10,19 +10,52 @@ Functions:
     initial_rules_screen(): Displays the game rules.
     name_input_screen(): Allows users to enter their player names.
     countdown_screen(): Displays a countdown before the game starts.
-    end_screen(winner_name): Displays the winning message and replay prompt.
-    main(): Runs the entire game loop and handles transitions.
+    end_screen(winner_name, standings): Displays the winning message, leaderboard and replay prompt.
+    pause_match(model, window): Holds a match while the window is unfocused or minimized.
+    parse_args(argv): Parses the command-line options.
+    make_driver(player_id, level): Builds a CPU driver for a player.
+    apply_quality(tier, model): Applies a quality tier chosen by the governor.
+    play_event_sounds(batch), burst_particles(batch), count_events(batch): Event bus subscribers.
+    report_profile(paths): Announces finished profiler captures.
+    main(argv): Runs the entire game loop and handles transitions.
+    run_matches(event_log, cpu_players, ..., leaderboard): Plays matches back to back until the window is closed.
 """
 
 # pylint: disable=no-member,undefined-variable
 
+import argparse
+import os
+import time
 import pygame
+from ai import HeuristicDriver, LookaheadDriver, RandomDriver
 from controller import Controller
+from eventlog import (
+    ALIEN_DEATH,
+    BOUNCE,
+    FRAME_TIME_MAX,
+    INTERCEPT,
+    QUALITY,
+    SHOT,
+    EventLog,
+)
+from governor import QualityGovernor
+from leaderboard import Leaderboard
 from model import Model
+from pacing import FramePacer, WindowState
+from particles import ParticleSystem
+from profiler import ProfileCapture
+import metrics
 import view
+from settings import EVENT_LOG_PATH, FPS, LEADERBOARD_PATH, PROFILE_SECONDS
+from spectate import BroadcastServer
+from staterecord import StateRecorder
 
 pygame.init()
 clock = pygame.time.Clock()
+pacer = FramePacer()
+particles = ParticleSystem()
+governor = QualityGovernor()
+profiler = ProfileCapture()
 font_large = pygame.font.SysFont(None, 72)
 font_medium = pygame.font.SysFont(None, 48)
 
@@ -69,7 +102,7 @@ def wrap_text(text, font, max_width):
 def initial_rules_screen():
     """
     Displays the initial rules screen explaining game mechanics and controls.
-    Waits for the player to press ENTER to proceed.
+    Sleeps on the event queue until the player presses ENTER to proceed.
     """
     running = True
 
@@ -163,7 +196,7 @@ def initial_rules_screen():
 
         pygame.display.flip()
 
-        for event in pygame.event.get():
+        for event in pacer.wait():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -172,16 +205,22 @@ def initial_rules_screen():
                     running = False
 
 
-def name_input_screen():
+def name_input_screen(cpu_players=()):
     """
     Prompts each player to enter their name. Handles keyboard input including backspace and Enter.
+    The screen is only redrawn after input arrives or the idle timeout expires.
+
+    Args:
+        cpu_players (tuple): IDs of CPU-controlled players, which are named automatically.
 
     Returns:
         tuple: Names of player 1 and player 2 as strings.
     """
-    player_names = ["", ""]
+    player_names = [f"CPU {i + 1}" if i + 1 in cpu_players else "" for i in range(2)]
     current_player = 0
-    input_active = True
+    while current_player < 2 and player_names[current_player] != "":
+        current_player += 1
+    input_active = current_player < 2
 
     while input_active:
         view.screen.fill((0, 0, 0))
@@ -207,7 +246,7 @@ def name_input_screen():
         )
         pygame.display.flip()
 
-        for event in pygame.event.get():
+        for event in pacer.wait():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -215,6 +254,8 @@ def name_input_screen():
                 if event.key == pygame.K_RETURN:
                     if player_names[current_player] != "":
                         current_player += 1
+                        if current_player == 1 and 2 in cpu_players:
+                            current_player += 1
                         if current_player > 1:
                             input_active = False
                 elif event.key == pygame.K_BACKSPACE:
@@ -229,24 +270,41 @@ def name_input_screen():
 def countdown_screen():
     """
     Displays a countdown from 3 to 1 before the match starts, with 1-second intervals.
+    The countdown is paced by frame rather than blocking, so QUIT is still honoured.
     """
-    for count in range(3, 0, -1):
-        view.screen.fill((0, 0, 0))
-        text = font_large.render(str(count), True, (255, 255, 255))
-        text_rect = text.get_rect(
-            center=(view.SCREEN_WIDTH // 2, view.SCREEN_HEIGHT // 2)
-        )
-        view.screen.blit(text, text_rect)
-        pygame.display.flip()
-        pygame.time.delay(1000)
+    start_time = pygame.time.get_ticks()
+    shown = None
+    while True:
+        elapsed = pygame.time.get_ticks() - start_time
+        if elapsed >= 3000:
+            return
+        count = 3 - elapsed // 1000
+
+        if count != shown:
+            view.screen.fill((0, 0, 0))
+            text = font_large.render(str(count), True, (255, 255, 255))
+            text_rect = text.get_rect(
+                center=(view.SCREEN_WIDTH // 2, view.SCREEN_HEIGHT // 2)
+            )
+            view.screen.blit(text, text_rect)
+            pygame.display.flip()
+            shown = count
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
 
+        pacer.tick()
 
-def end_screen(winner_name):
+
+def end_screen(winner_name, standings=()):
     """
     Displays the end screen with the winner's name and prompts to restart the game.
 
     Args:
         winner_name (str): Name of the player who won.
+        standings (list): (name, wins, played) rows of the leaderboard to show.
     """
     view.screen.fill((0, 0, 0))
     end_text = font_large.render(
@@ -263,67 +321,425 @@ def end_screen(winner_name):
     )
     view.screen.blit(restart_text, restart_rect)
 
+    for rank, (name, wins, played) in enumerate(standings, start=1):
+        row_text = font_medium.render(
+            f"{rank}. {name}  {wins} wins / {played}", True, (200, 200, 200)
+        )
+        row_rect = row_text.get_rect(
+            center=(view.SCREEN_WIDTH // 2, view.SCREEN_HEIGHT // 2 + 80 + 45 * rank)
+        )
+        view.screen.blit(row_text, row_rect)
+
     pygame.display.flip()
 
 
-def main():
+def pause_match(model, window):
     """
-    Main game loop. Manages the flow from welcome screen to gameplay to ending.
-    Handles player movement, bullet firing, alien spawning, collisions, score tracking, and game reset.
+    Holds a match while the window is unfocused or minimized. Nothing is
+    simulated or presented; the loop only wakes for events or every idle
+    timeout. Spawns and cooldowns are counted in model ticks, so the match
+    resumes where it stopped without catching up. Held keys are released,
+    since their key-up events may go to another window.
+
+    Args:
+        model (Model): The current match.
+        window (WindowState): The window's state, updated from the events.
+
+    Returns:
+        bool: False if the window was closed while paused.
     """
-    while True:
-        initial_rules_screen()
-        player1_name, player2_name = name_input_screen()
-        countdown_screen()
+    for player in model.players:
+        player.dy = 0
+        player.shoot = False
+    shown = False
+    while window.paused:
+        if window.visible and not shown:
+            # Dim the last frame once, then stop presenting
+            shade = pygame.Surface(view.screen.get_size(), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 160))
+            view.screen.blit(shade, (0, 0))
+            text = font_large.render("Paused", True, (255, 255, 255))
+            view.screen.blit(
+                text,
+                text.get_rect(center=(view.SCREEN_WIDTH // 2, view.SCREEN_HEIGHT // 2)),
+            )
+            pygame.display.flip()
+            shown = True
+        for event in pacer.wait():
+            if event.type == pygame.QUIT:
+                return False
+            window.handle(event)
+    clock.tick()  # The pause does not count as one long frame
+    return True
 
-        model = Model()
-        controller = Controller(model.player1, model.player2)
-        running = True
-        game_over = False
 
-        while running:
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
+def parse_args(argv=None):
+    """
+    Parses the command-line options.
+
+    Args:
+        argv (list): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Cosmic Clash")
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        choices=(1, 2),
+        action="append",
+        default=[],
+        help="let the computer control this player (may be repeated)",
+    )
+    parser.add_argument(
+        "--cpu-level",
+        choices=("random", "heuristic", "lookahead"),
+        default="lookahead",
+        help="strategy used by CPU players",
+    )
+    parser.add_argument(
+        "--players",
+        type=int,
+        default=2,
+        help="number of players; players beyond the first two are CPU-controlled",
+    )
+    parser.add_argument(
+        "--swarm",
+        action="store_true",
+        help="aliens arrive in waves and fly as flocks",
+    )
+    parser.add_argument(
+        "--spectate-port",
+        type=int,
+        default=None,
+        help="broadcast matches to spectators on this localhost port",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics",
+    )
+    parser.add_argument(
+        "--profile",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="profile the first SECONDS seconds and write reports to PROFILE_DIR",
+    )
+    parser.add_argument(
+        "--profile-matches",
+        type=int,
+        default=None,
+        metavar="N",
+        help="profile the first N matches and write reports to PROFILE_DIR",
+    )
+    parser.add_argument(
+        "--record-state",
+        default=None,
+        metavar="DIR",
+        help="record every match's per-tick state under DIR for analysis",
+    )
+    return parser.parse_args(argv)
+
 
-            controller.handle_input(events)
+def make_driver(player_id, level):
+    """
+    Builds a CPU driver for a player.
 
-            model.player1.move()
-            model.player2.move()
+    Args:
+        player_id (int): ID of the player to control.
+        level (str): One of "random", "heuristic" or "lookahead".
 
-            if model.player1.shoot:
-                model.add_bullet(player_id=1)
-                if sound_enabled:
-                    bullet_shoot.play()
-                model.player1.shoot = False
-            if model.player2.shoot:
-                model.add_bullet(player_id=2)
-                if sound_enabled:
-                    bullet_shoot.play()
-                model.player2.shoot = False
+    Returns:
+        object: A driver with an update(model) method.
+    """
+    if level == "random":
+        return RandomDriver(player_id)
+    if level == "heuristic":
+        return HeuristicDriver(player_id)
+    return LookaheadDriver(player_id)
+
+
+def apply_quality(tier, model):
+    """
+    Applies a quality tier chosen by the governor to the match and the renderer,
+    and publishes the change so it reaches the event log, and sets the metrics.
 
-            model.update()
+    Args:
+        tier (Tier): The tier to apply.
+        model (Model): The current match.
+    """
+    model.max_aliens = tier.max_aliens
+    model.max_bullets_per_player = tier.bullets_per_player
+    particles.enabled = tier.effects
+    if not tier.effects:
+        particles.clear()
+    view.flat_background = not tier.background
+    metrics.quality_tier.set(governor.level)
+    frame_time = min(int(governor.average * 1e5), FRAME_TIME_MAX)
+    model.events.publish(QUALITY, x=governor.level, value=frame_time)
+
+
+def play_event_sounds(batch):
+    """
+    Event bus subscriber: plays the shot sound for every shot fired this frame.
 
-            if model.player1.score >= 3:
-                winner_name = player1_name
-                game_over = True
-            elif model.player2.score >= 3:
-                winner_name = player2_name
-                game_over = True
+    Args:
+        batch (EventBatch): The frame's events.
+    """
+    if sound_enabled:
+        for _ in batch.of(SHOT):
+            bullet_shoot.play()
 
-            view.render(model, player1_name, player2_name)
-            clock.tick(60)
 
-            if game_over:
-                running = False
+def burst_particles(batch):
+    """
+    Event bus subscriber: emits particles where bullets struck aliens or each
+    other this frame. A bullet hit bounces the alien with health left; a wall
+    bounce has none.
 
-        end_screen(winner_name)
+    Args:
+        batch (EventBatch): The frame's events.
+    """
+    for event in batch.of(BOUNCE, ALIEN_DEATH, INTERCEPT):
+        if event.kind == ALIEN_DEATH:
+            particles.burst(event.x, event.y, True)
+        elif event.kind == INTERCEPT or event.value > 0:
+            particles.burst(event.x, event.y, False)
+
+
+def count_events(batch):
+    """
+    Event bus subscriber: counts the frame's events in the metrics.
+
+    Args:
+        batch (EventBatch): The frame's events.
+    """
+    metrics.game_events.inc(len(batch))
+
+
+def report_profile(paths):
+    """
+    Announces the reports of a profiler capture that just ended.
+
+    Args:
+        paths (list): Written report files, or None if no capture ended.
+    """
+    if paths:
+        print("Profile written to " + ", ".join(paths))
+
+
+def main(argv=None):
+    """
+    Main game loop. Manages the flow from welcome screen to gameplay to ending.
+    Handles player movement, bullet firing, alien spawning, collisions, score tracking, and game reset.
+    Match events are recorded to EVENT_LOG_PATH and results to LEADERBOARD_PATH
+    when they are set.
+
+    Args:
+        argv (list): Command-line arguments. Defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    event_log = EventLog(EVENT_LOG_PATH) if EVENT_LOG_PATH else None
+    leaderboard = Leaderboard(LEADERBOARD_PATH) if LEADERBOARD_PATH else None
+    broadcast = None
+    if args.spectate_port is not None:
+        broadcast = BroadcastServer(port=args.spectate_port)
+        broadcast.start_in_thread()
+    if args.metrics_port is not None:
+        metrics.MetricsServer(metrics.registry, port=args.metrics_port).start()
+    if args.profile is not None or args.profile_matches is not None:
+        profiler.start(seconds=args.profile, matches=args.profile_matches)
+    try:
+        run_matches(
+            event_log,
+            tuple(args.cpu),
+            args.cpu_level,
+            broadcast,
+            max(args.players, 2),
+            "swarm" if args.swarm else "classic",
+            leaderboard,
+            args.record_state,
+        )
+    finally:
+        report_profile(profiler.stop())
+        if event_log is not None:
+            event_log.close()
+        if leaderboard is not None:
+            leaderboard.close()
+
+
+def run_matches(
+    event_log,
+    cpu_players=(),
+    cpu_level="lookahead",
+    broadcast=None,
+    num_players=2,
+    alien_mode="classic",
+    leaderboard=None,
+    state_dir=None,
+):
+    """
+    Plays matches back to back until the window is closed.
+
+    Args:
+        event_log (EventLog): Log shared by every match, or None.
+        cpu_players (tuple): IDs of CPU-controlled players.
+        cpu_level (str): Strategy used by CPU players.
+        broadcast (BroadcastServer): Spectator server fed every tick, or None.
+        num_players (int): Players per match. Players beyond the first two
+            are driven by the heuristic CPU.
+        alien_mode (str): "classic" or "swarm", see Model.
+        leaderboard (Leaderboard): Store every result is recorded to, or None.
+        state_dir (str): Directory each match's per-tick state is recorded
+            under, see staterecord.py, or None.
+    """
+    while True:
+        initial_rules_screen()
+        player1_name, player2_name = name_input_screen(cpu_players)
+        countdown_screen()
+
+        names = [player1_name, player2_name] + [
+            f"CPU {player_id}" for player_id in range(3, num_players + 1)
+        ]
+
+        model = Model(
+            event_log=event_log, num_players=num_players, alien_mode=alien_mode
+        )
+        cameras = view.cameras_for(model.players)
+        for subscriber in (play_event_sounds, burst_particles, count_events):
+            model.events.subscribe(subscriber)
+        apply_quality(governor.tier, model)
+        controller = Controller(model.player1, model.player2)
+        drivers = [make_driver(player_id, cpu_level) for player_id in cpu_players]
+        drivers += [
+            make_driver(player_id, "heuristic")
+            for player_id in range(3, num_players + 1)
+        ]
+        if broadcast is not None:
+            broadcast.reset(names)
+        recorder = None
+        if state_dir is not None:
+            recorder = StateRecorder(
+                os.path.join(state_dir, time.strftime("match-%Y%m%d-%H%M%S")),
+                num_players,
+            )
+        running = True
+        game_over = False
+        window = WindowState()
+
+        try:
+            while running:
+                frame_start = time.perf_counter()
+                events = pygame.event.get()
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        return
+                    window.handle(event)
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                        if profiler.active:
+                            report_profile(profiler.stop())
+                        else:
+                            profiler.start(seconds=PROFILE_SECONDS)
+
+                if window.paused:
+                    if not pause_match(model, window):
+                        pygame.quit()
+                        return
+                    continue
+
+                controller.handle_input(events)
+                for driver in drivers:
+                    driver.update(model)
+
+                for player in model.players:
+                    player.move()
+
+                model.fire_pending()
+
+                # The cameras follow the players; what they show is simulated
+                # at full rate
+                view.follow_players(cameras, model.players)
+                model.focus = [camera.rect() for camera in cameras]
+
+                update_start = time.perf_counter()
+                model.update()
+                metrics.update_seconds.observe(time.perf_counter() - update_start)
+                if recorder is not None:
+                    recorder.record(model)
+                model.events.dispatch()
+                particles.update()
+                if broadcast is not None:
+                    broadcast.publish_threadsafe(model)
+
+                winner = model.get_winner()
+                if winner is not None:
+                    winner_name = names[winner.player_id - 1]
+                    game_over = True
+
+                render_start = time.perf_counter()
+                view.render(model, player1_name, player2_name, particles, cameras)
+                frame_end = time.perf_counter()
+                metrics.render_seconds.observe(frame_end - render_start)
+                if frame_end - frame_start > 1 / FPS:
+                    metrics.tick_overruns.inc()
+                tier = governor.observe(frame_end - frame_start)
+                if tier is not None:
+                    apply_quality(tier, model)
+                    metrics.quality_changes.inc()
+                metrics.ticks.inc()
+                metrics.aliens.set(len(model.aliens))
+                metrics.bullets.set(len(model.bullets))
+                metrics.particles.set(particles.count)
+                metrics.draw_calls.set(view.frame_stats["draw_calls"])
+                metrics.sprites.set(view.frame_stats["sprites"])
+                if profiler.active:
+                    report_profile(
+                        profiler.observe(
+                            aliens=len(model.aliens),
+                            bullets=len(model.bullets),
+                            particles=particles.count,
+                        )
+                    )
+
+                clock.tick(60)
+                metrics.frame_seconds.observe(time.perf_counter() - frame_start)
+
+                if game_over:
+                    running = False
+        finally:
+            if recorder is not None:
+                recorder.close()
+
+        metrics.matches.inc()
+        if profiler.active:
+            report_profile(profiler.match_finished())
+        particles.clear()
+        if event_log is not None:
+            event_log.flush()
+        standings = []
+        if leaderboard is not None:
+            leaderboard.record_match(
+                names,
+                [player.score for player in model.players],
+                winner.player_id - 1,
+            )
+            standings = leaderboard.top(5)
+        end_screen(winner_name, standings)
 
         waiting_for_restart = True
         while waiting_for_restart:
-            for event in pygame.event.get():
+            events = pacer.wait()
+            if not events and leaderboard is not None:
+                # The result is written in the background; show it once it lands
+                latest = leaderboard.top(5)
+                if latest != standings:
+                    standings = latest
+                    end_screen(winner_name, standings)
+            for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return
@@ -0,0 +1,125 @@
+"""
+governor.py
+
+Adaptive quality for machines that cannot hold the frame rate. The governor
+watches how long each frame's work takes and steps down through quality tiers
+while frames run over budget, then steps back up once there is headroom
+again. Each tier only adds restrictions to the one before it, cheapest losses
+first: effects, then the background, then bullets, then alien spawns.
+
+Stepping down needs a sustained overrun and stepping up needs a longer stretch
+of comfortable frames, so a single slow frame never flips the tier and the
+tier does not oscillate around the budget.
+
+Constants:
+    TIERS: Quality tiers, best first.
+
+Classes:
+    Tier: Limits applied at one quality level.
+    QualityGovernor: Picks the tier from observed frame times.
+"""
+
+from collections import deque, namedtuple
+from settings import FPS
+
+# Limits applied at one quality level: whether particle effects are emitted,
+# whether the background image is drawn rather than a plain fill, live bullets
+# allowed per player and live aliens allowed before spawns are skipped (None
+# for no limit)
+Tier = namedtuple(
+    "Tier", ["name", "effects", "background", "bullets_per_player", "max_aliens"]
+)
+
+TIERS = (
+    Tier("full", True, True, None, None),
+    Tier("no-effects", False, True, None, None),
+    Tier("flat-background", False, False, None, None),
+    Tier("bullet-cap", False, False, 3, None),
+    Tier("spawn-cap", False, False, 3, 8),
+)
+
+
+class QualityGovernor:
+    """
+    Picks the quality tier from observed frame times.
+
+    Attributes:
+        budget (float): Frame budget in seconds.
+        tiers (tuple): Available tiers, best first.
+        level (int): Index of the current tier.
+        average (float): Smoothed frame time in seconds.
+        degrade_after (int): Consecutive over-budget frames before stepping down.
+        restore_after (int): Consecutive frames under headroom * budget before
+            stepping up.
+        headroom (float): Fraction of the budget a frame must stay under to
+            count towards restoring quality.
+        changes (deque): (frame, old level, new level, average) for the most
+            recent tier changes.
+    """
+
+    def __init__(
+        self,
+        budget=1 / FPS,
+        tiers=TIERS,
+        smoothing=0.1,
+        degrade_after=30,
+        restore_after=180,
+        headroom=0.6,
+    ):
+        self.budget = budget
+        self.tiers = tiers
+        self.smoothing = smoothing
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        self.headroom = headroom
+        self.level = 0
+        self.average = 0.0
+        self.frames = 0
+        self.changes = deque(maxlen=256)
+        self._over = 0
+        self._under = 0
+
+    @property
+    def tier(self):
+        """
+        Tier: The current tier.
+        """
+        return self.tiers[self.level]
+
+    def observe(self, seconds):
+        """
+        Record one frame's work time and change tier if it is time to.
+        Args:
+            seconds (float): Time the frame's work took, excluding any sleep.
+        Returns:
+            Tier: The new tier if it changed on this frame, otherwise None.
+        """
+        self.frames += 1
+        self.average += self.smoothing * (seconds - self.average)
+        if self.average > self.budget:
+            self._over += 1
+            self._under = 0
+        elif self.average < self.budget * self.headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.degrade_after and self.level < len(self.tiers) - 1:
+            return self._change(self.level + 1)
+        if self._under >= self.restore_after and self.level > 0:
+            return self._change(self.level - 1)
+        return None
+
+    def _change(self, level):
+        """
+        Move to another tier and start counting afresh.
+        Args:
+            level (int): Index of the new tier.
+        Returns:
+            Tier: The new tier.
+        """
+        self.changes.append((self.frames, self.level, level, self.average))
+        self.level = level
+        self._over = self._under = 0
+        return self.tier
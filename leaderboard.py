@@ -0,0 +1,231 @@
+"""
+leaderboard.py
+
+Persistent match history and leaderboard in SQLite. The database runs in WAL
+mode so the game can read standings while results are being written, and
+writes are handed to a background thread through a queue so recording a
+result never blocks the game loop. Several queued results are committed in
+one transaction.
+
+Per-player totals are kept in their own table, updated with each result, so
+the leaderboard is an indexed lookup rather than an aggregate over every
+match ever played. Top-N answers are cached in memory until the next commit.
+
+Classes:
+    Leaderboard: Records results and answers leaderboard and history queries.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    winner TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS match_players (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL,
+    played INTEGER NOT NULL,
+    last_played REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_played_at ON matches(played_at);
+CREATE INDEX IF NOT EXISTS match_players_name ON match_players(name, match_id);
+CREATE INDEX IF NOT EXISTS player_stats_rank ON player_stats(wins DESC, played, name);
+"""
+
+
+def _connect(path):
+    """
+    Open a connection with the settings every connection to the store uses.
+    Args:
+        path (str): Database file.
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class Leaderboard:
+    """
+    Records match results and answers leaderboard and history queries.
+
+    Results are written asynchronously, so a query made right after
+    record_match() may not include it yet; call flush() to wait for it.
+
+    Attributes:
+        path (str): Database file.
+        batch_size (int): Most results committed in one transaction.
+        failed (int): Results dropped because the database refused them.
+    """
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        connection = _connect(path)
+        connection.executescript(SCHEMA)
+        connection.close()
+        self.failed = 0
+        self._local = threading.local()
+        self._generation = 0
+        self._top_cache = {}
+        self._pending = queue.Queue()
+        self._writer = threading.Thread(target=self._write_results, daemon=True)
+        self._writer.start()
+
+    def record_match(self, names, scores, winner, played_at=None):
+        """
+        Queue a finished match for writing. Returns immediately.
+        Args:
+            names (list): Player names, in player ID order.
+            scores (list): Final score of each player.
+            winner (int): Index into names of the winner.
+            played_at (float): Unix time the match ended. Defaults to now.
+        """
+        if played_at is None:
+            played_at = time.time()
+        self._pending.put((played_at, list(names), list(scores), winner))
+
+    def flush(self):
+        """
+        Wait until every queued result has been committed.
+        """
+        self._pending.join()
+
+    def close(self):
+        """
+        Write the remaining results and stop the writer thread.
+        """
+        self._pending.put(None)
+        self._writer.join()
+        reader = getattr(self._local, "reader", None)
+        if reader is not None:
+            reader.close()
+            self._local.reader = None
+
+    def top(self, count=10):
+        """
+        Get the players with the most wins, ties broken by fewer matches played
+        and then by name.
+        Args:
+            count (int): Number of players to return.
+        Returns:
+            list: (name, wins, played) tuples, best first.
+        """
+        generation = self._generation
+        cached = self._top_cache.get(count)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        rows = self._read(
+            "SELECT name, wins, played FROM player_stats "
+            "ORDER BY wins DESC, played, name LIMIT ?",
+            (count,),
+        )
+        self._top_cache[count] = (generation, rows)
+        return rows
+
+    def history(self, name, limit=20):
+        """
+        Get a player's most recent matches.
+        Args:
+            name (str): Player name.
+            limit (int): Most matches to return.
+        Returns:
+            list: (played_at, score, won) tuples, newest first.
+        """
+        return self._read(
+            "SELECT matches.played_at, match_players.score, match_players.won "
+            "FROM match_players JOIN matches ON matches.id = match_players.match_id "
+            "WHERE match_players.name = ? ORDER BY match_players.match_id DESC LIMIT ?",
+            (name, limit),
+        )
+
+    def matches_since(self, since):
+        """
+        Count the matches that ended at or after a time.
+        Args:
+            since (float): Unix time.
+        Returns:
+            int: Number of matches.
+        """
+        return self._read(
+            "SELECT COUNT(*) FROM matches WHERE played_at >= ?", (since,)
+        )[0][0]
+
+    def _read(self, sql, params):
+        """
+        Run a query on the calling thread's read connection.
+        Returns:
+            list: The rows as tuples.
+        """
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            reader = self._local.reader = _connect(self.path)
+        return reader.execute(sql, params).fetchall()
+
+    def _write_results(self):
+        """
+        Writer thread body: commits queued results in batches until close().
+        """
+        connection = _connect(self.path)
+        try:
+            while True:
+                batch = [self._pending.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._pending.get_nowait())
+                    except queue.Empty:
+                        break
+                results = [result for result in batch if result is not None]
+                if results:
+                    try:
+                        with connection:
+                            for result in results:
+                                self._insert(connection, *result)
+                    except sqlite3.Error:
+                        # Losing a batch is better than stopping the writer
+                        self.failed += len(results)
+                    self._generation += 1
+                for _ in batch:
+                    self._pending.task_done()
+                if len(results) < len(batch):
+                    return
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _insert(connection, played_at, names, scores, winner):
+        """
+        Write one result inside the writer's open transaction.
+        """
+        match_id = connection.execute(
+            "INSERT INTO matches (played_at, winner) VALUES (?, ?)",
+            (played_at, names[winner]),
+        ).lastrowid
+        rows = [
+            (match_id, name, score, int(index == winner))
+            for index, (name, score) in enumerate(zip(names, scores))
+        ]
+        connection.executemany(
+            "INSERT INTO match_players (match_id, name, score, won) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        connection.executemany(
+            "INSERT INTO player_stats (name, wins, played, last_played) "
+            "VALUES (?, ?, 1, ?) ON CONFLICT(name) DO UPDATE SET "
+            "wins = wins + excluded.wins, played = played + 1, "
+            "last_played = excluded.last_played",
+            [(name, won, played_at) for _, name, _, won in rows],
+        )
@@ -0,0 +1,642 @@
+"""
+matchserver.py
+
+Headless dedicated server that hosts many matches (rooms) on one asyncio
+event loop. Every room's Model is advanced by a single fixed-rate ticker:
+each tick steps all running rooms in one batch and encodes one frame per
+room, which is fanned out to the room's players with the spectator encoding
+from spectate.py. Players' inputs go into their room's own queue as they
+arrive and are applied at the start of the room's next tick.
+
+A tick overruns when its batch finishes after the tick's deadline, which is
+when the next tick is due, and ticks the ticker had to skip because a batch
+ran long are counted as late. Each room's own step time is recorded too, so
+an expensive room stands out whatever its place in the batch.
+
+One process uses one core. With --workers N the server starts N processes,
+each hosting its own rooms on port PORT + i; clients spread themselves over
+the shards. The loadtest command connects pairs of bot clients to every shard,
+adding rooms step by step until a shard overruns or falls behind, and reports
+the most rooms each core sustained at the full tick rate.
+
+Protocol, newline-delimited JSON over TCP:
+    client -> {"join": true}                  server -> {"room": id, "player": id}
+    client -> {"dy": -3, "shoot": true}       (any number of times)
+    server -> spectate.py frames every tick, {"w": winner_id} when a match ends
+    client -> {"stats": true}                 server -> stats() and closes
+
+Usage:
+    python matchserver.py serve --port 8800 --workers 4
+    python matchserver.py loadtest --port 8800 --shards 4 --step 20 --rooms 400
+
+Classes:
+    Room: One hosted match, its players and its input queue.
+    MatchServer: Accepts players into rooms and ticks every room.
+
+Functions:
+    serve(host, port, workers, ...): Runs the server, one process per shard.
+    bot(host, port, seconds, rng): Plays as a random bot client.
+    fetch_stats(host, port): Asks a shard for its stats.
+    loadtest(host, port, shards, ...): Finds the rooms per core sustained on time.
+    main(argv): Command-line entry point.
+"""
+
+# pylint: disable=wrong-import-position
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+from collections import deque
+from model import Model
+from settings import FPS
+from spectate import _Spectator  # pylint: disable=protected-access
+from spectate import _encode, encode_delta, encode_keyframe, snapshot
+
+# Most unapplied inputs a room keeps; older ones are dropped first
+INPUT_QUEUE_LIMIT = 64
+
+
+class Room:
+    """
+    One hosted match, its connected players and its input queue.
+
+    Attributes:
+        room_id (int): Identifier sent to the room's players.
+        num_players (int): Players needed before the match runs.
+        alien_mode (str): "classic" or "swarm", see Model.
+        model (Model): The current match.
+        inputs (deque): (player_id, dy, shoot) inputs waiting for the next tick.
+        clients (dict): player_id -> connection the room's frames are sent to.
+        ticks (int): Ticks run in this room.
+        step_seconds (float): Time spent stepping and publishing this room.
+        worst_step (float): Longest single tick of this room, in seconds.
+        matches (int): Matches finished in this room.
+    """
+
+    def __init__(self, room_id, num_players=2, alien_mode="classic"):
+        self.room_id = room_id
+        self.num_players = num_players
+        self.alien_mode = alien_mode
+        self.inputs = deque(maxlen=INPUT_QUEUE_LIMIT)
+        self.clients = {}
+        self.ticks = 0
+        self.step_seconds = 0.0
+        self.worst_step = 0.0
+        self.matches = 0
+        self.model = None
+        self._previous = None
+        self.new_match()
+
+    @property
+    def full(self):
+        """
+        bool: Whether every player slot is taken, so the match runs.
+        """
+        return len(self.clients) == self.num_players
+
+    def free_player_id(self):
+        """
+        Get the lowest player ID no connected client has.
+        Returns:
+            int: The player ID, or None if the room is full.
+        """
+        for player_id in range(1, self.num_players + 1):
+            if player_id not in self.clients:
+                return player_id
+        return None
+
+    def new_match(self):
+        """
+        Start a fresh match; the next frame sent is a keyframe.
+        """
+        self.model = Model(num_players=self.num_players, alien_mode=self.alien_mode)
+        self._previous = None
+
+    def step(self):
+        """
+        Apply the queued inputs and advance the match by one tick, in the same
+        order as the game loop.
+        """
+        model = self.model
+        while self.inputs:
+            player_id, dy, shoot = self.inputs.popleft()
+            player = model.get_player(player_id)
+            player.dy = max(-3, min(dy, 3))
+            player.shoot = player.shoot or shoot
+        for player in model.players:
+            player.move()
+        model.fire_pending()
+        model.update()
+        model.events.dispatch()
+        self.ticks += 1
+
+    def publish(self, keyframe_interval):
+        """
+        Encode this tick's frame once and offer it to every player in the room.
+        Args:
+            keyframe_interval (int): Ticks between keyframes.
+        """
+        model = self.model
+        state = snapshot(model)
+        keyframe_bytes = None
+
+        def keyframe():
+            nonlocal keyframe_bytes
+            if keyframe_bytes is None:
+                names = [f"Player {player_id}" for player_id in self.clients]
+                keyframe_bytes = encode_keyframe(model.tick, state, names)
+            return keyframe_bytes
+
+        if self._previous is None or model.tick % keyframe_interval == 0:
+            frame = keyframe()
+        else:
+            frame = encode_delta(model.tick, self._previous, state)
+        self._previous = state
+        for client in self.clients.values():
+            client.offer(frame, keyframe)
+
+    def finish_match(self, winner):
+        """
+        Tell the players who won and start the next match.
+        Args:
+            winner (Player): The winning player.
+        """
+        result = _encode({"w": winner.player_id})
+        for client in self.clients.values():
+            # Frames of the finished match that were not sent yet are dropped
+            client.pending = None
+            client.needs_keyframe = True
+            client.writer.write(result)
+        self.matches += 1
+        self.new_match()
+
+
+class MatchServer:
+    """
+    Accepts players into rooms and advances every running room on one
+    fixed-rate ticker.
+
+    Attributes:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 for any free port.
+        tick_rate (int): Ticks per second.
+        num_players (int): Players per room.
+        alien_mode (str): Alien mode of every room.
+        keyframe_interval (int): Ticks between keyframes sent to players.
+        rooms (dict): room_id -> Room.
+        ticks (int): Batches run by the ticker.
+        late_ticks (int): Ticks skipped because the ticker fell a whole tick behind.
+        overruns (int): Batches that finished after their deadline.
+        worst_lag (float): Latest any batch finished after its deadline, in seconds.
+        batch_seconds (float): Total time spent running batches.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8800,
+        tick_rate=FPS,
+        num_players=2,
+        alien_mode="classic",
+        keyframe_interval=120,
+    ):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.num_players = num_players
+        self.alien_mode = alien_mode
+        self.keyframe_interval = keyframe_interval
+        self.rooms = {}
+        self.ticks = 0
+        self.late_ticks = 0
+        self.overruns = 0
+        self.worst_lag = 0.0
+        self.batch_seconds = 0.0
+        self._next_room_id = 1
+        self._server = None
+        self._ticker = None
+        self._window = (time.perf_counter(), time.process_time(), 0, 0.0)
+
+    async def start(self):
+        """
+        Start listening and ticking on the running event loop.
+        """
+        self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.create_task(self._run_ticker())
+
+    async def stop(self):
+        """
+        Stop ticking, disconnect every player and stop listening.
+        """
+        self._ticker.cancel()
+        for room in list(self.rooms.values()):
+            for client in room.clients.values():
+                client.writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def tick_rooms(self, deadline):
+        """
+        Run one tick of every running room, timing each room, and record
+        whether the batch finished late.
+        Args:
+            deadline (float): perf_counter() time the tick should be done by.
+        """
+        start = room_start = time.perf_counter()
+        for room in list(self.rooms.values()):
+            if not room.full:
+                continue
+            room.step()
+            winner = room.model.get_winner()
+            if winner is not None:
+                room.finish_match(winner)
+            room.publish(self.keyframe_interval)
+            room_end = time.perf_counter()
+            room.step_seconds += room_end - room_start
+            room.worst_step = max(room.worst_step, room_end - room_start)
+            room_start = room_end
+        end = time.perf_counter()
+        lag = end - deadline
+        if lag > 0:
+            self.overruns += 1
+            self.worst_lag = max(self.worst_lag, lag)
+        self.ticks += 1
+        self.batch_seconds += end - start
+
+    def stats(self):
+        """
+        Summarise the server's load. Ticks, mean batch time and CPU use cover
+        the time since the previous call; late ticks and overruns are totals.
+        Returns:
+            dict: Running and waiting rooms, ticks, late ticks, mean batch time
+            in milliseconds, the share of a core used, overruns, the worst lag
+            and the tick budget in milliseconds, and [room_id, ticks, mean_step_ms, worst_step_ms]
+            per room.
+        """
+        now = time.perf_counter()
+        cpu = time.process_time()
+        since, cpu_before, ticks_before, batch_before = self._window
+        self._window = (now, cpu, self.ticks, self.batch_seconds)
+        ticks = self.ticks - ticks_before
+        rooms = list(self.rooms.values())
+        return {
+            "rooms": sum(room.full for room in rooms),
+            "waiting": sum(not room.full for room in rooms),
+            "ticks": ticks,
+            "late_ticks": self.late_ticks,
+            "mean_batch_ms": (self.batch_seconds - batch_before) * 1000 / max(ticks, 1),
+            "cpu": (cpu - cpu_before) / max(now - since, 1e-9),
+            "overruns": self.overruns,
+            "worst_lag_ms": self.worst_lag * 1000,
+            "budget_ms": 1000 / self.tick_rate,
+            "room_stats": [
+                [
+                    room.room_id,
+                    room.ticks,
+                    room.step_seconds * 1000 / max(room.ticks, 1),
+                    room.worst_step * 1000,
+                ]
+                for room in rooms
+            ],
+        }
+
+    async def _run_ticker(self):
+        """
+        Ticker task: runs a batch every 1 / tick_rate seconds. When a batch
+        runs so long that a whole tick was missed, the missed ticks are
+        skipped rather than run back to back.
+        """
+        budget = 1 / self.tick_rate
+        due = time.perf_counter() + budget
+        while True:
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)  # Let players' connections run
+            self.tick_rooms(due + budget)
+            due += budget
+            behind = time.perf_counter() - due
+            if behind > budget:
+                skipped = int(behind / budget)
+                self.late_ticks += skipped
+                due += skipped * budget
+
+    def _room_for_new_player(self):
+        """
+        Find a room waiting for players, or open a new one.
+        Returns:
+            Room: The room.
+        """
+        for room in self.rooms.values():
+            if not room.full:
+                return room
+        room = Room(self._next_room_id, self.num_players, self.alien_mode)
+        self._next_room_id += 1
+        self.rooms[room.room_id] = room
+        return room
+
+    async def _accept(self, reader, writer):
+        """
+        Serve one connection: a stats request, or a player until it disconnects.
+        """
+        request = _message(await reader.readline()) or {}
+        if request.get("stats"):
+            writer.write(_encode(self.stats()))
+            await writer.drain()
+            writer.close()
+            return
+        if not request.get("join"):
+            writer.close()
+            return
+
+        room = self._room_for_new_player()
+        player_id = room.free_player_id()
+        client = _Spectator(writer)
+        room.clients[player_id] = client
+        writer.write(_encode({"room": room.room_id, "player": player_id}))
+        task = asyncio.create_task(client.run())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = _message(line)
+                if message is None:
+                    continue  # Malformed lines are dropped
+                try:
+                    dy = int(message.get("dy", 0))
+                except (TypeError, ValueError, OverflowError):
+                    continue
+                room.inputs.append((player_id, dy, bool(message.get("shoot"))))
+        except ConnectionError:
+            pass
+        finally:
+            del room.clients[player_id]
+            if not room.clients:
+                del self.rooms[room.room_id]
+            elif room.model.tick:
+                room.new_match()  # The remaining players wait for a new opponent
+            task.cancel()
+
+
+def _message(line):
+    """
+    Decode one protocol line.
+    Args:
+        line (bytes): The line.
+    Returns:
+        dict: The message, or None if the line is not a JSON object.
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+async def _serve_shard(host, port, report_every, **options):
+    """
+    Run one shard until interrupted, printing its stats periodically.
+    """
+    server = MatchServer(host, port, **options)
+    await server.start()
+    print(f"Match server listening on {host}:{server.port}")
+    while True:
+        await asyncio.sleep(report_every)
+        stats = server.stats()
+        print(
+            f"[{server.port}] {stats['rooms']} rooms, {stats['waiting']} waiting, "
+            f"batch {stats['mean_batch_ms']:.2f} ms, cpu {stats['cpu']:.0%}, "
+            f"{stats['late_ticks']} late ticks, {stats['overruns']} overruns"
+        )
+
+
+def _run_shard(host, port, report_every, options):
+    """
+    Process body for one shard.
+    """
+    try:
+        asyncio.run(_serve_shard(host, port, report_every, **options))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(host="127.0.0.1", port=8800, workers=1, report_every=10.0, **options):
+    """
+    Run the match server until interrupted. With several workers, worker i
+    is a separate process serving its own rooms on port + i.
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port of the first shard.
+        workers (int): Number of shard processes, 0 for one per core.
+        report_every (float): Seconds between stats lines.
+        **options: Passed to MatchServer.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _run_shard(host, port, report_every, options)
+        return
+    processes = [
+        multiprocessing.Process(
+            target=_run_shard, args=(host, port + i, report_every, options)
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+async def bot(host, port, seconds, rng=None):
+    """
+    Join a room and play randomly, like RandomDriver, for a while.
+    Args:
+        host (str): Server address.
+        port (int): Port of the shard to join.
+        seconds (float): How long to play.
+        rng (random.Random): Random source for decisions.
+    Returns:
+        int: Lines received from the server after joining.
+    """
+    rng = rng or random.Random()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_encode({"join": True}))
+    json.loads(await reader.readline())
+    end = time.perf_counter() + seconds
+    received = 0
+    dy = 0
+    try:
+        while time.perf_counter() < end:
+            try:
+                line = await asyncio.wait_for(
+                    reader.readline(), max(end - time.perf_counter(), 0)
+                )
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            received += 1
+            shoot = rng.random() < 0.1
+            if received % 20 == 0:
+                dy = rng.choice((-3, 0, 3))
+                shoot = True
+            if shoot:
+                writer.write(_encode({"dy": dy, "shoot": True}))
+    finally:
+        writer.close()
+    return received
+
+
+async def fetch_stats(host, port):
+    """
+    Ask a shard for its stats, which also starts its next stats window.
+    Args:
+        host (str): Server address.
+        port (int): Port of the shard.
+    Returns:
+        dict: The shard's MatchServer.stats().
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_encode({"stats": True}))
+    try:
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def measure_rooms(host, port, shards, rooms, seconds=10.0, warmup=2.0):
+    """
+    Fill every shard with bot-played rooms and measure how each shard keeps up.
+    Args:
+        host (str): Server address.
+        port (int): Port of the first shard.
+        shards (int): Number of shards, on port, port + 1, and so on.
+        rooms (int): Rooms to fill across all shards, two bots each.
+        seconds (float): Length of the measurement.
+        warmup (float): Seconds to let rooms fill before measuring.
+    Returns:
+        list: Per shard, its stats with late ticks and overruns counted over
+        the measurement only, plus "budget_rooms", the rooms its mean batch
+        time says would fit in one tick.
+    """
+    ports = [port + i % shards for i in range(rooms)]
+    shard_ports = sorted(set(ports))
+    # Bots play on a little past the measurement so the last stats include them
+    bots = [
+        bot(host, shard_port, warmup + seconds + 1)
+        for shard_port in ports
+        for _ in range(2)
+    ]
+
+    async def measure():
+        await asyncio.sleep(warmup)
+        before = [await fetch_stats(host, shard_port) for shard_port in shard_ports]
+        await asyncio.sleep(seconds)
+        after = [await fetch_stats(host, shard_port) for shard_port in shard_ports]
+        for first, stats in zip(before, after):
+            stats["late_ticks"] -= first["late_ticks"]
+            stats["overruns"] -= first["overruns"]
+        return after
+
+    *_, results = await asyncio.gather(*bots, measure())
+    for stats in results:
+        stats["budget_rooms"] = (
+            stats["rooms"] * stats["budget_ms"] / max(stats["mean_batch_ms"], 1e-9)
+        )
+    return results
+
+
+async def loadtest(host, port, shards=1, rooms=400, step=20, seconds=10.0, warmup=2.0):
+    """
+    Add rooms step by step until some shard overruns or falls behind, to find
+    how many rooms one core runs at the full tick rate.
+    Args:
+        host (str): Server address.
+        port (int): Port of the first shard.
+        shards (int): Number of shards, on port, port + 1, and so on.
+        rooms (int): Most rooms to try across all shards.
+        step (int): Rooms added at each step.
+        seconds (float): Length of each step's measurement.
+        warmup (float): Seconds to let rooms fill before measuring.
+    Returns:
+        dict: "steps", the per-shard stats of each step, and "rooms_per_core",
+        the most rooms every shard ran without overruns or late ticks.
+    """
+    steps = []
+    rooms_per_core = 0
+    for count in range(step, rooms + 1, step):
+        results = await measure_rooms(host, port, shards, count, seconds, warmup)
+        steps.append(results)
+        if any(stats["overruns"] or stats["late_ticks"] for stats in results):
+            break
+        rooms_per_core = min(stats["rooms"] for stats in results)
+    return {"steps": steps, "rooms_per_core": rooms_per_core}
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    Args:
+        argv (list): Arguments to parse. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Cosmic Clash match server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="host rooms")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8800)
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="shard processes, 0 for one per core"
+    )
+    serve_parser.add_argument("--players", type=int, default=2)
+    serve_parser.add_argument("--swarm", action="store_true")
+    serve_parser.add_argument("--report-every", type=float, default=10.0)
+    load_parser = commands.add_parser("loadtest", help="play rooms with bots")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8800)
+    load_parser.add_argument("--shards", type=int, default=1)
+    load_parser.add_argument("--rooms", type=int, default=400)
+    load_parser.add_argument("--step", type=int, default=20)
+    load_parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(
+            args.host,
+            args.port,
+            args.workers,
+            args.report_every,
+            num_players=max(args.players, 2),
+            alien_mode="swarm" if args.swarm else "classic",
+        )
+        return
+    report = asyncio.run(
+        loadtest(args.host, args.port, args.shards, args.rooms, args.step, args.seconds)
+    )
+    for results in report["steps"]:
+        for shard, stats in enumerate(results):
+            print(
+                f"shard {shard}: {stats['rooms']} rooms, cpu {stats['cpu']:.0%}, "
+                f"batch {stats['mean_batch_ms']:.2f} ms, "
+                f"{stats['late_ticks']} late ticks, {stats['overruns']} overruns, "
+                f"~{stats['budget_rooms']:.0f} rooms fit the tick budget"
+            )
+    print(f"{report['rooms_per_core']} rooms per core ran on time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+metrics.py
+
+Live metrics for unattended game instances. Counters, gauges and histograms
+are plain Python objects updated from the game loop without locks: each one
+is written by a single thread, and readers only ever see a slightly stale
+value. A background HTTP server exposes everything in the Prometheus text
+format on localhost.
+
+Usage:
+    python game.py --metrics-port 9100
+    curl http://127.0.0.1:9100/metrics
+
+Classes:
+    Counter: Monotonically increasing value.
+    Gauge: Value that can go up and down.
+    Histogram: Distribution of observed values over fixed buckets.
+    Registry: Collection of metrics rendered together.
+    MetricsServer: Serves a registry over HTTP from a daemon thread.
+"""
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Frame-time buckets in seconds, dense around the 16.7 ms budget at 60 FPS
+FRAME_BUCKETS = (0.002, 0.004, 0.008, 0.012, 0.0167, 0.020, 0.033, 0.050, 0.100)
+
+
+class Counter:
+    """
+    Monotonically increasing value.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): One-line description.
+        value (float): Current total.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        """
+        Increase the counter.
+        Args:
+            amount (float): Amount to add.
+        """
+        self.value += amount
+
+    def samples(self):
+        """
+        Get the exposition lines for this metric.
+        Returns:
+            list: (suffix, labels, value) tuples.
+        """
+        return [("_total", "", self.value)]
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down.
+    """
+
+    kind = "gauge"
+
+    def set(self, value):
+        """
+        Set the gauge.
+        Args:
+            value (float): New value.
+        """
+        self.value = value
+
+    def samples(self):
+        """
+        Get the exposition lines for this metric.
+        Returns:
+            list: (suffix, labels, value) tuples.
+        """
+        return [("", "", self.value)]
+
+
+class Histogram:
+    """
+    Distribution of observed values. Bucket counts are stored per bucket and
+    only made cumulative when rendered, so observe() touches a single slot.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): One-line description.
+        buckets (tuple): Upper bounds of the buckets, ascending.
+        counts (list): Observations per bucket, with a final +Inf slot.
+        sum (float): Sum of all observations.
+        count (int): Number of observations.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=FRAME_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Record one observation.
+        Args:
+            value (float): Observed value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        """
+        Get the exposition lines for this metric.
+        Returns:
+            list: (suffix, labels, value) tuples.
+        """
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), list(self.counts)):
+            cumulative += count
+            lines.append(("_bucket", f'{{le="{bound}"}}', cumulative))
+        lines.append(("_sum", "", self.sum))
+        lines.append(("_count", "", self.count))
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together.
+
+    Attributes:
+        metrics (list): Registered metrics in registration order.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """
+        Add a metric to the registry.
+        Args:
+            metric (Counter|Gauge|Histogram): Metric to add.
+        Returns:
+            The metric, so registration can be used inline.
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format.
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves a registry at /metrics from a daemon thread.
+
+    Attributes:
+        registry (Registry): Metrics to serve.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 for any free port.
+    """
+
+    def __init__(self, registry, host="127.0.0.1", port=9100):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd = None
+
+    def start(self):
+        """
+        Start serving in a daemon thread.
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Answers GET /metrics with the rendered registry.
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Serve the exposition text.
+                """
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """
+                Keep scrapes out of the game's console output.
+                """
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        """
+        Stop serving.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# Metrics fed by the game loop
+registry = Registry()
+frame_seconds = registry.register(
+    Histogram("cosmic_frame_seconds", "Wall time of one main-loop frame.")
+)
+update_seconds = registry.register(
+    Histogram("cosmic_model_update_seconds", "Time spent in Model.update.")
+)
+render_seconds = registry.register(
+    Histogram("cosmic_render_seconds", "Time spent in view.render.")
+)
+tick_overruns = registry.register(
+    Counter("cosmic_tick_overruns", "Frames whose work exceeded the frame budget.")
+)
+ticks = registry.register(Counter("cosmic_ticks", "Simulation ticks run."))
+matches = registry.register(Counter("cosmic_matches", "Matches finished."))
+aliens = registry.register(Gauge("cosmic_aliens", "Live aliens."))
+bullets = registry.register(Gauge("cosmic_bullets", "Live bullets."))
+particles = registry.register(Gauge("cosmic_particles", "Live particles."))
+draw_calls = registry.register(Gauge("cosmic_draw_calls", "Draw calls last frame."))
+sprites = registry.register(Gauge("cosmic_sprites", "Sprites drawn last frame."))
+game_events = registry.register(
+    Counter("cosmic_game_events", "Events published on the game event bus.")
+)
+quality_tier = registry.register(
+    Gauge("cosmic_quality_tier", "Quality tier, 0 for full quality.")
+)
+quality_changes = registry.register(
+    Counter("cosmic_quality_changes", "Quality tier changes.")
+)
@@ -6,62 +6,180 @@ It includes classes for Player, Alien, Bullet, and the central Model that manage
 
 Classes:
     Player: Represents a player character with movement and shooting abilities.
+    PlayerIndex: Looks up the player guarding a given height on each side.
     Alien: Represents an enemy that moves and can collide with players.
     Bullet: Represents a projectile shot by a player.
     Model: Represents the game state and contains update logic.
+
+Positions are in world coordinates. The arena is WORLD_WIDTH x WORLD_HEIGHT,
+which may be larger than the window, and aliens and bullets are also stored
+in spatial chunks (see world.py) so each update only does per-entity work in
+the regions that need it. Timed events such as spawns and shot cooldowns are
+counted in ticks on the Model's timer wheel (see scheduler.py).
+
+The Model keeps a hash of its simulation state, updated as entities change,
+and records one value per tick so runs can be compared (see statehash.py).
 """
 
+import copy
 import random
+from array import array
+from bisect import bisect_right
 import pygame
-from settings import HEIGHT, WIDTH
+from assets import load_sprite
+from collision import sprites_overlap
+from events import EventBus
+from eventlog import (
+    ALIEN_DEATH,
+    BOUNCE,
+    HIT,
+    INTERCEPT,
+    LIFE_LOST,
+    MATCH_START,
+    SCORE,
+    SHOT,
+)
+from settings import (
+    ACTIVE_CHUNK_RADIUS,
+    ALIEN_MODE,
+    ALIEN_SIZE,
+    BULLET_SIZE,
+    CHUNK_SIZE,
+    COLLISION_MODE,
+    FAR_TICK_STRIDE,
+    FPS,
+    PLAYER_SIZE,
+    SWARM_WAVE_SIZE,
+    WINNING_SCORE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from scheduler import TimerWheel
+from statehash import chain, digest
+from swarm import Flock
+from world import BulletLanes, ChunkGrid
+
+# X-coordinate of the players on each side of the arena
+SIDE_X = {"left": 50, "right": WORLD_WIDTH - 50}
+
+# Vertical range players can move in, above the hearts area
+PLAY_TOP = 80
+PLAY_BOTTOM = WORLD_HEIGHT - 30
+
+# Farthest a bullet can be from an alien it hits, in either collision mode
+HIT_REACH = (ALIEN_SIZE[0] + BULLET_SIZE[0]) // 2
+
+# Ticks between alien spawns and between a player's shots
+ALIEN_SPAWN_TICKS = 1500 * FPS // 1000
+SHOT_DELAY_TICKS = 300 * FPS // 1000
+
+
+def layout_players(count):
+    """
+    Assign sides and lanes for a match. Odd player IDs defend the left side and
+    even IDs the right side, and each side's height is split into equal lanes.
+    Args:
+        count (int): Number of players, at least 2.
+    Returns:
+        list: (player_id, side, lane) per player, where lane is (top, bottom),
+        or None for a player who has the whole side to themselves.
+    """
+    sides = {"left": [], "right": []}
+    for player_id in range(1, count + 1):
+        sides["left" if player_id % 2 else "right"].append(player_id)
+    layout = []
+    for side, members in sides.items():
+        height = (PLAY_BOTTOM - PLAY_TOP) / len(members)
+        for i, player_id in enumerate(members):
+            lane = None
+            if len(members) > 1:
+                lane = (int(PLAY_TOP + i * height), int(PLAY_TOP + (i + 1) * height))
+            layout.append((player_id, side, lane))
+    return sorted(layout)
 
 
 class Player:
     """
     Player class representing each player in the game.
     Each player has an ID, position, health, score, and shooting capabilities.
+    Players defend the left or right side, optionally within a vertical lane.
     """
 
-    def __init__(self, player_id):
+    events = None
+    digest = 0  # Contribution to the Model's state hash, set by the Model
+
+    def __init__(self, player_id, side=None, lane=None):
         self.player_id = player_id
-        self.image = pygame.image.load(f"assets/player{player_id}.png").convert_alpha()
-        self.x = 50 if player_id == 1 else WIDTH - 50
-        self.y = HEIGHT // 2
+        if side is None:
+            side = "left" if player_id % 2 else "right"
+        self.side = side
+        self.lane = lane or (PLAY_TOP, PLAY_BOTTOM)
+        self.image = load_sprite("player1" if side == "left" else "player2")
+        self.x = SIDE_X[side]
+        self.y = WORLD_HEIGHT // 2 if lane is None else (lane[0] + lane[1]) // 2
         self.health = 3
         self.score = 0
         self.alive = True
         self.dy = 0
         self.shot_delay = 300  # milliseconds
         self.last_shot_time = 0
+        self.reloading = False  # Set by the Model while a shot cooldown runs
+        self.live_bullets = 0  # Bullets of this player still in flight
         self.shoot = False
 
     def move(self):
         """
         Move the player vertically based on the current dy value.
-        The player cannot move into the hearts area at the bottom of the screen.
+        The player cannot move into the hearts area at the bottom of the screen
+        or out of their lane.
         """
         self.y += self.dy
-        self.y = max(80, min(self.y, HEIGHT - 30))  # Prevent moving into hearts area
+        self.y = max(self.lane[0], min(self.y, self.lane[1]))  # Stay in lane
 
-    def can_shoot(self):
+    def state_digest(self):
         """
-        Check if the player can shoot based on the shot delay.
+        Compute the player's contribution to the Model's state hash.
+        Returns:
+            int: 64-bit digest.
+        """
+        return digest(
+            1,
+            self.player_id,
+            self.x,
+            self.y,
+            self.health,
+            self.score,
+            self.alive,
+            self.reloading,
+            self.live_bullets,
+        )
+
+    def can_shoot(self, current_time=None):
+        """
+        Check if the player can shoot based on the shot delay. This is the
+        cooldown for a player used on its own; inside a Model, cooldowns run
+        on the Model's timer wheel instead.
+        Args:
+            current_time (int): Time in milliseconds. Defaults to pygame's clock.
         Returns:
             bool: True if the player can shoot, False otherwise.
         """
-        current_time = pygame.time.get_ticks()
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         if current_time - self.last_shot_time > self.shot_delay:
             self.last_shot_time = current_time
             return True
         return False
 
-    def shoot_bullet(self):
+    def shoot_bullet(self, current_time=None):
         """
         Create a new bullet if the player can shoot.
+        Args:
+            current_time (int): Time in milliseconds. Defaults to pygame's clock.
         Returns:
             Bullet: A new Bullet instance if the player can shoot, None otherwise.
         """
-        if self.can_shoot():
+        if self.can_shoot(current_time):
             return Bullet(self, self.player_id)
         return None
 
@@ -89,6 +207,18 @@ class Player:
         """
         return self.alive
 
+    def add_score(self, points=1):
+        """
+        Increase the player's score.
+        Args:
+            points (int): Number of points to add.
+        """
+        self.score += points
+        if self.events is not None:
+            self.events.publish(
+                SCORE, self.player_id, x=self.x, y=self.y, value=self.score
+            )
+
     def lose_life(self):
         """
         Decrease the player's health by 1. If health reaches 0, set alive to False.
@@ -96,6 +226,10 @@ class Player:
         self.health -= 1
         if self.health <= 0:
             self.alive = False
+        if self.events is not None:
+            self.events.publish(
+                LIFE_LOST, self.player_id, x=self.x, y=self.y, value=self.health
+            )
 
 
 class Alien:
@@ -110,31 +244,55 @@ class Alien:
         rect (pygame.Rect): Rect for collision detection.
         direction_x (int): Horizontal movement direction.
         opacity (int): Transparency level for visual effects.
+        speed_x (float): Horizontal speed in pixels per tick.
+        speed_y (float): Vertical speed in pixels per tick, only used by swarms.
+        alien_id (int): Identifier assigned by the Model when spawned.
+        chunk (tuple): Key of the Model chunk the alien is stored in, or None.
+        digest (int): Contribution to the Model's state hash, set by the Model.
     """
 
-    def __init__(self):
-        original_image = pygame.image.load("assets/alien.png").convert_alpha()
-        width, height = original_image.get_size()
-        scaled_width = int(width * 0.75)
-        scaled_height = int(height * 0.75)
-        self.image = pygame.transform.smoothscale(
-            original_image, (scaled_width, scaled_height)
-        )
+    events = None
+    digest = 0
+
+    def __init__(self, rng=random):
+        self.image = load_sprite("alien")
 
-        self.x = WIDTH // 2
-        self.y = random.randint(80, HEIGHT - 30)
-        self.speed_x = 2 if random.choice([True, False]) else -2
+        self.x = WORLD_WIDTH // 2
+        self.y = rng.randint(80, WORLD_HEIGHT - 30)
+        self.speed_x = 2 if rng.choice([True, False]) else -2
+        self.speed_y = 0
         self.health = 3
         self.alive = True
+        self.alien_id = 0
+        self.chunk = None
 
-    def move(self):
+    def move(self, steps=1):
         """
-        Move the alien horizontally based on its speed.
-        If it hits the screen edges, it bounces back.
+        Move the alien based on its speed.
+        If it hits the arena edges, it bounces back.
+        Args:
+            steps (int): Number of ticks of movement to apply at once.
         """
-        self.x += self.speed_x
-        if self.x <= 0 or self.x >= WIDTH:
+        self.x += self.speed_x * steps
+        if self.speed_y:
+            self.y += self.speed_y * steps
+            if self.y < PLAY_TOP or self.y > PLAY_BOTTOM:
+                self.speed_y = -self.speed_y
+                self.y = max(PLAY_TOP, min(self.y, PLAY_BOTTOM))
+        if self.x <= 0 or self.x >= WORLD_WIDTH:
             self.swap_direction_x()
+            if self.events is not None:
+                self.events.publish(BOUNCE, entity_id=self.alien_id, x=self.x, y=self.y)
+
+    def state_digest(self):
+        """
+        Compute the alien's contribution to the Model's state hash.
+        Returns:
+            int: 64-bit digest.
+        """
+        return digest(
+            2, self.alien_id, self.x, self.y, self.speed_x, self.speed_y, self.health
+        )
 
     def swap_direction_x(self):
         """
@@ -159,29 +317,35 @@ class Alien:
         self.health -= 1
         if self.health <= 0:
             self.alive = False
+            kind = ALIEN_DEATH
         else:
             self.swap_direction_x()  # Bounce horizontally on first and second hits
+            kind = BOUNCE
+        if self.events is not None:
+            self.events.publish(
+                kind, entity_id=self.alien_id, x=self.x, y=self.y, value=self.health
+            )
 
-    def check_collision_with_player(self, player1, player2):
+    def touches(self, player, accurate=False):
         """
-        Check for collision with players. If a player is hit, they lose a life.
-        If the alien is hit, it loses a life.
+        Check whether the alien has reached a player.
         Args:
-            player1 (Player): First player instance.
-            player2 (Player): Second player instance.
-        1. If the alien collides with player1, player1 loses a life and player2 scores.
-        2. If the alien collides with player2, player2 loses a life and player1 scores.
-        3. If the alien is hit by a bullet, it loses a life and the bullet is removed.
-        4. If the alien's health reaches 0, it is marked as not alive.
-        """
-        if abs(self.x - player1.x) < 30:
-            player1.lose_life()
-            player2.score += 1
-            self.alive = False
-        elif abs(self.x - player2.x) < 30:
-            player2.lose_life()
-            player1.score += 1
-            self.alive = False
+            player (Player): Player to test against.
+            accurate (bool): Require the sprites to overlap pixel for pixel instead
+                of only comparing x-coordinates.
+        Returns:
+            bool: True if the alien has reached the player.
+        """
+        if not accurate:
+            return abs(self.x - player.x) < 30
+        return sprites_overlap(
+            self.image,
+            ALIEN_SIZE,
+            (self.x, self.y),
+            player.image,
+            PLAYER_SIZE,
+            (player.x, player.y),
+        )
 
 
 class Bullet:
@@ -193,20 +357,39 @@ class Bullet:
         y (int): Y-coordinate of the bullet.
         speed (int): Horizontal speed of the bullet.
         alive (bool): Whether the bullet is still active.
+        player_id (int): ID of the player who fired the bullet.
+        bullet_id (int): Identifier assigned by the Model when fired.
+        chunk (tuple): Key of the Model chunk the bullet is stored in, or None.
+        digest (int): Contribution to the Model's state hash, set by the Model.
     """
 
+    digest = 0
+
     def __init__(self, player, player_id):
-        self.image = pygame.image.load("assets/bullets.png").convert_alpha()
+        self.image = load_sprite("bullet")
+        self.player_id = player_id
+        self.bullet_id = 0
+        self.chunk = None
         self.x = int(player.x)
         self.y = int(player.y)
-        self.speed = 10 if player_id == 1 else -10
+        self.speed = 10 if player.side == "left" else -10
         self.alive = True
 
-    def move(self):
+    def move(self, steps=1):
         """
         Move the bullet horizontally based on its speed.
+        Args:
+            steps (int): Number of ticks of movement to apply at once.
         """
-        self.x += self.speed
+        self.x += self.speed * steps
+
+    def state_digest(self):
+        """
+        Compute the bullet's contribution to the Model's state hash.
+        Returns:
+            int: 64-bit digest.
+        """
+        return digest(3, self.bullet_id, self.x, self.y, self.speed, self.player_id)
 
     def get_position(self):
         """
@@ -218,11 +401,68 @@ class Bullet:
 
     def is_off_screen(self):
         """
-        Check if the bullet is off the screen.
+        Check if the bullet has left the arena.
+        Returns:
+            bool: True if the bullet is outside the arena, False otherwise.
+        """
+        return self.x < 0 or self.x > WORLD_WIDTH
+
+
+class PlayerIndex:
+    """
+    Players grouped by side and sorted by lane, so the player guarding a given
+    height is found with a binary search instead of a scan.
+
+    Attributes:
+        sides (dict): side -> (players sorted by lane top, their lane tops).
+    """
+
+    def __init__(self, players):
+        self.sides = {}
+        for side in SIDE_X:
+            members = sorted(
+                (player for player in players if player.side == side),
+                key=lambda player: player.lane[0],
+            )
+            self.sides[side] = (members, [player.lane[0] for player in members])
+
+    def players_on(self, side):
+        """
+        Get the players defending a side.
+        Args:
+            side (str): "left" or "right".
+        Returns:
+            list: The side's players, top lane first.
+        """
+        return self.sides[side][0]
+
+    def player_at(self, side, y):
+        """
+        Get the player whose lane contains a height.
+        Args:
+            side (str): "left" or "right".
+            y (int): Height to look up.
+        Returns:
+            Player: The guarding player, or None if the side is empty.
+        """
+        members, tops = self.sides[side]
+        if not members:
+            return None
+        return members[max(bisect_right(tops, y) - 1, 0)]
+
+    def players_between(self, side, top, bottom):
+        """
+        Get the players whose lanes overlap a height range.
+        Args:
+            side (str): "left" or "right".
+            top (int): Top of the range.
+            bottom (int): Bottom of the range.
         Returns:
-            bool: True if the bullet is off the screen, False otherwise.
+            list: The players, top lane first.
         """
-        return self.x < 0 or self.x > WIDTH
+        members, tops = self.sides[side]
+        start = max(bisect_right(tops, top) - 1, 0)
+        return members[start : bisect_right(tops, bottom)]
 
 
 class Model:
@@ -232,32 +472,276 @@ class Model:
     Manages players, aliens, bullets, and collision logic.
 
     Attributes:
+        players (list): Player instances, ordered by player ID.
         player1 (Player): First player instance.
         player2 (Player): Second player instance.
+        index (PlayerIndex): Players by side and lane.
         aliens (list): List of active Alien instances.
         bullets (list): List of active Bullet instances.
+        alien_chunks (ChunkGrid): The aliens, by chunk.
+        bullet_chunks (ChunkGrid): The bullets, by chunk.
+        alien_phases (list): FAR_TICK_STRIDE dicts of alien_id -> alien. Aliens
+            in far chunks move on the ticks whose tick % FAR_TICK_STRIDE is
+            their dict's index, so the ones due are found without a scan.
+        bullet_phases (list): As alien_phases, for the bullets by bullet_id.
+        bullet_lanes (BulletLanes): The bullets, by height lane and direction,
+            for finding opposing bullets that intercept each other.
+        focus (list): (left, top, right, bottom) world regions simulated at full
+            rate besides the players' surroundings, usually the camera views.
+        timers (TimerWheel): Pending timed events. Each fires on the tick it is
+            due and is dispatched to the Model's _on_<kind> method.
+        alien_spawn_ticks (int): Ticks between alien spawns.
+        max_aliens (int): Live aliens above which spawns are skipped, or None.
+        max_bullets_per_player (int): Live bullets a player may have, or None.
+        tick (int): Number of updates run so far.
+        events (EventBus): Bus the match's events are published to, drained by
+            the game once per frame. None on clones.
+        event_log (EventLog): Optional log subscribed to the bus.
+        rng (random.Random): Random source for alien spawns, owned by this model.
+        collision_mode (str): "box" for distance checks, "mask" for pixel-accurate overlap.
+        flock (Flock): Steering applied to every alien each tick in "swarm" mode,
+            or None for classic aliens.
+        hashes (array): Chained state hash after each tick; hashes[t - 1] is
+            for tick t. A clone starts a new stream.
     """
 
-    def __init__(self):
-        self.player1 = Player(1)
-        self.player2 = Player(2)
+    def __init__(
+        self,
+        event_log=None,
+        collision_mode=COLLISION_MODE,
+        num_players=2,
+        alien_mode=ALIEN_MODE,
+    ):
+        self.players = [
+            Player(player_id, side, lane)
+            for player_id, side, lane in layout_players(num_players)
+        ]
+        self.index = PlayerIndex(self.players)
         self.aliens = []
         self.bullets = []
-        self.last_alien_spawn_time = pygame.time.get_ticks()
-        self.alien_spawn_interval = 1500  # More frequent alien spawn
+        self.alien_chunks = ChunkGrid()
+        self.bullet_chunks = ChunkGrid()
+        self.bullet_lanes = BulletLanes()
+        self.alien_phases = [{} for _ in range(FAR_TICK_STRIDE)]
+        self.bullet_phases = [{} for _ in range(FAR_TICK_STRIDE)]
+        self.focus = []
+        self.rng = random.Random()
+        self.collision_mode = collision_mode
+        self.flock = Flock() if alien_mode == "swarm" else None
+        self.timers = TimerWheel()
+        self.alien_spawn_ticks = ALIEN_SPAWN_TICKS
+        self.max_aliens = None
+        self.max_bullets_per_player = None
+        self.timers.schedule(self.alien_spawn_ticks, "spawn")
+        self.tick = 0
+        self.next_alien_id = 1
+        self.next_bullet_id = 1
+        self.event_log = event_log
+        self.events = EventBus()
+        for player in self.players:
+            player.events = self.events
+        if event_log is not None:
+            self.events.subscribe(event_log.write_batch)
+        self.events.publish(MATCH_START)
+        self.hashes = array("Q")
+        self._chained = 0
+        self.rehash()
+
+    @property
+    def player1(self):
+        """
+        Player: The first player.
+        """
+        return self.players[0]
+
+    @property
+    def player2(self):
+        """
+        Player: The second player.
+        """
+        return self.players[1]
+
+    def get_player(self, player_id):
+        """
+        Get a player by ID.
+        Args:
+            player_id (int): ID of the player.
+        Returns:
+            Player: The player.
+        """
+        return self.players[player_id - 1]
+
+    def opponents_of(self, side):
+        """
+        Get the players defending the other side.
+        Args:
+            side (str): "left" or "right".
+        Returns:
+            list: The opposing players.
+        """
+        return self.index.players_on("right" if side == "left" else "left")
+
+    def get_winner(self):
+        """
+        Get the player who has reached the winning score.
+        Returns:
+            Player: The winning player, or None while the match is undecided.
+        """
+        for player in self.players:
+            if player.score >= WINNING_SCORE:
+                return player
+        return None
+
+    def clone(self):
+        """
+        Make an independent copy of the game state for simulation.
+        Entities are copied but their surfaces are shared, and the copy has its
+        own timers and RNG and publishes no events.
+        Returns:
+            Model: The copy.
+        """
+        twin = copy.copy(self)
+        twin.players = [copy.copy(player) for player in self.players]
+        twin.index = PlayerIndex(twin.players)
+        twin.aliens = [copy.copy(alien) for alien in self.aliens]
+        twin.bullets = [copy.copy(bullet) for bullet in self.bullets]
+        twin.alien_chunks = ChunkGrid()
+        twin.alien_phases = [{} for _ in range(FAR_TICK_STRIDE)]
+        for alien in twin.aliens:
+            twin.alien_chunks.insert(alien)
+            twin.alien_phases[-alien.alien_id % FAR_TICK_STRIDE][alien.alien_id] = alien
+        twin.bullet_chunks = ChunkGrid()
+        twin.bullet_lanes = BulletLanes()
+        twin.bullet_phases = [{} for _ in range(FAR_TICK_STRIDE)]
+        for bullet in twin.bullets:
+            twin.bullet_chunks.insert(bullet)
+            twin.bullet_lanes.insert(bullet)
+            twin.bullet_phases[-bullet.bullet_id % FAR_TICK_STRIDE][
+                bullet.bullet_id
+            ] = bullet
+        twin.timers = self.timers.copy()
+        twin.hashes = array("Q")
+        twin.rng = random.Random()
+        twin.rng.setstate(self.rng.getstate())
+        twin.event_log = None
+        twin.events = None
+        for player in twin.players:
+            player.events = None
+        for alien in twin.aliens:
+            alien.events = None
+        return twin
+
+    @property
+    def state_hash(self):
+        """
+        int: 64-bit hash of the simulation state, kept up to date incrementally.
+        """
+        return (
+            self._entity_hash
+            ^ self.timers.digest
+            ^ self._rng_digest
+            ^ digest(self.tick, self.next_alien_id, self.next_bullet_id)
+        )
+
+    def full_state_hash(self):
+        """
+        Compute the state hash from scratch, for checking the incremental one.
+        Returns:
+            int: The hash state_hash should equal.
+        """
+        entity_hash = 0
+        for entity in (*self.players, *self.aliens, *self.bullets):
+            entity_hash ^= entity.state_digest()
+        timer_hash = 0
+        for slot in self.timers.slots:
+            for timer in slot:
+                if not timer.cancelled:
+                    timer_hash ^= timer.state_digest()
+        return (
+            entity_hash
+            ^ timer_hash
+            ^ digest(*self.rng.getstate()[1])
+            ^ digest(self.tick, self.next_alien_id, self.next_bullet_id)
+        )
+
+    def rehash(self):
+        """
+        Recompute every cached digest. Needed only after the state was changed
+        from outside the Model, such as reseeding its RNG.
+        """
+        self._entity_hash = 0
+        for entity in (*self.players, *self.aliens, *self.bullets):
+            entity.digest = entity.state_digest()
+            self._entity_hash ^= entity.digest
+        self._rehash_rng()
+
+    def _rehash(self, entity):
+        """
+        Swap an entity's old digest for its current one in the state hash.
+        Args:
+            entity (Player | Alien | Bullet): The changed entity.
+        """
+        new = entity.state_digest()
+        self._entity_hash ^= entity.digest ^ new
+        entity.digest = new
+
+    def _unhash(self, entity):
+        """
+        Take a removed entity out of the state hash.
+        Args:
+            entity (Alien | Bullet): The removed entity.
+        """
+        self._entity_hash ^= entity.digest
+        entity.digest = 0
+
+    def _rehash_rng(self):
+        """
+        Update the RNG's part of the state hash after it was drawn from.
+        """
+        self._rng_digest = digest(*self.rng.getstate()[1])
+
+    def fire_pending(self):
+        """
+        Fire a bullet for every player whose shoot flag is set, then clear the flags.
+        Returns:
+            list: IDs of the players who pulled the trigger.
+        """
+        fired = []
+        for player in self.players:
+            if player.shoot:
+                self.add_bullet(player.player_id)
+                player.shoot = False
+                fired.append(player.player_id)
+        return fired
 
     def add_bullet(self, player_id):
         """
-        Add a bullet to the game based on the player ID.
+        Add a bullet to the game based on the player ID, unless the player is
+        still reloading from their last shot.
         Args:
             player_id (int): ID of the player who is shooting."""
-        bullet = (
-            self.player1.shoot_bullet()
-            if player_id == 1
-            else self.player2.shoot_bullet()
-        )
-        if bullet:
-            self.bullets.append(bullet)
+        player = self.get_player(player_id)
+        if player.reloading:
+            return
+        limit = self.max_bullets_per_player
+        if limit is not None and player.live_bullets >= limit:
+            return
+        player.reloading = True
+        self.timers.schedule(SHOT_DELAY_TICKS, "reload", player_id)
+        bullet = Bullet(player, player_id)
+        bullet.bullet_id = self.next_bullet_id
+        self.next_bullet_id += 1
+        player.live_bullets += 1
+        self.bullets.append(bullet)
+        self.bullet_chunks.insert(bullet)
+        self.bullet_lanes.insert(bullet)
+        self.bullet_phases[-bullet.bullet_id % FAR_TICK_STRIDE][
+            bullet.bullet_id
+        ] = bullet
+        self._rehash(player)
+        self._rehash(bullet)
+        if self.events is not None:
+            self.events.publish(SHOT, player_id, x=bullet.x, y=bullet.y)
 
     def remove_bullet(self, bullet):
         """
@@ -267,47 +751,299 @@ class Model:
         """
         if bullet in self.bullets:
             self.bullets.remove(bullet)
+            self.bullet_chunks.remove(bullet)
+            self.bullet_lanes.remove(bullet)
+            del self.bullet_phases[-bullet.bullet_id % FAR_TICK_STRIDE][
+                bullet.bullet_id
+            ]
+            self._unhash(bullet)
+            player = self.get_player(bullet.player_id)
+            player.live_bullets -= 1
+            self._rehash(player)
 
     def spawn_alien(self):
         """
         Spawn a new alien at a random vertical position.
         The alien's horizontal speed is randomly set to either 2 or -2.
+        Nothing is spawned while max_aliens aliens are alive.
+        Returns:
+            Alien: The new alien, or None if the cap was reached.
         """
-        new_alien = Alien()
+        if self.max_aliens is not None and len(self.aliens) >= self.max_aliens:
+            return None
+        new_alien = Alien(self.rng)
+        new_alien.alien_id = self.next_alien_id
+        new_alien.events = self.events
+        self.next_alien_id += 1
         self.aliens.append(new_alien)
+        self.alien_chunks.insert(new_alien)
+        self.alien_phases[-new_alien.alien_id % FAR_TICK_STRIDE][
+            new_alien.alien_id
+        ] = new_alien
+        self._rehash(new_alien)
+        self._rehash_rng()
+        return new_alien
+
+    def _remove_alien(self, alien):
+        """
+        Take a dead alien out of the game.
+        Args:
+            alien (Alien): The alien to remove.
+        """
+        self.aliens.remove(alien)
+        self.alien_chunks.remove(alien)
+        del self.alien_phases[-alien.alien_id % FAR_TICK_STRIDE][alien.alien_id]
+        self._unhash(alien)
+
+    def _on_spawn(self):
+        """
+        Timer handler: spawn an alien, or a wave of them in swarm mode, and
+        schedule the next spawn.
+        """
+        if self.flock is None:
+            self.spawn_alien()
+        else:
+            for _ in range(SWARM_WAVE_SIZE):
+                alien = self.spawn_alien()
+                if alien is None:
+                    break
+                alien.x += self.rng.randint(-40, 40)
+                alien.speed_y = self.rng.uniform(-1, 1)
+                self.alien_chunks.relocate(alien)
+                self._rehash(alien)
+            self._rehash_rng()
+        self.timers.schedule(self.alien_spawn_ticks, "spawn")
+
+    def _on_reload(self, player_id):
+        """
+        Timer handler: end a player's shot cooldown.
+        Args:
+            player_id (int): ID of the player.
+        """
+        player = self.get_player(player_id)
+        player.reloading = False
+        self._rehash(player)
+
+    def active_chunks(self):
+        """
+        Get the chunks simulated at full rate: the columns around each player,
+        who can sweep the whole height of their side, and the regions around
+        the focus.
+        Returns:
+            set: (column, row) chunk keys.
+        """
+        grid = self.alien_chunks
+        margin = ACTIVE_CHUNK_RADIUS * CHUNK_SIZE
+        active = set()
+        for side_x in {player.x for player in self.players}:
+            active |= grid.keys_in(side_x - margin, 0, side_x + margin, WORLD_HEIGHT)
+        for left, top, right, bottom in self.focus:
+            active |= grid.keys_in(
+                left - margin, top - margin, right + margin, bottom + margin
+            )
+        return active
+
+    def due_entities(self, grid, phases, active):
+        """
+        Get the entities to move this tick: every one in an active chunk, by
+        one step, and the far ones whose phase is due, by FAR_TICK_STRIDE
+        steps. Phases follow the entity's ID, so crossing into another chunk
+        never moves an entity early or late. The list is built before anything
+        moves, so an entity crossing into a chunk not yet visited is not moved
+        twice.
+        Args:
+            grid (ChunkGrid): alien_chunks or bullet_chunks.
+            phases (list): alien_phases or bullet_phases.
+            active (set): Keys of the chunks simulated at full rate.
+        Returns:
+            list: (entity, steps) pairs.
+        """
+        chunks = grid.chunks
+        due = [
+            (entity, 1)
+            for key in sorted(active)
+            if key in chunks
+            for entity in chunks[key]
+        ]
+        due.extend(
+            (entity, FAR_TICK_STRIDE)
+            for entity in phases[self.tick % FAR_TICK_STRIDE].values()
+            if entity.chunk not in active
+        )
+        return due
+
+    def bullet_hits(self, bullet, alien, x=None):
+        """
+        Check whether a bullet has struck an alien under the current collision mode.
+        Args:
+            bullet (Bullet): The bullet to test.
+            alien (Alien): The alien to test.
+            x (int): X-coordinate to test the bullet at, if not its current one.
+        Returns:
+            bool: True if the bullet hits the alien.
+        """
+        if x is None:
+            x = bullet.x
+        if self.collision_mode != "mask":
+            return abs(x - alien.x) < 20 and abs(bullet.y - alien.y) < 20
+        return sprites_overlap(
+            bullet.image,
+            BULLET_SIZE,
+            (x, bullet.y),
+            alien.image,
+            ALIEN_SIZE,
+            (alien.x, alien.y),
+        )
+
+    def check_alien_reach(self, alien):
+        """
+        Resolve an alien reaching a side. The player guarding the alien's height
+        loses a life, every player on the other side scores, and the alien is
+        removed. In "mask" mode only a player whose sprite the alien actually
+        overlaps is hit; an alien that gets past the players' column without
+        touching anyone is removed and still scores for the other side. Only
+        the lanes near the alien's height are examined.
+        Args:
+            alien (Alien): The alien to check.
+        """
+        accurate = self.collision_mode == "mask"
+        reach_x = (ALIEN_SIZE[0] + PLAYER_SIZE[0]) // 2 if accurate else 30
+        for side, side_x in SIDE_X.items():
+            if abs(alien.x - side_x) < reach_x:
+                break
+        else:
+            return
+        if accurate:
+            reach = (ALIEN_SIZE[1] + PLAYER_SIZE[1]) // 2
+            victim = None
+            for player in self.index.players_between(
+                side, alien.y - reach, alien.y + reach
+            ):
+                if alien.touches(player, accurate=True):
+                    victim = player
+                    break
+        else:
+            victim = self.index.player_at(side, alien.y)
+        outward = -1 if side == "left" else 1
+        if victim is None and (alien.x - side_x) * outward <= 0:
+            return  # Still approaching the players
+        if victim is not None:
+            victim.lose_life()
+        for opponent in self.opponents_of(side):
+            opponent.add_score()
+        alien.alive = False
 
     def update(self):
         """
         Update the game state, including player movement, bullet movement,
-        alien spawning, and collision detection.
+        alien spawning, and collision detection, and record the tick's state hash.
         """
-        # Spawn aliens
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_alien_spawn_time > self.alien_spawn_interval:
-            self.spawn_alien()
-            self.last_alien_spawn_time = current_time
+        self.tick += 1
+        if self.events is not None:
+            self.events.tick = self.tick
+
+        # Fire timed events: alien spawns, cooldowns, and so on
+        for timer in self.timers.advance():
+            getattr(self, "_on_" + timer.kind)(*timer.args)
 
         # Move players
-        self.player1.move()
-        self.player2.move()
+        for player in self.players:
+            player.move()
+
+        # Entities away from the players and the focus move in larger steps
+        # every FAR_TICK_STRIDE ticks, staggered by ID so the work is spread
+        # across ticks; only the active chunks and the far entities due this
+        # tick are visited.
+        active = self.active_chunks()
 
-        # Move bullets and remove off-screen ones
-        for bullet in self.bullets[:]:
-            bullet.move()
+        # Move bullets and remove the ones that left the arena
+        moved = []
+        for bullet, steps in self.due_entities(
+            self.bullet_chunks, self.bullet_phases, active
+        ):
+            start = bullet.x
+            bullet.move(steps)
             if bullet.is_off_screen():
                 self.remove_bullet(bullet)
+            else:
+                self.bullet_chunks.relocate(bullet)
+                self.bullet_lanes.move(bullet, start)
+                self._rehash(bullet)
+                moved.append((bullet, start))
+
+        # Opposing bullets that met while moving destroy each other
+        for right, left in self.bullet_lanes.crossings(moved):
+            if self.events is not None:
+                self.events.publish(
+                    INTERCEPT,
+                    right.player_id,
+                    x=(right.x + left.x) // 2,
+                    y=(right.y + left.y) // 2,
+                    value=left.player_id,
+                )
+            self.remove_bullet(right)
+            self.remove_bullet(left)
 
-        # Bullet–Alien collision logic
-        for bullet in self.bullets[:]:
-            for alien in self.aliens[:]:
-                if abs(bullet.x - alien.x) < 20 and abs(bullet.y - alien.y) < 20:
-                    alien.lose_life()  # Bounce (X) on 1st and 2nd hit, dies on 3rd hit
-                    self.remove_bullet(bullet)  # Bullet always disappears after hit
-                    break  # Move to next bullet
+        # Bullet–Alien collision logic for the bullets that moved, against the
+        # aliens in nearby chunks only. A bullet that moved several steps is
+        # tested at each of them, so it cannot jump over an alien. Candidates
+        # are tried in spawn order, as a scan of self.aliens would.
+        killed = []
+        for bullet, start in moved:
+            if bullet.chunk is None:
+                continue  # Intercepted
+            low, high = sorted((start + bullet.speed, bullet.x))
+            nearby = self.alien_chunks.query(
+                low - HIT_REACH,
+                bullet.y - HIT_REACH,
+                high + HIT_REACH,
+                bullet.y + HIT_REACH,
+            )
+            if not nearby:
+                continue
+            nearby.sort(key=lambda alien: alien.alien_id)
+            hit = None
+            for x in range(start + bullet.speed, bullet.x + bullet.speed, bullet.speed):
+                hit = next(
+                    (alien for alien in nearby if self.bullet_hits(bullet, alien, x)),
+                    None,
+                )
+                if hit is not None:
+                    break
+            if hit is None:
+                continue
+            if self.events is not None:
+                self.events.publish(HIT, bullet.player_id, hit.alien_id, x, bullet.y)
+            hit.lose_life()  # Bounce (X) on 1st and 2nd hit, dies on 3rd hit
+            self._rehash(hit)
+            if not hit.alive:
+                killed.append(hit)
+            self.remove_bullet(bullet)  # Bullet always disappears after hit
+
+        # Swarms steer as one before anyone moves
+        if self.flock is not None:
+            self.flock.update(self.aliens)
+            for alien in self.aliens:
+                self._rehash(alien)
 
         # Move aliens and check collisions with players
-        for alien in self.aliens[:]:
-            alien.move()
-            alien.check_collision_with_player(self.player1, self.player2)
-            if not alien.get_alive():
-                self.aliens.remove(alien)
+        for alien, steps in self.due_entities(
+            self.alien_chunks, self.alien_phases, active
+        ):
+            alien.move(steps)
+            self.check_alien_reach(alien)
+            if alien.get_alive():
+                self.alien_chunks.relocate(alien)
+                self._rehash(alien)
+            else:
+                self._remove_alien(alien)
+        # Aliens shot down that did not move this tick
+        for alien in killed:
+            if alien.chunk is not None:
+                self._remove_alien(alien)
+
+        # Players move, score and lose lives every tick, so always rehash them
+        for player in self.players:
+            self._rehash(player)
+        self._chained = chain(self._chained, self.tick, self.state_hash)
+        self.hashes.append(self._chained)
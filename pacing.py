@@ -0,0 +1,108 @@
+"""
+pacing.py
+
+Shared frame pacing for the screens that run outside the main game loop.
+Static screens sleep on the event queue instead of spinning, and animated
+screens are capped at a configurable frame rate. The main loop uses
+WindowState to notice when the window loses focus or is minimized, so it
+can stop simulating and presenting frames until it is back.
+
+Classes:
+    FramePacer: Sleeps or rate-limits a screen loop between frames.
+    WindowState: Tracks whether the game window has focus and can be seen.
+"""
+
+# pylint: disable=no-member
+
+import pygame
+from settings import IDLE_TIMEOUT_MS, MENU_FPS
+
+
+class FramePacer:
+    """
+    Keeps menu, countdown and restart loops from pegging a core while idle.
+
+    Attributes:
+        fps (int): Frame rate cap for animated screens.
+        idle_timeout (int): Longest a static screen sleeps before redrawing, in milliseconds.
+        clock (pygame.time.Clock): Clock used to cap animated screens.
+    """
+
+    def __init__(self, fps=MENU_FPS, idle_timeout=IDLE_TIMEOUT_MS):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+
+    def tick(self):
+        """
+        Sleep long enough to hold an animated screen at the configured frame rate.
+        Returns:
+            int: Milliseconds elapsed since the previous tick.
+        """
+        return self.clock.tick(self.fps)
+
+    def wait(self, timeout=None):
+        """
+        Sleep until an event arrives or the timeout expires, then drain the queue.
+        Args:
+            timeout (int): Milliseconds to wait. Defaults to the idle timeout.
+        Returns:
+            list: The pending events, empty if the wait timed out.
+        """
+        if timeout is None:
+            timeout = self.idle_timeout
+        first = pygame.event.wait(timeout)
+        if first.type == pygame.NOEVENT:
+            return []
+        return [first] + pygame.event.get()
+
+
+class WindowState:
+    """
+    Tracks whether the game window has focus and can be seen, from pygame's
+    window events.
+
+    Attributes:
+        focused (bool): Whether the window has keyboard focus.
+        visible (bool): Whether the window is shown and not minimized.
+    """
+
+    LOSES_FOCUS = (pygame.WINDOWFOCUSLOST,)
+    GAINS_FOCUS = (pygame.WINDOWFOCUSGAINED,)
+    HIDES = (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN)
+    SHOWS = (
+        pygame.WINDOWRESTORED,
+        pygame.WINDOWMAXIMIZED,
+        pygame.WINDOWSHOWN,
+        pygame.WINDOWEXPOSED,
+    )
+
+    def __init__(self):
+        self.focused = True
+        self.visible = True
+
+    @property
+    def paused(self):
+        """
+        bool: Whether the match should be on hold.
+        """
+        return not (self.focused and self.visible)
+
+    def handle(self, event):
+        """
+        Update the state from one event; other events are ignored.
+        Args:
+            event (pygame.event.Event): The event.
+        Returns:
+            bool: True if the state changed.
+        """
+        before = (self.focused, self.visible)
+        if event.type in self.LOSES_FOCUS:
+            self.focused = False
+        elif event.type in self.GAINS_FOCUS:
+            self.focused = True
+        elif event.type in self.HIDES:
+            self.visible = False
+        elif event.type in self.SHOWS:
+            self.visible = True
+        return (self.focused, self.visible) != before
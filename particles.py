@@ -0,0 +1,182 @@
+"""
+particles.py
+
+Particle effects for bullet hits and alien deaths. Particles live in a
+fixed-capacity set of NumPy arrays, are integrated with vectorized updates,
+and are drawn in a single Surface.blits call from pre-rendered sprites.
+The capacity is a hard budget: emissions beyond it are dropped, so effects
+can never grow a frame's cost without bound.
+
+Classes:
+    ParticleSystem: Array-backed particle store with batched drawing.
+"""
+
+# pylint: disable=no-member
+
+import numpy as np
+import pygame
+from settings import PARTICLE_BUDGET
+
+# Colours of the particles emitted by a non-lethal hit and by an alien death
+HIT_PALETTE = ((255, 255, 180), (255, 220, 90))
+EXPLOSION_PALETTE = ((255, 160, 40), (255, 80, 30), (200, 200, 200))
+
+# Number of pre-rendered alpha steps a particle fades through
+FADE_LEVELS = 4
+
+
+def _render_sprites(palette, radius):
+    """
+    Pre-render one faded sprite per colour and alpha step.
+    Args:
+        palette (tuple): RGB colours.
+        radius (int): Radius of the particle in pixels.
+    Returns:
+        list: Surfaces indexed by colour * FADE_LEVELS + fade level.
+    """
+    sprites = []
+    for color in palette:
+        for level in range(FADE_LEVELS):
+            alpha = 255 * (level + 1) // FADE_LEVELS
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+            sprites.append(sprite)
+    return sprites
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle store. Live particles are packed at the front of
+    the arrays, so integration and drawing only touch the first `count` rows.
+
+    Attributes:
+        capacity (int): Maximum number of live particles.
+        count (int): Number of live particles.
+        dropped (int): Particles refused because the budget was full or effects were off.
+        enabled (bool): Whether bursts emit particles at all.
+    """
+
+    def __init__(self, capacity=PARTICLE_BUDGET, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self.enabled = True
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.base_sprite = np.zeros(capacity, dtype=np.int32)
+        self.rng = np.random.default_rng(seed)
+        self.sprites = _render_sprites(HIT_PALETTE, 2) + _render_sprites(
+            EXPLOSION_PALETTE, 3
+        )
+        self._explosion_offset = len(HIT_PALETTE)
+        self.radius = np.array(
+            [2] * len(HIT_PALETTE) + [3] * len(EXPLOSION_PALETTE), dtype=np.int32
+        )
+
+    def emit(self, x, y, amount, speed, life, first_color, colors):
+        """
+        Emit a burst of particles, dropping whatever does not fit in the budget.
+        Args:
+            x (float): X-coordinate of the burst.
+            y (float): Y-coordinate of the burst.
+            amount (int): Particles requested.
+            speed (float): Maximum initial speed in pixels per frame.
+            life (int): Maximum lifetime in frames.
+            first_color (int): Index of the burst's first colour in the sprite table.
+            colors (int): Number of colours to pick from.
+        Returns:
+            int: Particles actually emitted.
+        """
+        requested = amount
+        amount = min(amount, self.capacity - self.count) if self.enabled else 0
+        self.dropped += requested - amount
+        if amount <= 0:
+            return 0
+        start, end = self.count, self.count + amount
+        angle = self.rng.uniform(0, 2 * np.pi, amount)
+        magnitude = self.rng.uniform(0.2, 1.0, amount) * speed
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * magnitude
+        self.vel[start:end, 1] = np.sin(angle) * magnitude
+        self.life[start:end] = self.rng.uniform(life / 2, life, amount)
+        self.max_life[start:end] = self.life[start:end]
+        self.base_sprite[start:end] = first_color + self.rng.integers(0, colors, amount)
+        self.count = end
+        return amount
+
+    def burst(self, x, y, killed):
+        """
+        Emit the effect for a bullet hit: a spark for a bounce, an explosion for a death.
+        Args:
+            x (float): X-coordinate of the hit.
+            y (float): Y-coordinate of the hit.
+            killed (bool): Whether the hit killed the alien.
+        Returns:
+            int: Particles actually emitted.
+        """
+        if killed:
+            return self.emit(
+                x, y, 48, 4.0, 40, self._explosion_offset, len(EXPLOSION_PALETTE)
+            )
+        return self.emit(x, y, 12, 3.0, 18, 0, len(HIT_PALETTE))
+
+    def update(self):
+        """
+        Advance every live particle by one frame and compact out expired ones.
+        """
+        count = self.count
+        if count == 0:
+            return
+        self.pos[:count] += self.vel[:count]
+        self.vel[:count] *= 0.94
+        self.life[:count] -= 1
+        alive = self.life[:count] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors != count:
+            for array in (
+                self.pos,
+                self.vel,
+                self.life,
+                self.max_life,
+                self.base_sprite,
+            ):
+                array[:survivors] = array[:count][alive]
+            self.count = survivors
+
+    def clear(self):
+        """
+        Remove every live particle.
+        """
+        self.count = 0
+
+    def draw(self, surface, origin=(0, 0)):
+        """
+        Draw every live particle with a single blits call.
+        Args:
+            surface (pygame.Surface): Surface to draw on.
+            origin (tuple): World coordinates of the surface's top-left corner.
+        Returns:
+            int: Number of particles drawn.
+        """
+        count = self.count
+        if count == 0:
+            return 0
+        base = self.base_sprite[:count]
+        fade = np.minimum(
+            (self.life[:count] / self.max_life[:count] * FADE_LEVELS).astype(np.int32),
+            FADE_LEVELS - 1,
+        )
+        sprite_index = (base * FADE_LEVELS + fade).tolist()
+        top_left = (
+            (self.pos[:count] - self.radius[base, None] - origin)
+            .astype(np.int32)
+            .tolist()
+        )
+        sprites = self.sprites
+        surface.blits(
+            [(sprites[index], dest) for index, dest in zip(sprite_index, top_left)],
+            doreturn=False,
+        )
+        return count
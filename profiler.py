@@ -0,0 +1,222 @@
+"""
+profiler.py
+
+On-demand profiling of a running game. A capture runs cProfile on the game
+thread and, alongside it, a sampling thread that records the game thread's
+call stack every few milliseconds. When the capture ends it writes:
+
+    profile-<stamp>.pstats     cProfile statistics, for pstats or snakeviz
+    profile-<stamp>.collapsed  sampled stacks in the collapsed format read by
+                               flamegraph.pl and speedscope
+    profile-<stamp>.json       duration, sample count and the entity counts
+                               seen during the capture
+
+Each sampled stack is rooted at a frame naming the entity counts at the time,
+bucketed by ten (for example "aliens=20-29 bullets=0-9"), so the flamegraph
+splits stutters by load. Nothing is installed until a capture is started, so
+an unarmed ProfileCapture costs the game loop one attribute check per frame.
+
+Usage:
+    python game.py --profile 30          # first 30 seconds
+    python game.py --profile-matches 2   # first two matches
+    F9 during a match starts or stops a PROFILE_SECONDS capture
+
+Classes:
+    ProfileCapture: Runs one capture at a time and writes its reports.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from settings import PROFILE_DIR
+
+
+def _frame_name(code):
+    """
+    Name a stack frame for the collapsed format, which separates frames by ';'.
+    Args:
+        code (code): The frame's code object.
+    Returns:
+        str: "function (file.py:line)".
+    """
+    name = (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+    return name.replace(";", ":")
+
+
+def _bucket(counts):
+    """
+    Name the root frame for a set of entity counts.
+    Args:
+        counts (dict): name -> count.
+    Returns:
+        str: Counts rounded down to tens, such as "aliens=20-29 bullets=0-9".
+    """
+    if not counts:
+        return "counts=unknown"
+    return " ".join(
+        f"{name}={count // 10 * 10}-{count // 10 * 10 + 9}"
+        for name, count in counts.items()
+    )
+
+
+class ProfileCapture:
+    """
+    Runs one profiling capture at a time and writes its reports.
+
+    Attributes:
+        directory (str): Where reports are written.
+        interval (float): Seconds between stack samples.
+        active (bool): Whether a capture is running.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, interval=0.005):
+        self.directory = directory
+        self.interval = interval
+        self.active = False
+        self._profile = None
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._stacks = Counter()
+        self._counts = {}
+        self._count_totals = {}
+        self._frames = 0
+        self._started = 0.0
+        self._deadline = None
+        self._matches_left = None
+
+    def start(self, seconds=None, matches=None):
+        """
+        Start a capture on the calling thread, which should be the game loop's.
+        It ends after the given time or number of matches, or on stop().
+        Args:
+            seconds (float): Length of the capture in seconds.
+            matches (int): Number of matches to capture, counted by match_finished().
+        Returns:
+            bool: False if a capture was already running.
+        """
+        if self.active:
+            return False
+        self.active = True
+        self._stacks = Counter()
+        self._counts = {}
+        self._count_totals = {}
+        self._frames = 0
+        self._started = time.perf_counter()
+        self._deadline = None if seconds is None else self._started + seconds
+        self._matches_left = matches
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def observe(self, **counts):
+        """
+        Record the entity counts for a frame and end the capture if its time
+        is up. Call once per frame while active.
+        Args:
+            **counts (int): Entity counts, such as aliens=12.
+        Returns:
+            list: Paths of the written reports if the capture ended, else None.
+        """
+        self._counts = counts
+        self._frames += 1
+        for name, count in counts.items():
+            low, total, high = self._count_totals.get(name, (count, 0, count))
+            self._count_totals[name] = (
+                min(low, count),
+                total + count,
+                max(high, count),
+            )
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return self.stop()
+        return None
+
+    def match_finished(self):
+        """
+        Count a finished match towards a match-limited capture.
+        Returns:
+            list: Paths of the written reports if the capture ended, else None.
+        """
+        if self._matches_left is None:
+            return None
+        self._matches_left -= 1
+        if self._matches_left <= 0:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """
+        End the running capture and write its reports.
+        Returns:
+            list: Paths of the written reports, empty if nothing was running.
+        """
+        if not self.active:
+            return []
+        self._profile.disable()
+        self._stop_sampling.set()
+        self._sampler.join()
+        self.active = False
+        return self._write(time.perf_counter() - self._started)
+
+    def _sample(self, thread_id):
+        """
+        Sampler thread body: records the profiled thread's stack until stopped.
+        Args:
+            thread_id (int): Identifier of the thread being profiled.
+        """
+        while not self._stop_sampling.wait(self.interval):
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            stack.append(_bucket(self._counts))
+            stack.reverse()
+            self._stacks[";".join(stack)] += 1
+
+    def _write(self, duration):
+        """
+        Write the reports of the capture that just ended.
+        Args:
+            duration (float): Length of the capture in seconds.
+        Returns:
+            list: Paths of the written files.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.directory, f"profile-{stamp}")
+        suffix = 1
+        while os.path.exists(base + ".pstats"):
+            suffix += 1
+            base = os.path.join(self.directory, f"profile-{stamp}-{suffix}")
+        stats_path = base + ".pstats"
+        self._profile.dump_stats(stats_path)
+        self._profile = None
+        stacks_path = base + ".collapsed"
+        with open(stacks_path, "w", encoding="utf-8") as stacks_file:
+            for stack, samples in sorted(self._stacks.items()):
+                stacks_file.write(f"{stack} {samples}\n")
+        summary_path = base + ".json"
+        summary = {
+            "seconds": round(duration, 3),
+            "frames": self._frames,
+            "samples": sum(self._stacks.values()),
+            "counts": {
+                name: {"min": low, "mean": total / self._frames, "max": high}
+                for name, (low, total, high) in self._count_totals.items()
+            },
+        }
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+        return [stats_path, stacks_path, summary_path]
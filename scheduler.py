@@ -0,0 +1,161 @@
+"""
+scheduler.py
+
+Tick-based timer wheel for timed game events: alien spawn waves, shot
+cooldowns, power-up expiry and delayed effects. Timers are plain data (a kind
+string plus arguments) rather than callbacks, so a wheel can be copied along
+with the Model it belongs to and the copy dispatches to its own entities.
+
+The wheel is a ring of slots, one per tick. Scheduling drops a timer into the
+slot its due tick maps to, and each advance() only looks at the slot for the
+new tick, so both are O(1) amortized. Timers further out than one revolution
+stay in their slot and are skipped until their tick comes round. Cancelled
+timers are flagged and discarded when their slot is next visited. The wheel
+keeps an order-independent digest of its live timers for the Model's state
+hash (see statehash.py).
+
+Classes:
+    Timer: One scheduled event.
+    TimerWheel: Schedules timers by tick and hands back the ones that are due.
+"""
+
+from statehash import digest, kind_code
+
+
+class Timer:
+    """
+    One scheduled event.
+
+    Attributes:
+        due (int): Tick the timer fires on.
+        kind (str): What the timer is for, used by the owner to dispatch it.
+        args (tuple): Arguments passed along with the kind.
+        cancelled (bool): Whether the timer was cancelled before firing.
+    """
+
+    __slots__ = ("due", "kind", "args", "cancelled")
+
+    def __init__(self, due, kind, args):
+        self.due = due
+        self.kind = kind
+        self.args = args
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"Timer(due={self.due}, kind={self.kind!r}, args={self.args!r})"
+
+    def state_digest(self):
+        """
+        Compute the timer's contribution to the state hash.
+        Returns:
+            int: 64-bit digest.
+        """
+        return digest(self.due, kind_code(self.kind), *self.args)
+
+
+class TimerWheel:
+    """
+    Schedules timers by tick and hands back the ones that are due.
+
+    Attributes:
+        tick (int): Current tick; advance() moves it forward by one.
+        slots (list): One list of timers per slot of the ring.
+        digest (int): XOR of the state digests of the live timers.
+    """
+
+    def __init__(self, size=256):
+        self.tick = 0
+        self.slots = [[] for _ in range(size)]
+        self.digest = 0
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def schedule(self, delay, kind, *args):
+        """
+        Schedule an event.
+        Args:
+            delay (int): Ticks from now, at least 1.
+            kind (str): What the timer is for.
+            *args: Arguments handed back with the timer.
+        Returns:
+            Timer: Handle that can be passed to cancel().
+        """
+        due = self.tick + max(1, delay)
+        timer = Timer(due, kind, args)
+        self.slots[due % len(self.slots)].append(timer)
+        self.digest ^= timer.state_digest()
+        self._live += 1
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancel a timer that has not fired yet. Cancelling twice is harmless.
+        Args:
+            timer (Timer): Handle returned by schedule().
+        """
+        if not timer.cancelled and timer.due > self.tick:
+            timer.cancelled = True
+            self.digest ^= timer.state_digest()
+            self._live -= 1
+
+    def advance(self):
+        """
+        Move to the next tick and collect the timers due on it.
+        Returns:
+            list: Due timers, in the order they were scheduled.
+        """
+        self.tick += 1
+        index = self.tick % len(self.slots)
+        slot = self.slots[index]
+        if not slot:
+            return []
+        due = []
+        later = []
+        for timer in slot:
+            if timer.cancelled:
+                continue
+            if timer.due == self.tick:
+                due.append(timer)
+                self.digest ^= timer.state_digest()
+            else:
+                later.append(timer)
+        self.slots[index] = later
+        self._live -= len(due)
+        return due
+
+    def pending(self, kind=None):
+        """
+        List the timers that have yet to fire, soonest first.
+        Args:
+            kind (str): Only list timers of this kind.
+        Returns:
+            list: (ticks_left, kind, args) per live timer.
+        """
+        return sorted(
+            (timer.due - self.tick, timer.kind, timer.args)
+            for slot in self.slots
+            for timer in slot
+            if not timer.cancelled and (kind is None or timer.kind == kind)
+        )
+
+    def copy(self):
+        """
+        Make an independent copy of the wheel and its timers.
+        Returns:
+            TimerWheel: The copy.
+        """
+        twin = TimerWheel.__new__(TimerWheel)
+        twin.tick = self.tick
+        twin.digest = self.digest
+        twin._live = self._live  # pylint: disable=protected-access
+        twin.slots = [
+            [
+                Timer(timer.due, timer.kind, timer.args)
+                for timer in slot
+                if not timer.cancelled
+            ]
+            for slot in self.slots
+        ]
+        return twin
@@ -13,3 +13,59 @@ HEIGHT = 800
 
 # Frames per second — the game's refresh rate
 FPS = 60
+
+# Frame rate cap for animated menu screens such as the countdown
+MENU_FPS = 30
+
+# Longest a static screen sleeps waiting for input before redrawing, in milliseconds
+IDLE_TIMEOUT_MS = 500
+
+# Append-only binary log of match events, or None to disable logging
+EVENT_LOG_PATH = "match_events.bin"
+
+# Points needed to win a match
+WINNING_SCORE = 3
+
+# Hard cap on live particles across all effects
+PARTICLE_BUDGET = 2048
+
+# On-screen sprite sizes in pixels (width, height)
+PLAYER_SIZE = (50, 50)
+ALIEN_SIZE = (60, 60)
+BULLET_SIZE = (20, 10)
+HEART_SIZE = (30, 30)
+
+# Collision test used by the Model: "box" for the classic distance checks,
+# "mask" for pixel-accurate sprite overlap
+COLLISION_MODE = "box"
+
+# How aliens fly: "classic" for straight horizontal passes, "swarm" for
+# flocks that steer by separation, alignment and cohesion
+ALIEN_MODE = "classic"
+
+# Aliens released per spawn in swarm mode
+SWARM_WAVE_SIZE = 12
+
+# SQLite match history and leaderboard, or None to disable it
+LEADERBOARD_PATH = "leaderboard.db"
+
+# Pre-scaled sprite bundle built offline by `python assets.py`
+ASSET_BUNDLE_PATH = "assets/sprites.bundle"
+
+# Size of the arena in world pixels. The window shows a camera-sized slice of
+# it; set these larger than WIDTH/HEIGHT for a scrolling arena
+WORLD_WIDTH = WIDTH
+WORLD_HEIGHT = HEIGHT
+
+# Side of the square spatial chunks entities are stored in, in world pixels
+CHUNK_SIZE = 256
+
+# Chunks within this many chunk widths of a player or of the camera are
+# simulated every tick; the rest only every FAR_TICK_STRIDE ticks
+ACTIVE_CHUNK_RADIUS = 1
+FAR_TICK_STRIDE = 4
+
+# Directory profiler captures are written to, and the length of a capture
+# started with the F9 key, in seconds
+PROFILE_DIR = "profiles"
+PROFILE_SECONDS = 10
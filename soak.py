@@ -0,0 +1,223 @@
+"""
+soak.py
+
+Long-running soak harness. Plays thousands of headless bot-versus-bot matches
+back to back and checks that memory stays flat: it samples RSS, traced Python
+allocations and live object counts per type, and fails when growth since the
+warm-up baseline passes a threshold, printing the top allocation diffs.
+
+Usage:
+    python soak.py --matches 2000 --sample-every 100
+
+Functions:
+    rss_bytes(): Resident set size of this process.
+    count_objects(type_names): Counts live objects of the given types.
+    play_match(max_ticks, render): Plays one headless bot match.
+    run_soak(...): Runs the matches and collects samples.
+    check_growth(report, ...): Lists threshold violations in a soak report.
+    main(argv): Command-line entry point.
+"""
+
+# pylint: disable=no-member,wrong-import-position
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import random
+import resource
+import sys
+import tracemalloc
+from collections import Counter, namedtuple
+import pygame
+from ai import HeuristicDriver, RandomDriver, simulate_tick
+from model import Model
+
+TRACKED_TYPES = ("Bullet", "Alien", "Surface")
+
+Sample = namedtuple("Sample", ["match", "rss", "traced", "counts"])
+
+
+def rss_bytes():
+    """
+    Get the resident set size of this process.
+    Returns:
+        int: Current RSS in bytes, or peak RSS where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def count_objects(type_names=TRACKED_TYPES):
+    """
+    Count live objects per type name. Types the garbage collector does not
+    track, such as pygame.Surface, are found through the containers that
+    reference them.
+    Args:
+        type_names (tuple): Class names to count.
+    Returns:
+        Counter: Live object count per type name.
+    """
+    gc.collect()
+    counts = Counter()
+    untracked = set()
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in type_names:
+            counts[name] += 1
+        for ref in gc.get_referents(obj):
+            ref_name = type(ref).__name__
+            if ref_name in type_names and not gc.is_tracked(ref):
+                untracked.add((ref_name, id(ref)))
+    for ref_name, _ in untracked:
+        counts[ref_name] += 1
+    return counts
+
+
+def play_match(max_ticks=36000, render=False, seed=None):
+    """
+    Play one headless match between a random and a heuristic bot.
+    Args:
+        max_ticks (int): Frames after which an undecided match is abandoned.
+        render (bool): Also draw every frame through view.render.
+        seed (int): Seed for the model's RNG and the random bot.
+    Returns:
+        int: Number of frames played.
+    """
+    model = Model()
+    model.rng.seed(seed)
+    drivers = [RandomDriver(1, random.Random(seed)), HeuristicDriver(2)]
+    if render:
+        import view  # pylint: disable=import-outside-toplevel
+
+    for tick in range(1, max_ticks + 1):
+        simulate_tick(model, drivers)
+        if render:
+            view.render(model, "Bot 1", "Bot 2")
+        if model.get_winner() is not None:
+            break
+    return tick
+
+
+def run_soak(matches, sample_every=100, warmup=None, max_ticks=36000, render=False):
+    """
+    Play matches back to back, sampling memory every `sample_every` matches.
+    The baseline is taken after the warm-up matches so that one-off caches
+    such as loaded images do not count as growth.
+    Args:
+        matches (int): Number of matches to play after warm-up.
+        sample_every (int): Matches between samples.
+        warmup (int): Matches played before the baseline. Defaults to sample_every.
+        max_ticks (int): Frame cap per match.
+        render (bool): Also exercise view.render.
+    Returns:
+        dict: Baseline and final samples, all samples, and the top allocation diffs.
+    """
+    if warmup is None:
+        warmup = sample_every
+    tracemalloc.start(10)
+    for match in range(warmup):
+        play_match(max_ticks, render, seed=match)
+
+    def sample(match):
+        return Sample(
+            match, rss_bytes(), tracemalloc.get_traced_memory()[0], count_objects()
+        )
+
+    baseline = sample(0)
+    baseline_snapshot = tracemalloc.take_snapshot()
+    samples = [baseline]
+    for match in range(1, matches + 1):
+        play_match(max_ticks, render, seed=warmup + match)
+        if match % sample_every == 0 or match == matches:
+            samples.append(sample(match))
+    final_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    return {
+        "baseline": baseline,
+        "final": samples[-1],
+        "samples": samples,
+        "top_diffs": final_snapshot.compare_to(baseline_snapshot, "lineno")[:10],
+    }
+
+
+def check_growth(report, max_rss_growth, max_traced_growth, max_object_growth):
+    """
+    List the thresholds a soak report violates.
+    Args:
+        report (dict): Result of run_soak.
+        max_rss_growth (int): Allowed RSS growth in bytes.
+        max_traced_growth (int): Allowed traced-allocation growth in bytes.
+        max_object_growth (int): Allowed growth in live objects of any tracked type.
+    Returns:
+        list: One message per violation, empty if memory stayed flat.
+    """
+    baseline, final = report["baseline"], report["final"]
+    failures = []
+    if final.rss - baseline.rss > max_rss_growth:
+        failures.append(f"RSS grew by {final.rss - baseline.rss} bytes")
+    if final.traced - baseline.traced > max_traced_growth:
+        failures.append(f"traced memory grew by {final.traced - baseline.traced} bytes")
+    for name in TRACKED_TYPES:
+        growth = final.counts[name] - baseline.counts[name]
+        if growth > max_object_growth:
+            failures.append(f"{name} count grew by {growth}")
+    return failures
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    Args:
+        argv (list): Arguments to parse. Defaults to sys.argv.
+    Returns:
+        int: Process exit status, 1 if a threshold was passed.
+    """
+    parser = argparse.ArgumentParser(description="Cosmic Clash soak test")
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--max-ticks", type=int, default=36000)
+    parser.add_argument(
+        "--render", action="store_true", help="also exercise view.render"
+    )
+    parser.add_argument("--max-rss-growth-mb", type=float, default=16)
+    parser.add_argument("--max-traced-growth-mb", type=float, default=4)
+    parser.add_argument("--max-object-growth", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    report = run_soak(
+        args.matches, args.sample_every, max_ticks=args.max_ticks, render=args.render
+    )
+
+    for entry in report["samples"]:
+        counts = ", ".join(f"{name}={entry.counts[name]}" for name in TRACKED_TYPES)
+        print(
+            f"match {entry.match:6d}  rss {entry.rss / 2**20:8.1f} MiB  "
+            f"traced {entry.traced / 2**20:8.2f} MiB  {counts}"
+        )
+    print("Top allocation growth since baseline:")
+    for stat in report["top_diffs"]:
+        print(f"  {stat}")
+
+    failures = check_growth(
+        report,
+        int(args.max_rss_growth_mb * 2**20),
+        int(args.max_traced_growth_mb * 2**20),
+        args.max_object_growth,
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,499 @@
+"""
+spectate.py
+
+Live spectator broadcasting. A local asyncio server streams the running
+Model to any number of read-only spectators. Each tick is encoded once and
+the same bytes are fanned out to every client.
+
+Frames are newline-delimited JSON. Keyframes carry the full state. Deltas
+carry only the players plus the aliens and bullets that spawned, vanished,
+or moved differently from what dead reckoning (x += speed) predicts, which
+in steady play is almost nothing. A client whose previous frame has not
+been written yet is never queued behind: the stale frame is replaced by a
+keyframe, so slow spectators skip ahead instead of backpressuring the game.
+
+Usage:
+    python game.py --spectate-port 8765          # broadcast a game
+    python spectate.py --connect 127.0.0.1:8765  # watch it
+
+Classes:
+    BroadcastServer: Fans encoded frames out to connected spectators.
+    SpectatorState: Rebuilds the game state from received frames.
+
+Functions:
+    snapshot(model): Captures the broadcast state of a model.
+    encode_keyframe(tick, state, names): Encodes a full-state frame.
+    encode_delta(tick, previous, state): Encodes a frame relative to the previous state.
+    watch(host, port): Connects to a server and renders the game with view.py.
+"""
+
+# pylint: disable=no-member
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from settings import FPS
+
+
+def snapshot(model):
+    """
+    Capture the part of the game state spectators see.
+    Args:
+        model (Model): Game state.
+    Returns:
+        tuple: (players, aliens, bullets) where players is a list of
+        [player_id, x, y, health, score], aliens maps alien_id to
+        (x, y, health, speed_x) and bullets maps bullet_id to
+        (x, y, speed, player_id).
+    """
+    players = [
+        [player.player_id, int(player.x), int(player.y), player.health, player.score]
+        for player in model.players
+    ]
+    aliens = {
+        alien.alien_id: (int(alien.x), int(alien.y), alien.health, alien.speed_x)
+        for alien in model.aliens
+        if alien.alive
+    }
+    bullets = {
+        bullet.bullet_id: (int(bullet.x), int(bullet.y), bullet.speed, bullet.player_id)
+        for bullet in model.bullets
+    }
+    return players, aliens, bullets
+
+
+def _predict(entities, speed_index):
+    """
+    Advance every entity by its own speed, as a spectator does between frames.
+    Args:
+        entities (dict): id -> (x, y, ...) tuples.
+        speed_index (int): Position of the horizontal speed in each tuple.
+    Returns:
+        dict: The predicted entities.
+    """
+    return {
+        entity_id: (fields[0] + fields[speed_index],) + fields[1:]
+        for entity_id, fields in entities.items()
+    }
+
+
+def _diff(predicted, current):
+    """
+    Compare predicted entities with the real ones.
+    Args:
+        predicted (dict): Entities the spectator will have after dead reckoning.
+        current (dict): Entities the server actually has.
+    Returns:
+        tuple: (list of [id, *fields] that differ, list of removed ids).
+    """
+    changed = [
+        [entity_id, *fields]
+        for entity_id, fields in current.items()
+        if predicted.get(entity_id) != fields
+    ]
+    removed = [entity_id for entity_id in predicted if entity_id not in current]
+    return changed, removed
+
+
+def _encode(frame):
+    """
+    Serialise a frame as one JSON line.
+    """
+    return json.dumps(frame, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def encode_keyframe(tick, state, names):
+    """
+    Encode a frame carrying the full state.
+    Args:
+        tick (int): Model tick.
+        state (tuple): Result of snapshot().
+        names (list): Player names.
+    Returns:
+        bytes: The encoded frame.
+    """
+    players, aliens, bullets = state
+    return _encode(
+        {
+            "t": tick,
+            "k": 1,
+            "n": names,
+            "p": players,
+            "a": [[alien_id, *fields] for alien_id, fields in aliens.items()],
+            "b": [[bullet_id, *fields] for bullet_id, fields in bullets.items()],
+        }
+    )
+
+
+def encode_delta(tick, previous, state):
+    """
+    Encode a frame relative to the state of the previous tick.
+    Args:
+        tick (int): Model tick.
+        previous (tuple): snapshot() of the previous tick.
+        state (tuple): snapshot() of this tick.
+    Returns:
+        bytes: The encoded frame.
+    """
+    players, aliens, bullets = state
+    changed_aliens, removed_aliens = _diff(_predict(previous[1], 3), aliens)
+    changed_bullets, removed_bullets = _diff(_predict(previous[2], 2), bullets)
+    frame = {"t": tick, "p": players}
+    if changed_aliens:
+        frame["a"] = changed_aliens
+    if removed_aliens:
+        frame["ra"] = removed_aliens
+    if changed_bullets:
+        frame["b"] = changed_bullets
+    if removed_bullets:
+        frame["rb"] = removed_bullets
+    return _encode(frame)
+
+
+class SpectatorState:
+    """
+    Game state rebuilt on the spectator side from received frames.
+
+    Attributes:
+        tick (int): Tick of the last applied frame.
+        names (list): Player names from the last keyframe.
+        players (list): [player_id, x, y, health, score] per player.
+        aliens (dict): alien_id -> (x, y, health, speed_x).
+        bullets (dict): bullet_id -> (x, y, speed, player_id).
+        synced (bool): Whether a keyframe has been received yet.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self.names = ["", ""]
+        self.players = []
+        self.aliens = {}
+        self.bullets = {}
+        self.synced = False
+
+    def apply(self, frame):
+        """
+        Apply one decoded frame. Deltas that arrive before the first keyframe are ignored.
+        Args:
+            frame (dict): Decoded frame.
+        """
+        if frame.get("k"):
+            self.names = frame["n"]
+            self.aliens = {}
+            self.bullets = {}
+            self.synced = True
+        elif not self.synced:
+            return
+        else:
+            self.aliens = _predict(self.aliens, 3)
+            self.bullets = _predict(self.bullets, 2)
+        self.tick = frame["t"]
+        self.players = frame["p"]
+        for alien_id, *fields in frame.get("a", ()):
+            self.aliens[alien_id] = tuple(fields)
+        for alien_id in frame.get("ra", ()):
+            self.aliens.pop(alien_id, None)
+        for bullet_id, *fields in frame.get("b", ()):
+            self.bullets[bullet_id] = tuple(fields)
+        for bullet_id in frame.get("rb", ()):
+            self.bullets.pop(bullet_id, None)
+
+    def as_state(self):
+        """
+        Get the state in the same shape as snapshot().
+        Returns:
+            tuple: (players, aliens, bullets).
+        """
+        return self.players, self.aliens, self.bullets
+
+
+class _Spectator:
+    """
+    One connected spectator and the single frame slot waiting to be sent to it.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = None
+        self.needs_keyframe = True
+        self.ready = asyncio.Event()
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+    def offer(self, delta, keyframe):
+        """
+        Queue this tick's frame, replacing an unsent one with a keyframe.
+        Args:
+            delta (bytes): This tick's delta frame.
+            keyframe (callable): Returns this tick's keyframe, built at most once per tick.
+        """
+        if self.pending is not None:
+            self.frames_skipped += 1
+            self.needs_keyframe = True
+        if self.needs_keyframe:
+            self.pending = keyframe()
+            self.needs_keyframe = False
+        else:
+            self.pending = delta
+        self.ready.set()
+
+    async def run(self):
+        """
+        Write frames to the spectator as fast as it accepts them.
+        """
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+                frame, self.pending = self.pending, None
+                self.writer.write(frame)
+                self.frames_sent += 1
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.writer.close()
+
+
+class BroadcastServer:
+    """
+    Streams the game to read-only spectators over TCP.
+
+    Attributes:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 for any free port.
+        keyframe_interval (int): Ticks between keyframes sent to every spectator.
+        names (list): Player names included in keyframes.
+        spectators (set): Connected spectators.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, keyframe_interval=120):
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+        self.names = ["", ""]
+        self.spectators = set()
+        self._server = None
+        self._previous = None
+        self._loop = None
+        self._thread = None
+
+    async def start(self):
+        """
+        Start listening on the running event loop.
+        """
+        self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Disconnect every spectator and stop listening.
+        """
+        for spectator in list(self.spectators):
+            spectator.writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _accept(self, reader, writer):
+        """
+        Serve one spectator until it disconnects. Anything it sends is ignored.
+        """
+        spectator = _Spectator(writer)
+        self.spectators.add(spectator)
+        task = asyncio.create_task(spectator.run())
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.spectators.discard(spectator)
+            task.cancel()
+
+    def publish(self, tick, state):
+        """
+        Encode one tick and offer it to every spectator. Must run on the server's loop.
+        Args:
+            tick (int): Model tick.
+            state (tuple): snapshot() of the model at this tick.
+        """
+        keyframe_bytes = None
+
+        def keyframe():
+            nonlocal keyframe_bytes
+            if keyframe_bytes is None:
+                keyframe_bytes = encode_keyframe(tick, state, self.names)
+            return keyframe_bytes
+
+        if self._previous is None or tick % self.keyframe_interval == 0:
+            delta = keyframe()
+        else:
+            delta = encode_delta(tick, self._previous, state)
+        self._previous = state
+        for spectator in self.spectators:
+            spectator.offer(delta, keyframe)
+
+    def start_in_thread(self):
+        """
+        Run the server on its own event loop in a daemon thread, for use from
+        the synchronous game loop.
+        """
+        started = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def publish_threadsafe(self, model):
+        """
+        Snapshot the model on the calling thread and hand it to the server thread.
+        Args:
+            model (Model): Game state to broadcast.
+        """
+        self._loop.call_soon_threadsafe(self.publish, model.tick, snapshot(model))
+
+    def reset(self, names):
+        """
+        Start a new match: the next frame sent is a keyframe with the new names.
+        Args:
+            names (list): Player names.
+        """
+
+        def apply():
+            self.names = list(names)
+            self._previous = None
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(apply)
+        else:
+            apply()
+
+
+class _SpriteEntity:
+    """
+    Minimal stand-in for a model entity, enough for view.render to draw it.
+    """
+
+    def __init__(self, image, x, y, player_id=0, health=1):
+        self.image = image
+        self.x = x
+        self.y = y
+        self.player_id = player_id
+        self.side = "left" if player_id % 2 else "right"
+        self.health = health
+
+    def get_alive(self):
+        """
+        Spectator entities are always alive; dead ones are removed by frames.
+        """
+        return True
+
+    def get_health(self):
+        """
+        Get the health shown in the score overlay.
+        """
+        return self.health
+
+
+def _as_model(state):
+    """
+    Build a render-only stand-in for the Model from spectator state.
+    Args:
+        state (SpectatorState): State to draw.
+    Returns:
+        object: Object with the attributes view.render reads.
+    """
+    # pylint: disable=import-outside-toplevel
+    from types import SimpleNamespace
+    from assets import load_sprite
+
+    players = [
+        _SpriteEntity(load_sprite(f"player{2 - pid % 2}"), x, y, pid, health)
+        for pid, x, y, health, _ in state.players
+    ]
+    alien_image = load_sprite("alien")
+    bullet_image = load_sprite("bullet")
+    return SimpleNamespace(
+        players=players,
+        player1=players[0],
+        player2=players[1],
+        aliens=[
+            _SpriteEntity(alien_image, x, y, health=health)
+            for x, y, health, _ in state.aliens.values()
+        ],
+        bullets=[
+            _SpriteEntity(bullet_image, x, y) for x, y, _, _ in state.bullets.values()
+        ],
+    )
+
+
+def _render_state(state):
+    """
+    Draw spectator state with view.py. The HUD shows the first two players'
+    names, as it does in the game.
+    Args:
+        state (SpectatorState): State to draw.
+    """
+    # pylint: disable=import-outside-toplevel
+    import view
+
+    view.render(_as_model(state), state.names[0], state.names[1])
+
+
+async def watch(host, port):
+    """
+    Connect to a broadcast server and render the game with view.py until the
+    window is closed or the server goes away. Frames are applied as fast as
+    they arrive, but the screen is redrawn at most FPS times a second.
+    Args:
+        host (str): Server address.
+        port (int): Server port.
+    """
+    # pylint: disable=import-outside-toplevel
+    import pygame
+    import view
+
+    reader, writer = await asyncio.open_connection(host, port)
+    state = SpectatorState()
+    next_render = 0.0
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            state.apply(json.loads(line))
+            now = time.perf_counter()
+            if state.synced and now >= next_render:
+                _render_state(state)
+                next_render = now + 1 / FPS
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+    finally:
+        writer.close()
+        view.quit_game()
+
+
+def main(argv=None):
+    """
+    Command-line entry point for the spectator client.
+    Args:
+        argv (list): Arguments to parse. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Watch a Cosmic Clash game")
+    parser.add_argument("--connect", default="127.0.0.1:8765", help="host:port")
+    args = parser.parse_args(argv)
+    host, _, port = args.connect.rpartition(":")
+    asyncio.run(watch(host, int(port)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+statehash.py
+
+Hashing of the simulation state for desync and regression detection.
+
+The Model keeps a 64-bit state hash that is the XOR of one digest per entity
+(players, aliens, bullets), one per pending timer and one for the RNG. When
+an entity changes, only its digest is swapped out, so keeping the hash
+current costs a little per mutation instead of a full rehash each tick.
+
+After every tick the Model appends a chained hash, built from the previous
+chained hash, the tick and the state hash, to its hash stream. Once two
+streams differ they differ at every later tick, so the first divergent tick
+of two recorded streams (two peers, a replay and the live run, two code
+versions) is found by bisection.
+
+Digests use Python's hash() on tuples of numbers, which is deterministic for
+a given CPython build; streams are comparable between runs on the same build.
+
+Usage:
+    python statehash.py record out.bin --seed 1 --ticks 3000
+    python statehash.py compare a.bin b.bin
+
+Functions:
+    digest(*fields): 64-bit digest of a tuple of numbers.
+    chain(previous, tick, state): Next value of a hash stream.
+    first_divergence(a, b): First index at which two hash streams differ.
+    save_hashes(path, hashes): Writes a hash stream to a file.
+    load_hashes(path): Reads a hash stream back.
+    record(seed, ticks): Hash stream of a seeded headless bot match.
+    main(argv): Command-line entry point.
+"""
+
+import argparse
+import random
+import zlib
+from array import array
+
+MASK = (1 << 64) - 1
+
+
+def digest(*fields):
+    """
+    Compute a 64-bit digest of some numbers.
+    Args:
+        *fields: Ints, floats or bools.
+    Returns:
+        int: The digest.
+    """
+    return hash(fields) & MASK
+
+
+def kind_code(kind):
+    """
+    Get a stable number for a string, whose hash() varies between processes.
+    Args:
+        kind (str): Name such as a timer kind.
+    Returns:
+        int: CRC-32 of the name.
+    """
+    return zlib.crc32(kind.encode("utf-8"))
+
+
+def chain(previous, tick, state):
+    """
+    Compute the next value of a hash stream.
+    Args:
+        previous (int): Previous value of the stream.
+        tick (int): Tick the state belongs to.
+        state (int): State hash after that tick.
+    Returns:
+        int: The chained hash.
+    """
+    return hash((previous, tick, state)) & MASK
+
+
+def first_divergence(a, b):
+    """
+    Find the first index at which two chained hash streams differ. Chained
+    streams never agree again after diverging, so this is a binary search.
+    Args:
+        a (Sequence): First stream.
+        b (Sequence): Second stream.
+    Returns:
+        int: The index, or None if the streams are identical. If one stream is
+        a prefix of the other, the length of the shorter one. Index i of a
+        Model's stream is tick i + 1.
+    """
+    common = min(len(a), len(b))
+    low, high = 0, common
+    while low < high:
+        middle = (low + high) // 2
+        if a[middle] == b[middle]:
+            low = middle + 1
+        else:
+            high = middle
+    if low == common and len(a) == len(b):
+        return None
+    return low
+
+
+def save_hashes(path, hashes):
+    """
+    Write a hash stream to a file as raw unsigned 64-bit integers.
+    Args:
+        path (str): File to write.
+        hashes (array): The stream.
+    """
+    with open(path, "wb") as stream_file:
+        array("Q", hashes).tofile(stream_file)
+
+
+def load_hashes(path):
+    """
+    Read a hash stream written by save_hashes.
+    Args:
+        path (str): File to read.
+    Returns:
+        array: The stream.
+    """
+    hashes = array("Q")
+    with open(path, "rb") as stream_file:
+        hashes.frombytes(stream_file.read())
+    return hashes
+
+
+def record(seed=0, ticks=3000):
+    """
+    Play a seeded headless match between a random and a heuristic bot and
+    return its hash stream, for comparing code versions.
+    Args:
+        seed (int): Seed for the model's RNG and the random bot.
+        ticks (int): Ticks to play, unless the match ends sooner.
+    Returns:
+        array: The hash stream, one value per tick played.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ai import HeuristicDriver, RandomDriver, simulate_tick
+    from model import Model
+
+    model = Model()
+    model.rng.seed(seed)
+    model.rehash()
+    drivers = [RandomDriver(1, random.Random(seed)), HeuristicDriver(2)]
+    for _ in range(ticks):
+        simulate_tick(model, drivers)
+        if model.get_winner() is not None:
+            break
+    return model.hashes
+
+
+def main(argv=None):
+    """
+    Record a hash stream or compare two.
+    Args:
+        argv (list): Command-line arguments. Defaults to sys.argv.
+    Returns:
+        int: Exit status, 1 if the compared streams diverge.
+    """
+    parser = argparse.ArgumentParser(description="Record and compare state hashes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="record a bot match")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--seed", type=int, default=0)
+    record_parser.add_argument("--ticks", type=int, default=3000)
+    compare_parser = commands.add_parser("compare", help="find the first divergence")
+    compare_parser.add_argument("first")
+    compare_parser.add_argument("second")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        hashes = record(args.seed, args.ticks)
+        save_hashes(args.path, hashes)
+        print(f"Recorded {len(hashes)} ticks")
+        return 0
+    index = first_divergence(load_hashes(args.first), load_hashes(args.second))
+    if index is None:
+        print("Streams are identical")
+        return 0
+    print(f"First divergent tick: {index + 1}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
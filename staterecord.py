@@ -0,0 +1,318 @@
+"""
+staterecord.py
+
+Columnar per-tick recordings of match state for balance analysis. A recording
+is a directory holding one raw binary file per column plus meta.json
+describing them:
+
+    tick                      int32   one row per recorded tick
+    player_x, player_y        float32 (ticks, players)
+    player_health             int8    (ticks, players)
+    player_score              int16   (ticks, players)
+    alien_offsets             int64   ticks + 1 rows; tick row t's aliens are
+                                      rows alien_offsets[t]:alien_offsets[t + 1]
+    alien_id, alien_x, alien_y, alien_health
+    bullet_offsets            int64   as alien_offsets, for the bullet columns
+    bullet_id, bullet_x, bullet_y, bullet_player
+
+Every column is written through a numpy.memmap, so recording a tick packs the
+model's entities into one array and copies it into the mapped files; the
+files grow by doubling and are trimmed on close. Reading maps the same files
+read-only, so a multi-GB recording opens instantly and slicing a tick range
+only pages in the rows it touches.
+
+Classes:
+    StateRecorder: Appends the state of a Model to a recording every tick.
+    StateRecording: Read-only, zero-copy access to a recording.
+"""
+
+import json
+import os
+from operator import attrgetter
+import numpy as np
+
+PLAYER_COLUMNS = {
+    "player_x": "<f4",
+    "player_y": "<f4",
+    "player_health": "<i1",
+    "player_score": "<i2",
+}
+ENTITY_COLUMNS = {
+    "alien": {
+        "alien_id": "<i4",
+        "alien_x": "<f4",
+        "alien_y": "<f4",
+        "alien_health": "<i1",
+    },
+    "bullet": {
+        "bullet_id": "<i4",
+        "bullet_x": "<f4",
+        "bullet_y": "<f4",
+        "bullet_player": "<i1",
+    },
+}
+
+# Reads a player's, alien's or bullet's recorded fields, in column order
+_FIELDS = {
+    "player": attrgetter("x", "y", "health", "score"),
+    "alien": attrgetter("alien_id", "x", "y", "health"),
+    "bullet": attrgetter("bullet_id", "x", "y", "player_id"),
+}
+
+
+class _Column:
+    """
+    One growable column backed by a memory-mapped file.
+
+    Attributes:
+        path (str): File holding the column.
+        dtype (numpy.dtype): Type of one value.
+        width (tuple): Shape of one row beyond the first axis.
+        length (int): Rows written.
+    """
+
+    def __init__(self, path, dtype, width=(), capacity=1024):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = tuple(width)
+        self.length = 0
+        self.data = None
+        self._rows = None
+        self._row_bytes = self.dtype.itemsize * int(np.prod(self.width))
+        open(path, "wb").close()  # pylint: disable=consider-using-with
+        self._resize(max(capacity, 1))
+
+    def _resize(self, capacity):
+        """
+        Grow the file and map it again.
+        Args:
+            capacity (int): Rows the file should hold.
+        """
+        if self.data is not None:
+            self.data.flush()
+            self.data = self._rows = None
+        os.truncate(self.path, capacity * self._row_bytes)
+        self.data = np.memmap(
+            self.path, self.dtype, "r+", shape=(capacity, *self.width)
+        )
+        # Plain view of the same pages: writes skip np.memmap's per-slice overhead
+        self._rows = self.data.view(np.ndarray)
+
+    def extend(self, rows):
+        """
+        Append rows, doubling the file when it is full.
+        Args:
+            rows (numpy.ndarray): Rows to append, cast to the column's type.
+        """
+        end = self.length + len(rows)
+        if end > len(self._rows):
+            self._resize(max(end, 2 * len(self._rows)))
+        self._rows[self.length : end] = rows
+        self.length = end
+
+    def append(self, row):
+        """
+        Append one row, doubling the file when it is full.
+        Args:
+            row: Value, or sequence of values for a column with a width.
+        """
+        if self.length == len(self._rows):
+            self._resize(2 * self.length)
+        self._rows[self.length] = row
+        self.length += 1
+
+    def last(self):
+        """
+        Get the last row written.
+        Returns:
+            The row.
+        """
+        return self._rows[self.length - 1]
+
+    def flush(self):
+        """
+        Write the mapped pages back to the file.
+        """
+        self.data.flush()
+
+    def close(self):
+        """
+        Unmap the file and trim it to the rows written.
+        """
+        self.data.flush()
+        self.data = self._rows = None
+        os.truncate(self.path, self.length * self._row_bytes)
+
+
+class StateRecorder:
+    """
+    Appends the state of a Model to a columnar recording every tick.
+
+    Attributes:
+        path (str): Directory of the recording.
+        num_players (int): Players per recorded tick.
+        ticks (int): Ticks recorded so far.
+    """
+
+    def __init__(self, path, num_players=2, initial_ticks=4096, initial_entities=65536):
+        self.path = path
+        self.num_players = num_players
+        self.ticks = 0
+        os.makedirs(path, exist_ok=True)
+        columns = {
+            "tick": _Column(os.path.join(path, "tick"), "<i4", (), initial_ticks)
+        }
+        for name, dtype in PLAYER_COLUMNS.items():
+            columns[name] = _Column(
+                os.path.join(path, name), dtype, (num_players,), initial_ticks
+            )
+        for kind, kind_columns in ENTITY_COLUMNS.items():
+            offsets = _Column(
+                os.path.join(path, f"{kind}_offsets"), "<i8", (), initial_ticks + 1
+            )
+            offsets.append(0)
+            columns[f"{kind}_offsets"] = offsets
+            for name, dtype in kind_columns.items():
+                columns[name] = _Column(
+                    os.path.join(path, name), dtype, (), initial_entities
+                )
+        self._columns = columns
+        self._write_meta()
+
+    def record(self, model):
+        """
+        Append the model's current state as one tick.
+        Args:
+            model (Model): Game state, normally right after update().
+        """
+        columns = self._columns
+        columns["tick"].append(model.tick)
+        players = np.array(list(map(_FIELDS["player"], model.players)), np.float64)
+        for i, name in enumerate(PLAYER_COLUMNS):
+            columns[name].append(players[:, i])
+        for kind, entities in (("alien", model.aliens), ("bullet", model.bullets)):
+            rows = np.array(list(map(_FIELDS[kind], entities)), np.float64).reshape(
+                -1, len(ENTITY_COLUMNS[kind])
+            )
+            for i, name in enumerate(ENTITY_COLUMNS[kind]):
+                columns[name].extend(rows[:, i])
+            offsets = columns[f"{kind}_offsets"]
+            offsets.append(offsets.last() + len(rows))
+        self.ticks += 1
+
+    def flush(self):
+        """
+        Make everything recorded so far readable by StateRecording.
+        """
+        for column in self._columns.values():
+            column.flush()
+        self._write_meta()
+
+    def close(self):
+        """
+        Finish the recording and trim its files.
+        """
+        for column in self._columns.values():
+            column.close()
+        self._write_meta()
+
+    def _write_meta(self):
+        """
+        Describe the columns and the number of recorded ticks in meta.json.
+        """
+        meta = {
+            "version": 1,
+            "ticks": self.ticks,
+            "columns": {
+                name: {
+                    "dtype": column.dtype.str,
+                    "width": list(column.width),
+                    "length": column.length,
+                }
+                for name, column in self._columns.items()
+            },
+        }
+        with open(
+            os.path.join(self.path, "meta.json"), "w", encoding="utf-8"
+        ) as meta_file:
+            json.dump(meta, meta_file, indent=2)
+
+
+class StateRecording:
+    """
+    Read-only, zero-copy access to a recording made by StateRecorder. Every
+    array handed out is a view of the mapped files.
+
+    Attributes:
+        path (str): Directory of the recording.
+        ticks (numpy.ndarray): Tick number of each recorded row.
+        columns (dict): Column name -> mapped array.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.columns = {}
+        for name, spec in meta["columns"].items():
+            shape = (spec["length"], *spec["width"])
+            if spec["length"] == 0:
+                self.columns[name] = np.empty(shape, spec["dtype"])
+            else:
+                self.columns[name] = np.memmap(
+                    os.path.join(path, name), spec["dtype"], "r", shape=shape
+                )
+        self.ticks = self.columns["tick"]
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def rows(self, start_tick=None, stop_tick=None):
+        """
+        Find the rows recorded for a range of ticks.
+        Args:
+            start_tick (int): First tick, or None for the start of the recording.
+            stop_tick (int): Tick to stop before, or None for the end.
+        Returns:
+            slice: Row range into the per-tick columns.
+        """
+        start = 0 if start_tick is None else np.searchsorted(self.ticks, start_tick)
+        stop = (
+            len(self.ticks)
+            if stop_tick is None
+            else np.searchsorted(self.ticks, stop_tick)
+        )
+        return slice(int(start), int(stop))
+
+    def players(self, start_tick=None, stop_tick=None):
+        """
+        Get the player columns for a range of ticks.
+        Args:
+            start_tick (int): First tick, or None for the start of the recording.
+            stop_tick (int): Tick to stop before, or None for the end.
+        Returns:
+            dict: Column name -> (ticks, players) array.
+        """
+        rows = self.rows(start_tick, stop_tick)
+        return {name: self.columns[name][rows] for name in PLAYER_COLUMNS}
+
+    def entities(self, kind, start_tick=None, stop_tick=None):
+        """
+        Get the alien or bullet columns for a range of ticks.
+        Args:
+            kind (str): "alien" or "bullet".
+            start_tick (int): First tick, or None for the start of the recording.
+            stop_tick (int): Tick to stop before, or None for the end.
+        Returns:
+            tuple: (offsets, columns) where columns maps column name to the
+            entity rows of those ticks, and the rows of the i-th tick in the
+            range are offsets[i]:offsets[i + 1]. Offsets are rebased to start
+            at 0, which copies only the offsets.
+        """
+        rows = self.rows(start_tick, stop_tick)
+        offsets = self.columns[f"{kind}_offsets"][rows.start : rows.stop + 1]
+        first, last = int(offsets[0]), int(offsets[-1])
+        columns = {
+            name: self.columns[name][first:last] for name in ENTITY_COLUMNS[kind]
+        }
+        return offsets - first, columns
@@ -0,0 +1,136 @@
+"""
+swarm.py
+
+Flocking for the swarm alien mode. Every tick each alien steers by the three
+boids rules: separation from crowding neighbours, alignment with their
+heading and cohesion towards their centre.
+
+Neighbours are not found pairwise. Aliens are binned into a grid of cells one
+neighbour radius wide, per-cell totals (count, position, velocity) are summed
+with np.bincount, and each alien reads the totals of the 3x3 block of cells
+around its own. The whole step is a handful of array operations, so its cost
+grows with the number of aliens and cells, not with the number of pairs.
+
+Classes:
+    Flock: Steering parameters and the vectorized steering step.
+"""
+
+from operator import attrgetter
+import numpy as np
+from settings import WORLD_HEIGHT, WORLD_WIDTH
+
+# Reads (x, y, speed_x, speed_y) off an alien
+_STATE = attrgetter("x", "y", "speed_x", "speed_y")
+
+
+class Flock:
+    """
+    Steering parameters and the vectorized steering step.
+
+    Attributes:
+        radius (int): Side of a grid cell; aliens in the 3x3 block of cells
+            around one another count as neighbours.
+        separation (float): Weight of the push away from the alien's own cell.
+        alignment (float): Weight of matching the neighbours' velocity.
+        cohesion (float): Weight of the pull towards the neighbours' centre.
+        min_speed (float): Slowest an alien may fly, in pixels per tick.
+        max_speed (float): Fastest an alien may fly, in pixels per tick.
+    """
+
+    def __init__(
+        self,
+        radius=80,
+        separation=0.05,
+        alignment=0.05,
+        cohesion=0.005,
+        min_speed=1.0,
+        max_speed=3.0,
+    ):
+        self.radius = radius
+        self.separation = separation
+        self.alignment = alignment
+        self.cohesion = cohesion
+        self.min_speed = min_speed
+        self.max_speed = max_speed
+        self.cols = WORLD_WIDTH // radius + 2
+        self.rows = WORLD_HEIGHT // radius + 2
+
+    def _block_totals(self, cells, weights):
+        """
+        Sum a quantity over each alien's 3x3 block of cells.
+        Args:
+            cells (np.ndarray): Flat cell index of each alien.
+            weights (np.ndarray): Quantity per alien, or None to count aliens.
+        Returns:
+            tuple: (totals over the alien's own cell, totals over its block),
+            one value per alien each.
+        """
+        size = self.rows * self.cols
+        grid = np.bincount(cells, weights, minlength=size).reshape(self.rows, self.cols)
+        padded = np.pad(grid, 1)
+        block = sum(
+            padded[1 + dy : 1 + dy + self.rows, 1 + dx : 1 + dx + self.cols]
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+        )
+        return grid.ravel()[cells], block.ravel()[cells]
+
+    def steer(self, pos, vel):
+        """
+        Compute the aliens' velocities for the next tick.
+        Args:
+            pos (np.ndarray): (n, 2) positions.
+            vel (np.ndarray): (n, 2) velocities.
+        Returns:
+            np.ndarray: (n, 2) new velocities.
+        """
+        if len(pos) < 2:
+            return vel.copy()
+        col = np.clip(pos[:, 0] // self.radius, -1, self.cols - 2).astype(np.intp) + 1
+        row = np.clip(pos[:, 1] // self.radius, -1, self.rows - 2).astype(np.intp) + 1
+        cells = row * self.cols + col
+
+        own_count, count = self._block_totals(cells, None)
+        # Every total includes the alien itself, which is taken back out
+        others = count - 1
+        own_others = own_count - 1
+        has_others = others > 0
+        near = np.maximum(others, 1)[:, None]
+        own_near = np.maximum(own_others, 1)[:, None]
+
+        steer = np.zeros_like(vel)
+        for axis in (0, 1):
+            own_pos, block_pos = self._block_totals(cells, pos[:, axis])
+            _, block_vel = self._block_totals(cells, vel[:, axis])
+            centre = (block_pos - pos[:, axis]) / near[:, 0]
+            heading = (block_vel - vel[:, axis]) / near[:, 0]
+            crowd = (own_pos - pos[:, axis]) / own_near[:, 0]
+            steer[:, axis] = (
+                self.cohesion * (centre - pos[:, axis])
+                + self.alignment * (heading - vel[:, axis])
+                + np.where(
+                    own_others > 0,
+                    self.separation * (pos[:, axis] - crowd) * own_others,
+                    0.0,
+                )
+            )
+        new_vel = vel + np.where(has_others[:, None], steer, 0.0)
+
+        speed = np.hypot(new_vel[:, 0], new_vel[:, 1])
+        limited = np.clip(speed, self.min_speed, self.max_speed)
+        scale = np.divide(limited, speed, out=np.ones_like(speed), where=speed > 0)
+        return new_vel * scale[:, None]
+
+    def update(self, aliens):
+        """
+        Steer a list of aliens in place.
+        Args:
+            aliens (list): Alien instances; their speed_x and speed_y are updated.
+        """
+        if len(aliens) < 2:
+            return
+        state = np.array(list(map(_STATE, aliens)), dtype=np.float64)
+        new_vel = self.steer(state[:, :2], state[:, 2:]).tolist()
+        for alien, (speed_x, speed_y) in zip(aliens, new_vel):
+            alien.speed_x = speed_x
+            alien.speed_y = speed_y
@@ -0,0 +1,71 @@
+"""
+test_ai.py
+
+Unit tests for the CPU player drivers in ai.py.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+from unittest.mock import patch
+import pygame
+from ai import HeuristicDriver, LookaheadDriver, RandomDriver, simulate_tick
+from model import Model
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestDrivers(unittest.TestCase):
+    """
+    Unit tests for the CPU drivers.
+    """
+
+    def setUp(self):
+        """
+        Set up a model stepped tick by tick.
+        """
+        patcher = patch("pygame.image.load", return_value=pygame.Surface((50, 50)))
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.model = Model()
+
+    def test_heuristic_moves_toward_threat(self):
+        """
+        Test that the heuristic driver moves toward an alien heading for its side.
+        """
+        self.model.spawn_alien()
+        alien = self.model.aliens[0]
+        alien.speed_x = -2
+        alien.y = self.model.player1.y + 100
+        HeuristicDriver(1).update(self.model)
+        self.assertGreater(self.model.player1.dy, 0)
+        self.assertFalse(self.model.player1.shoot)
+
+    def test_lookahead_respects_budget(self):
+        """
+        Test that the lookahead driver returns within a small multiple of its budget
+        and eventually settles on an action.
+        """
+        driver = LookaheadDriver(2, horizon=60, budget_ms=2.0)
+        self.model.spawn_alien()
+        for _ in range(50):
+            start = pygame.time.get_ticks()
+            driver.update(self.model)
+            self.assertLess(pygame.time.get_ticks() - start, 50)
+        self.assertIn(self.model.player2.dy, (-3, 0, 3))
+
+    def test_bot_match_finishes(self):
+        """
+        Test that a bot-versus-bot match reaches a winner within 20000 ticks.
+        """
+        drivers = [RandomDriver(1), HeuristicDriver(2)]
+        for _ in range(20000):
+            simulate_tick(self.model, drivers)
+            if self.model.get_winner() is not None:
+                break
+        self.assertIsNotNone(self.model.get_winner())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+test_assets.py
+
+Unit tests for the asset bundle builder and loader in assets.py.
+"""
+
+# pylint: disable=no-member,undefined-variable,protected-access
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pygame
+import assets
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestAssetBundle(unittest.TestCase):
+    """
+    Unit tests for building, opening and loading from a bundle.
+    """
+
+    def setUp(self):
+        """
+        Build a bundle into a temporary file.
+        """
+        handle, self.path = tempfile.mkstemp(suffix=".bundle")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        assets.build_bundle(self.path)
+
+    def test_bundle_indexes_every_sprite(self):
+        """
+        Test that the bundle index lists every sprite at its in-game size.
+        """
+        mapped, index, data_start = assets.open_bundle(self.path)
+        self.addCleanup(mapped.close)
+        self.assertEqual(set(index), set(assets.SPRITES))
+        self.assertEqual(data_start % assets.ALIGNMENT, 0)
+        for name, (_, size, _) in assets.SPRITES.items():
+            self.assertEqual(tuple(index[name]["size"]), size)
+
+    def test_load_sprite_reads_mapped_pixels(self):
+        """
+        Test that a sprite loaded from the bundle has the same pixels as the
+        sprite decoded and scaled from its loose file.
+        """
+        bundle = assets.open_bundle(self.path)
+        self.addCleanup(bundle[0].close)
+        with patch.object(assets, "_bundle", bundle), patch.dict(
+            assets._sprites, clear=True
+        ):
+            sprite = assets.load_sprite("alien")
+            self.assertEqual(sprite.get_size(), assets.SPRITES["alien"][1])
+            loose = assets._load_loose("alien")
+            self.assertEqual(
+                pygame.image.tobytes(sprite, "RGBA"),
+                pygame.image.tobytes(loose, "RGBA"),
+            )
+            self.assertIs(assets.load_sprite("alien"), sprite)
+
+    def test_background_uses_display_layout(self):
+        """
+        Test that the opaque background is converted to the display's layout.
+        """
+        bundle = assets.open_bundle(self.path)
+        self.addCleanup(bundle[0].close)
+        with patch.object(assets, "_bundle", bundle), patch.dict(
+            assets._sprites, clear=True
+        ):
+            background = assets.load_sprite("background")
+        display = pygame.display.get_surface()
+        self.assertEqual(background.get_bitsize(), display.get_bitsize())
+        self.assertEqual(background.get_masks(), display.get_masks())
+
+    def test_stale_bundle_entry_falls_back_to_loose_file(self):
+        """
+        Test that a bundled sprite built at another size is loaded from its
+        loose file instead.
+        """
+        mapped, index, data_start = assets.open_bundle(self.path)
+        self.addCleanup(mapped.close)
+        index["alien"]["size"] = [10, 10]
+        with patch.object(assets, "_bundle", (mapped, index, data_start)), patch.dict(
+            assets._sprites, clear=True
+        ):
+            sprite = assets.load_sprite("alien")
+            self.assertEqual(sprite.get_size(), assets.SPRITES["alien"][1])
+
+    def test_missing_bundle_is_ignored(self):
+        """
+        Test that opening a bundle that does not exist returns None.
+        """
+        self.assertIsNone(assets.open_bundle(self.path + ".missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
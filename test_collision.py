@@ -0,0 +1,127 @@
+"""
+test_collision.py
+
+Unit tests for the mask-based collision helpers in collision.py and the
+Model's accurate collision mode.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+from unittest.mock import patch
+import pygame
+from collision import sprite_mask, sprites_overlap
+from model import Model
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+def ring_image():
+    """
+    Build a 20x20 image that is opaque only on a 2-pixel border.
+    """
+    image = pygame.Surface((20, 20), pygame.SRCALPHA)
+    pygame.draw.rect(image, (255, 255, 255, 255), image.get_rect(), 2)
+    return image
+
+
+class TestSpritesOverlap(unittest.TestCase):
+    """
+    Unit tests for sprites_overlap.
+    """
+
+    def setUp(self):
+        """
+        Set up a hollow ring sprite and a small solid sprite.
+        """
+        self.ring = ring_image()
+        self.dot = pygame.Surface((2, 2))
+
+    def test_mask_is_cached(self):
+        """
+        Test that a mask is built once per image and size.
+        """
+        self.assertIs(
+            sprite_mask(self.ring, (20, 20)), sprite_mask(self.ring, (20, 20))
+        )
+
+    def test_transparent_area_does_not_collide(self):
+        """
+        Test that a sprite inside the ring's transparent centre does not collide,
+        although the bounding boxes intersect.
+        """
+        self.assertFalse(
+            sprites_overlap(self.ring, (20, 20), (50, 50), self.dot, (2, 2), (50, 50))
+        )
+        self.assertTrue(
+            sprites_overlap(self.ring, (20, 20), (50, 50), self.dot, (2, 2), (41, 50))
+        )
+
+    def test_distant_sprites_are_rejected(self):
+        """
+        Test that sprites whose bounding boxes do not meet never collide.
+        """
+        self.assertFalse(
+            sprites_overlap(self.ring, (20, 20), (0, 0), self.dot, (2, 2), (100, 0))
+        )
+
+
+class TestAccurateModel(unittest.TestCase):
+    """
+    Unit tests for the Model's mask collision mode.
+    """
+
+    def setUp(self):
+        """
+        Set up a Model using pixel-accurate collision.
+        """
+        patcher = patch("pygame.image.load", return_value=pygame.Surface((50, 50)))
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.model = Model(collision_mode="mask")
+        self.model.spawn_alien()
+        self.alien = self.model.aliens[0]
+
+    def test_alien_at_other_height_passes_player(self):
+        """
+        Test that an alien level with the player in x but far away in y does not hit.
+        """
+        player = self.model.player1
+        self.alien.x = player.x
+        self.alien.y = player.y + 200
+        self.assertFalse(self.alien.touches(player, accurate=True))
+        self.assertTrue(self.alien.touches(player))
+
+    def test_alien_overlapping_player_hits(self):
+        """
+        Test that an alien overlapping the player costs the player a life.
+        """
+        player, opponent = self.model.player1, self.model.player2
+        self.alien.x = player.x + 10
+        self.alien.y = player.y
+        self.model.check_alien_reach(self.alien)
+        self.assertEqual(player.health, 2)
+        self.assertEqual(opponent.score, 1)
+        self.assertFalse(self.alien.alive)
+
+    def test_alien_passing_player_is_removed(self):
+        """
+        Test that an alien that slips past the player ends and scores for the
+        other side without costing a life.
+        """
+        player, opponent = self.model.player1, self.model.player2
+        outward = -1 if player.side == "left" else 1
+        self.alien.y = player.y + 200
+        self.alien.x = player.x - 10 * outward
+        self.model.check_alien_reach(self.alien)
+        self.assertTrue(self.alien.alive)
+        self.alien.x = player.x + outward
+        self.model.check_alien_reach(self.alien)
+        self.assertFalse(self.alien.alive)
+        self.assertEqual(player.health, 3)
+        self.assertEqual(opponent.score, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+test_eventlog.py
+
+Unit tests for the EventLog writer and read_events reader in eventlog.py,
+including the events recorded by the Model during a match.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pygame
+from eventlog import (
+    ALIEN_DEATH,
+    BOUNCE,
+    HIT,
+    MATCH_START,
+    RECORD,
+    SHOT,
+    EventLog,
+    read_events,
+)
+from events import EventBus
+from model import Model
+from settings import WIDTH
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestEventLog(unittest.TestCase):
+    """
+    Unit tests for writing and reading the event log.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary log file path for each test.
+        """
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def test_round_trip_across_buffer_swaps(self):
+        """
+        Test that records written across several full buffers are read back in order.
+        """
+        log = EventLog(self.path, capacity=2)
+        for tick in range(5):
+            log.tick = tick
+            log.record(SHOT, 1, x=tick * 10, y=-tick, value=tick)
+        log.close()
+
+        events = list(read_events(self.path))
+        self.assertEqual([event.tick for event in events], [0, 1, 2, 3, 4])
+        self.assertEqual(events[3].x, 30)
+        self.assertEqual(events[3].y, -3)
+
+    def test_log_is_append_only(self):
+        """
+        Test that a second log on the same file appends rather than truncates.
+        """
+        for _ in range(2):
+            log = EventLog(self.path)
+            log.record(MATCH_START)
+            log.close()
+        self.assertEqual(len(list(read_events(self.path))), 2)
+
+    def test_positions_across_a_wide_world(self):
+        """
+        Test that positions many screens from the origin fit in a record, both
+        logged directly and through the event bus.
+        """
+        log = EventLog(self.path)
+        log.record(SHOT, 1, x=40 * WIDTH, y=-40 * WIDTH)
+        bus = EventBus()
+        bus.subscribe(log.write_batch)
+        bus.publish(SHOT, 2, x=1000 * WIDTH)
+        bus.dispatch()
+        log.close()
+        events = list(read_events(self.path))
+        self.assertEqual((events[0].x, events[0].y), (40 * WIDTH, -40 * WIDTH))
+        self.assertEqual(events[1].x, 1000 * WIDTH)
+
+    def test_old_format_log_is_moved_aside(self):
+        """
+        Test that a log in the old 16-bit layout is neither appended to nor
+        misread.
+        """
+        with open(self.path, "wb") as old_log:
+            old_log.write(bytes(RECORD.size * 3))
+        self.addCleanup(os.remove, self.path + ".old")
+        with self.assertRaises(ValueError):
+            list(read_events(self.path))
+        log = EventLog(self.path)
+        log.record(MATCH_START)
+        log.close()
+        self.assertEqual(len(list(read_events(self.path))), 1)
+        self.assertEqual(os.path.getsize(self.path + ".old"), RECORD.size * 3)
+
+
+class TestModelEvents(unittest.TestCase):
+    """
+    Unit tests for the events the Model records during play.
+    """
+
+    def setUp(self):
+        """
+        Create a Model that records to a temporary log.
+        """
+        patcher = patch("pygame.image.load", return_value=pygame.Surface((50, 50)))
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.log = EventLog(self.path)
+        self.model = Model(event_log=self.log)
+
+    def test_alien_hits_record_bounces_then_death(self):
+        """
+        Test that an alien's three hits are logged as two bounces and a death.
+        """
+        self.model.spawn_alien()
+        alien = self.model.aliens[0]
+        for _ in range(3):
+            alien.lose_life()
+        self.model.events.dispatch()
+        self.log.close()
+
+        kinds = [event.kind for event in read_events(self.path)]
+        self.assertEqual(kinds, [MATCH_START, BOUNCE, BOUNCE, ALIEN_DEATH])
+
+    def test_bullet_hit_is_recorded_with_shooter(self):
+        """
+        Test that a bullet striking an alien logs a hit for the shooting player.
+        """
+        self.model.spawn_alien()
+        alien = self.model.aliens[0]
+        alien.speed_x = 0
+        self.model.last_alien_spawn_time = pygame.time.get_ticks()
+        self.model.player2.x = alien.x + 15
+        self.model.player2.y = alien.y
+        self.model.player2.last_shot_time = -1000
+        self.model.add_bullet(2)
+        self.model.update()
+        self.model.events.dispatch()
+        self.log.close()
+
+        hits = [event for event in read_events(self.path) if event.kind == HIT]
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0].player_id, 2)
+        self.assertEqual(hits[0].entity_id, alien.alien_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+test_events.py
+
+Unit tests for the EventBus in events.py and its EventLog subscriber.
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from eventlog import ALIEN_DEATH, HIT, SHOT, EventLog, read_events
+from events import EventBus
+
+
+class TestEventBus(unittest.TestCase):
+    """
+    Tests for publishing and batched dispatch.
+    """
+
+    def setUp(self):
+        self.bus = EventBus(capacity=8)
+        self.batches = []
+        self.bus.subscribe(lambda batch: self.batches.append(list(batch)))
+
+    def test_dispatch_delivers_one_batch_in_order(self):
+        """
+        Test that subscribers receive the frame's events together, in order,
+        stamped with the tick they were published on.
+        """
+        self.bus.tick = 4
+        self.bus.publish(SHOT, 1, x=50, y=60)
+        self.bus.publish(HIT, 1, 7, 70, 60)
+        self.assertEqual(self.batches, [])
+        self.assertEqual(self.bus.dispatch(), 2)
+        self.assertEqual(
+            self.batches, [[(4, SHOT, 1, 0, 50, 60, 0), (4, HIT, 1, 7, 70, 60, 0)]]
+        )
+        self.assertEqual(self.bus.dispatch(), 0)
+        self.assertEqual(len(self.batches), 1)
+
+    def test_publishing_during_dispatch_goes_to_next_batch(self):
+        """
+        Test that an event published by a subscriber waits for the next dispatch.
+        """
+        self.bus.subscribe(lambda batch: self.bus.publish(ALIEN_DEATH))
+        self.bus.publish(SHOT)
+        self.bus.dispatch()
+        self.bus.dispatch()
+        self.assertEqual(
+            [[event.kind for event in batch] for batch in self.batches],
+            [[SHOT], [ALIEN_DEATH]],
+        )
+
+    def test_full_batch_drops_events(self):
+        """
+        Test that events past the capacity are counted and dropped.
+        """
+        for _ in range(10):
+            self.bus.publish(SHOT)
+        self.bus.dispatch()
+        self.assertEqual(len(self.batches[0]), 8)
+        self.assertEqual(self.bus.dropped, 2)
+
+    def test_publish_does_not_allocate(self):
+        """
+        Test that publishing a frame's worth of events allocates no memory.
+        """
+        bus = EventBus(capacity=512)
+        bus.publish(SHOT, 1, 2, 3, 4, 5)
+        bus.dispatch()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(500):
+                bus.publish(HIT, 1, i, 100, 200, 1)
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(after - before, 1024)
+
+
+class TestEventLogSubscriber(unittest.TestCase):
+    """
+    Tests for writing dispatched batches to the event log.
+    """
+
+    def test_batches_are_written_across_buffers(self):
+        """
+        Test that a batch bigger than the log's buffer is written in full.
+        """
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        log = EventLog(path, capacity=3)
+        bus = EventBus(capacity=16)
+        bus.subscribe(log.write_batch)
+        for i in range(7):
+            bus.publish(HIT, entity_id=i)
+        bus.dispatch()
+        log.close()
+        self.assertEqual(
+            [event.entity_id for event in read_events(path)], list(range(7))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
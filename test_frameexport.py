@@ -0,0 +1,87 @@
+"""
+test_frameexport.py
+
+Unit tests for finding highlights in recordings and exporting them headlessly
+with frameexport.py.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+import assets
+from frameexport import export_clips, highlights, record_bot_match
+from staterecord import StateRecording
+
+# pylint: disable=protected-access
+
+
+class TestFrameExport(unittest.TestCase):
+    """
+    Tests for highlight detection and parallel clip export.
+    """
+
+    def test_highlights_merge_overlapping_windows(self):
+        """
+        Test that score changes close together become one clip.
+        """
+        scores = np.zeros((100, 2), np.int16)
+        scores[20:, 0] = 1
+        scores[25:, 1] = 1
+        scores[80:, 0] = 2
+        recording = SimpleNamespace(
+            ticks=np.arange(1, 101),
+            players=lambda: {"player_score": scores},
+        )
+        self.assertEqual(
+            highlights(recording, before=10, after=5), [(11, 31), (71, 86)]
+        )
+
+    def test_export_png_and_raw(self):
+        """
+        Test that clips are rendered by several workers in both formats.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "match")
+            # As on a fresh checkout: no built bundle and no display
+            with patch.object(assets, "_bundle", False), patch.dict(
+                assets._sprites, clear=True
+            ), patch("pygame.display.get_surface", return_value=None):
+                self.assertEqual(record_bot_match(path, seed=1, max_ticks=120), 120)
+            self.assertEqual(len(StateRecording(path)), 120)
+
+            clip_dirs = export_clips(
+                path, [(91, 101), (110, 115)], tmp, "png", workers=2, chunk_frames=4
+            )
+            self.assertEqual(len(clip_dirs), 2)
+            self.assertEqual(
+                sorted(os.listdir(clip_dirs[0])),
+                [f"frame-{i:06d}.png" for i in range(10)] + ["frames.json"],
+            )
+
+            (raw_dir,) = export_clips(
+                path,
+                [(91, 101)],
+                os.path.join(tmp, "raw"),
+                "raw",
+                step=2,
+                workers=2,
+                chunk_frames=2,
+            )
+            with open(os.path.join(raw_dir, "frames.json"), encoding="utf-8") as info:
+                info = json.load(info)
+            self.assertEqual(info["frames"], 5)
+            self.assertEqual(info["fps"], 30)
+            chunks = sorted(
+                name for name in os.listdir(raw_dir) if name.endswith(".raw")
+            )
+            self.assertEqual(len(chunks), 3)
+            size = sum(os.path.getsize(os.path.join(raw_dir, name)) for name in chunks)
+            self.assertEqual(size, 5 * info["width"] * info["height"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,11 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import pygame
-from game import wrap_text, end_screen, countdown_screen
+from eventlog import FRAME_TIME_MAX, QUALITY
+from game import apply_quality, wrap_text, end_screen, countdown_screen, pause_match
+from governor import TIERS
+from model import Model
+from pacing import WindowState
 
 
 class TestGameUtilities(unittest.TestCase):
@@ -28,12 +32,19 @@ class TestGameUtilities(unittest.TestCase):
         self.assertGreater(len(result), 1)
 
     @patch("pygame.display.flip")
-    @patch("pygame.time.delay")
-    def test_countdown_screen_delays_and_flips(self, mock_delay, mock_flip):
+    @patch("pygame.time.get_ticks", side_effect=[0, 0, 500, 1000, 2000, 3000])
+    def test_countdown_screen_flips_once_per_count(self, mock_ticks, mock_flip):
         countdown_screen()
-        self.assertEqual(mock_delay.call_count, 3)
         self.assertEqual(mock_flip.call_count, 3)
 
+    @patch("pygame.quit")
+    @patch("pygame.display.flip")
+    def test_countdown_screen_honours_quit(self, mock_flip, mock_quit):
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        with self.assertRaises(SystemExit):
+            countdown_screen()
+        self.assertTrue(mock_quit.called)
+
     @patch("pygame.display.flip")
     def test_end_screen_renders_text(self, mock_flip):
         mock_surface = MagicMock()
@@ -42,6 +53,48 @@ class TestGameUtilities(unittest.TestCase):
             self.assertTrue(mock_surface.blit.called)
             self.assertTrue(mock_flip.called)
 
+    @patch("pygame.display.flip")
+    def test_pause_match_holds_until_focus_returns(self, mock_flip):
+        model = Model()
+        model.player1.dy = 3
+        window = WindowState()
+        window.focused = False
+        wakeups = [[], [pygame.event.Event(pygame.WINDOWFOCUSGAINED)]]
+        with patch("game.pacer.wait", side_effect=wakeups), patch(
+            "view.screen", pygame.Surface((100, 100))
+        ):
+            self.assertTrue(pause_match(model, window))
+        self.assertFalse(window.paused)
+        self.assertEqual(model.tick, 0)
+        self.assertEqual(model.player1.dy, 0)
+        self.assertEqual(mock_flip.call_count, 1)
+
+    @patch("pygame.display.flip")
+    def test_pause_match_minimized_presents_nothing(self, mock_flip):
+        window = WindowState()
+        window.visible = False
+        with patch("game.pacer.wait", return_value=[pygame.event.Event(pygame.QUIT)]):
+            self.assertFalse(pause_match(Model(), window))
+        self.assertFalse(mock_flip.called)
+
+    def test_apply_quality_logs_tier_and_frame_time(self):
+        model = Model()
+        batches = []
+        model.events.subscribe(lambda batch: batches.extend(batch.of(QUALITY)))
+        with patch("game.governor") as governor, patch("game.particles"), patch(
+            "view.flat_background", False
+        ):
+            governor.level = 2
+            governor.average = 0.02
+            apply_quality(TIERS[2], model)
+            governor.average = 1.0  # Too slow to fit a record's value
+            apply_quality(TIERS[2], model)
+        model.events.dispatch()
+        self.assertEqual(
+            [(event.x, event.value) for event in batches],
+            [(2, 2000), (2, FRAME_TIME_MAX)],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+"""
+test_governor.py
+
+Unit tests for the QualityGovernor in governor.py and the load-shedding limits
+it drives on the Model.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+import pygame
+from governor import TIERS, QualityGovernor
+from model import Model
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+BUDGET = 1 / 60
+
+
+class TestQualityGovernor(unittest.TestCase):
+    """
+    Tests for tier selection from frame times.
+    """
+
+    def setUp(self):
+        self.governor = QualityGovernor(
+            budget=BUDGET, smoothing=1.0, degrade_after=5, restore_after=10
+        )
+
+    def test_single_spike_keeps_quality(self):
+        """
+        Test that one slow frame does not lower the tier.
+        """
+        self.governor.observe(BUDGET * 3)
+        for _ in range(20):
+            self.assertIsNone(self.governor.observe(BUDGET / 2))
+        self.assertEqual(self.governor.level, 0)
+
+    def test_sustained_overrun_degrades_one_tier_at_a_time(self):
+        """
+        Test that steady overruns step down through the tiers, one per stretch.
+        """
+        changed = [self.governor.observe(BUDGET * 2) for _ in range(10)]
+        self.assertEqual(
+            [tier.name for tier in changed if tier], ["no-effects", "flat-background"]
+        )
+        for _ in range(100):
+            self.governor.observe(BUDGET * 2)
+        self.assertEqual(self.governor.tier, TIERS[-1])
+
+    def test_headroom_restores_quality(self):
+        """
+        Test that quality comes back after a stretch of fast frames and that
+        every change is logged.
+        """
+        for _ in range(5):
+            self.governor.observe(BUDGET * 2)
+        self.assertEqual(self.governor.level, 1)
+        for _ in range(9):
+            self.governor.observe(BUDGET * 0.8)
+            self.governor.observe(BUDGET * 0.3)
+        self.assertEqual(self.governor.level, 1)
+        for _ in range(10):
+            self.governor.observe(BUDGET * 0.3)
+        self.assertEqual(self.governor.level, 0)
+        self.assertEqual(
+            [(old, new) for _, old, new, _ in self.governor.changes], [(0, 1), (1, 0)]
+        )
+
+
+class TestModelLimits(unittest.TestCase):
+    """
+    Tests for the spawn and bullet caps the governor sets.
+    """
+
+    def setUp(self):
+        self.model = Model()
+
+    def test_spawn_cap(self):
+        """
+        Test that spawn_alien does nothing once max_aliens are alive.
+        """
+        self.model.max_aliens = 2
+        spawned = [self.model.spawn_alien() for _ in range(3)]
+        self.assertIsNone(spawned[2])
+        self.assertEqual(len(self.model.aliens), 2)
+
+    def test_bullets_per_player_cap(self):
+        """
+        Test that a player cannot fire past the live bullet cap until a bullet
+        leaves play.
+        """
+        self.model.max_bullets_per_player = 1
+        player = self.model.player1
+        self.model.add_bullet(1)
+        player.reloading = False
+        self.model.add_bullet(1)
+        self.assertEqual(len(self.model.bullets), 1)
+        self.model.remove_bullet(self.model.bullets[0])
+        self.assertEqual(player.live_bullets, 0)
+        self.model.add_bullet(1)
+        self.assertEqual(len(self.model.bullets), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
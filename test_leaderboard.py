@@ -0,0 +1,87 @@
+"""
+test_leaderboard.py
+
+Unit tests for the SQLite-backed Leaderboard in leaderboard.py.
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from leaderboard import Leaderboard
+
+
+class TestLeaderboard(unittest.TestCase):
+    """
+    Tests for recording results and querying standings and history.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "board.db")
+        self.board = Leaderboard(self.path)
+
+    def tearDown(self):
+        self.board.close()
+        self.tmp.cleanup()
+
+    def test_database_uses_wal(self):
+        """
+        Test that the store is opened in write-ahead-log mode.
+        """
+        with sqlite3.connect(self.path) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_top_ranks_by_wins(self):
+        """
+        Test that standings order players by wins, then by fewer matches played.
+        """
+        self.board.record_match(["Ada", "Bob"], [3, 1], 0)
+        self.board.record_match(["Ada", "Cy"], [2, 3], 1)
+        self.board.record_match(["Ada", "Bob"], [3, 0], 0)
+        self.board.flush()
+        self.assertEqual(
+            self.board.top(3), [("Ada", 2, 3), ("Cy", 1, 1), ("Bob", 0, 2)]
+        )
+
+    def test_cache_is_invalidated_by_writes(self):
+        """
+        Test that a cached top-N is served until a new result is committed.
+        """
+        self.board.record_match(["Ada", "Bob"], [3, 1], 0)
+        self.board.flush()
+        first = self.board.top(5)
+        self.assertIs(self.board.top(5), first)
+        self.board.record_match(["Bob", "Ada"], [3, 1], 0)
+        self.board.flush()
+        self.assertEqual(self.board.top(5), [("Ada", 1, 2), ("Bob", 1, 2)])
+
+    def test_history_and_date_queries(self):
+        """
+        Test that a player's matches come back newest first and can be counted by date.
+        """
+        self.board.record_match(["Ada", "Bob"], [3, 1], 0, played_at=100.0)
+        self.board.record_match(["Ada", "Bob"], [2, 3], 1, played_at=200.0)
+        self.board.flush()
+        self.assertEqual(self.board.history("Ada"), [(200.0, 2, 0), (100.0, 3, 1)])
+        self.assertEqual(self.board.matches_since(150.0), 1)
+
+    def test_recording_does_not_block(self):
+        """
+        Test that queueing a day's worth of results returns long before they are
+        written, and that every one of them is eventually stored.
+        """
+        start = time.perf_counter()
+        for i in range(3000):
+            self.board.record_match([f"P{i % 50}", f"Q{i % 7}"], [3, i % 3], 0)
+        queued = time.perf_counter() - start
+        self.board.flush()
+        self.assertLess(queued, 0.5)
+        self.assertEqual(self.board.matches_since(0), 3000)
+        self.assertEqual(self.board.failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
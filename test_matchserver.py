@@ -0,0 +1,160 @@
+"""
+test_matchserver.py
+
+Unit tests for the multi-room MatchServer in matchserver.py, using local bot
+clients.
+"""
+
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+from matchserver import MatchServer, Room, bot, fetch_stats
+from spectate import SpectatorState
+
+
+class TestRoom(unittest.TestCase):
+    """
+    Tests for a single room.
+    """
+
+    def test_step_applies_queued_inputs(self):
+        """
+        Test that queued inputs reach the players on the room's next tick.
+        """
+        room = Room(1)
+        start_y = room.model.player2.y
+        room.inputs.append((1, 3, True))
+        room.inputs.append((2, -9, False))
+        room.step()
+        self.assertEqual(room.model.tick, 1)
+        self.assertEqual(len(room.model.bullets), 1)
+        self.assertEqual(room.model.player2.dy, -3)
+        self.assertLess(room.model.player2.y, start_y)
+        self.assertFalse(room.inputs)
+
+
+class TestMatchServer(unittest.TestCase):
+    """
+    Tests for matchmaking, ticking and overrun reporting.
+    """
+
+    def test_late_batches_are_counted_as_overruns(self):
+        """
+        Test that a batch finishing past the tick's deadline records one overrun.
+        """
+        server = MatchServer()
+        for room_id in (1, 2):
+            room = Room(room_id)
+            room.clients = {1: None, 2: None}
+            server.rooms[room_id] = room
+        with patch.object(Room, "publish"):
+            server.tick_rooms(time.perf_counter() + 60)
+            server.tick_rooms(time.perf_counter() - 0.5)
+        self.assertGreater(server.worst_lag, 0.4)
+        stats = server.stats()
+        self.assertEqual(stats["rooms"], 2)
+        self.assertEqual(stats["overruns"], 1)
+        self.assertEqual(stats["ticks"], 2)
+
+    def test_rooms_record_their_own_step_time(self):
+        """
+        Test that a room after a slow one in the batch is not charged for it.
+        """
+        server = MatchServer()
+        for room_id in (1, 2):
+            room = Room(room_id)
+            room.clients = {1: None, 2: None}
+            server.rooms[room_id] = room
+
+        def publish(room, _keyframe_interval):
+            if room.room_id == 1:
+                time.sleep(0.05)
+
+        with patch.object(Room, "publish", autospec=True, side_effect=publish):
+            server.tick_rooms(time.perf_counter() + 60)
+        slow, fast = server.rooms.values()
+        self.assertGreaterEqual(slow.worst_step, 0.05)
+        self.assertLess(fast.worst_step, 0.05)
+        self.assertEqual(server.overruns, 0)
+        room_stats = server.stats()["room_stats"]
+        self.assertGreaterEqual(room_stats[0][2], 50)
+        self.assertLess(room_stats[1][2], 50)
+
+    def test_malformed_input_is_dropped(self):
+        """
+        Test that bad input lines are skipped without dropping the player.
+        """
+        asyncio.run(self._send_malformed())
+
+    async def _send_malformed(self):
+        server = MatchServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b'{"join": true}\n')
+            joined = json.loads(await reader.readline())
+            _, other_writer = await asyncio.open_connection("127.0.0.1", server.port)
+            other_writer.write(b'{"join": true}\n')
+            writer.write(
+                b'5\n{"dy": null}\n{"dy": Infinity}\nnot json\n'
+                b'{"dy": "x"}\n{"dy": 0, "shoot": true}\n'
+            )
+            await asyncio.sleep(0.2)
+            room = server.rooms[joined["room"]]
+            self.assertIn(joined["player"], room.clients)
+            self.assertTrue(room.model.bullets)
+            writer.close()
+            other_writer.close()
+        finally:
+            await server.stop()
+
+    def test_bots_fill_rooms_and_receive_frames(self):
+        """
+        Test that bots are paired into rooms that tick and stream their state.
+        """
+        asyncio.run(self._play_rooms(3))
+
+    async def _play_rooms(self, rooms):
+        server = MatchServer(port=0)
+        await server.start()
+        try:
+            bots = [bot("127.0.0.1", server.port, 1.0) for _ in range(rooms * 2)]
+            *received, stats = await asyncio.wait_for(
+                asyncio.gather(*bots, self._watch(server.port)), 30
+            )
+        finally:
+            await server.stop()
+        self.assertEqual(stats["rooms"], rooms + 1)
+        self.assertEqual(stats["waiting"], 0)
+        self.assertGreater(stats["ticks"], 0)
+        self.assertEqual(len(stats["room_stats"]), rooms + 1)
+        self.assertTrue(all(count > 0 for count in received))
+
+    async def _watch(self, port):
+        """
+        Once the bots are playing, join a room of its own with two more clients,
+        check the streamed frames rebuild its state, and return the server's stats.
+        """
+        await asyncio.sleep(0.2)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"join": true}\n')
+        joined = json.loads(await reader.readline())
+        other, other_writer = await asyncio.open_connection("127.0.0.1", port)
+        other_writer.write(b'{"join": true}\n')
+        self.assertEqual(json.loads(await other.readline())["room"], joined["room"])
+        state = SpectatorState()
+        while not state.synced or state.tick < 10:
+            frame = json.loads(await reader.readline())
+            if "w" not in frame:
+                state.apply(frame)
+        self.assertEqual(len(state.players), 2)
+        stats = await fetch_stats("127.0.0.1", port)
+        writer.close()
+        other_writer.close()
+        return stats
+
+
+if __name__ == "__main__":
+    unittest.main()
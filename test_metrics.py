@@ -0,0 +1,67 @@
+"""
+test_metrics.py
+
+Unit tests for the metric types and HTTP exporter in metrics.py.
+"""
+
+import unittest
+import urllib.request
+from metrics import Counter, Gauge, Histogram, MetricsServer, Registry
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Unit tests for metrics and their exposition.
+    """
+
+    def setUp(self):
+        """
+        Set up a registry with one metric of each type.
+        """
+        self.registry = Registry()
+        self.counter = self.registry.register(Counter("test_ticks", "Ticks."))
+        self.gauge = self.registry.register(Gauge("test_aliens", "Aliens."))
+        self.histogram = self.registry.register(
+            Histogram("test_frame_seconds", "Frames.", buckets=(0.01, 0.02))
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        """
+        Test that rendered histogram buckets count every observation at or below the bound.
+        """
+        for value in (0.005, 0.015, 0.015, 0.5):
+            self.histogram.observe(value)
+        text = self.registry.render()
+        self.assertIn('test_frame_seconds_bucket{le="0.01"} 1', text)
+        self.assertIn('test_frame_seconds_bucket{le="0.02"} 3', text)
+        self.assertIn('test_frame_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("test_frame_seconds_count 4", text)
+
+    def test_render_includes_type_lines(self):
+        """
+        Test that counters and gauges are rendered with HELP and TYPE lines.
+        """
+        self.counter.inc(3)
+        self.gauge.set(7)
+        text = self.registry.render()
+        self.assertIn("# TYPE test_ticks counter", text)
+        self.assertIn("test_ticks_total 3", text)
+        self.assertIn("# TYPE test_aliens gauge", text)
+        self.assertIn("test_aliens 7", text)
+
+    def test_server_exposes_metrics(self):
+        """
+        Test that the HTTP server returns the rendered registry at /metrics.
+        """
+        self.counter.inc()
+        server = MetricsServer(self.registry, port=0)
+        server.start()
+        self.addCleanup(server.stop)
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+        self.assertIn("test_ticks_total 1", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
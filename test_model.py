@@ -12,7 +12,8 @@ Each test class isolates the logic and mocks Pygame dependencies to allow for he
 import unittest
 from unittest.mock import patch
 import pygame
-from model import Player, Alien, Bullet, Model
+from model import Player, Alien, Bullet, Model, PlayerIndex, layout_players
+from eventlog import BOUNCE, HIT, INTERCEPT, MATCH_START, SHOT
 from settings import WIDTH, HEIGHT
 
 # Disable pygame's video system for headless testing
@@ -190,6 +191,119 @@ class TestModel(unittest.TestCase):
             self.model.remove_bullet(bullet)
             self.assertEqual(len(self.model.bullets), 0)
 
+    def test_clone_is_independent(self):
+        """
+        Test that simulating a clone leaves the original model untouched.
+        """
+        self.model.spawn_alien()
+        twin = self.model.clone()
+        twin.aliens[0].x += 100
+        twin.player1.y += 10
+        self.assertNotEqual(twin.aliens[0].x, self.model.aliens[0].x)
+        self.assertNotEqual(twin.player1.y, self.model.player1.y)
+        self.assertIs(twin.aliens[0].image, self.model.aliens[0].image)
+
+    def test_clone_replays_same_spawns(self):
+        """
+        Test that two clones of a model spawn identical aliens tick for tick.
+        """
+        first = self.model.clone()
+        second = self.model.clone()
+        for _ in range(200):
+            first.update()
+            second.update()
+        self.assertGreater(len(first.aliens), 0)
+        self.assertEqual(
+            [(alien.x, alien.y) for alien in first.aliens],
+            [(alien.x, alien.y) for alien in second.aliens],
+        )
+
+    def test_update_publishes_hits(self):
+        """
+        Test that a bullet hitting an alien is published on the event bus for
+        subscribers, once the frame's events are dispatched.
+        """
+        self.model.spawn_alien()
+        alien = self.model.aliens[0]
+        alien.speed_x = 0
+        self.model.player1.x = alien.x - 15
+        self.model.player1.y = alien.y
+        self.model.player1.last_shot_time = -1000
+        self.model.add_bullet(1)
+        self.model.update()
+        batches = []
+        self.model.events.subscribe(lambda batch: batches.append(list(batch)))
+        self.model.events.dispatch()
+        kinds = [event.kind for event in batches[0]]
+        self.assertEqual(kinds, [MATCH_START, SHOT, HIT, BOUNCE])
+        self.assertEqual(batches[0][-1][4:6], (alien.x, alien.y))
+
+    def test_opposing_bullets_intercept(self):
+        """
+        Test that bullets fired at each other from opposite sides destroy each
+        other mid-air, and that the state hash still matches a full recompute.
+        """
+        model = Model()
+        model.player1.y = 400
+        model.player2.y = 405
+        model.add_bullet(1)
+        model.add_bullet(2)
+        for _ in range(100):
+            model.update()
+            if not model.bullets:
+                break
+        self.assertEqual(model.bullets, [])
+        self.assertEqual(len(model.bullet_lanes), 0)
+        self.assertEqual([player.live_bullets for player in model.players], [0, 0])
+        self.assertEqual(model.state_hash, model.full_state_hash())
+        batches = []
+        model.events.subscribe(lambda batch: batches.append(list(batch.of(INTERCEPT))))
+        model.events.dispatch()
+        (event,) = batches[0]
+        self.assertEqual((event.player_id, event.value, event.y), (1, 2, 402))
+        self.assertLess(abs(event.x - WIDTH // 2), 20)
+
+    def test_layout_players_alternates_sides(self):
+        """
+        Test that odd IDs defend the left, even IDs the right, and shared sides get lanes.
+        """
+        self.assertEqual(
+            [(pid, side, lane) for pid, side, lane in layout_players(2)],
+            [(1, "left", None), (2, "right", None)],
+        )
+        layout = layout_players(4)
+        self.assertEqual([side for _, side, _ in layout], ["left", "right"] * 2)
+        self.assertLess(layout[0][2][1], layout[2][2][1])
+
+    def test_player_index_finds_lane_owner(self):
+        """
+        Test that the index returns the player whose lane contains a height.
+        """
+        model = Model(num_players=4)
+        top_left, bottom_left = model.get_player(1), model.get_player(3)
+        self.assertIsInstance(model.index, PlayerIndex)
+        self.assertEqual(model.index.players_on("left"), [top_left, bottom_left])
+        self.assertIs(model.index.player_at("left", top_left.lane[0] + 1), top_left)
+        self.assertIs(model.index.player_at("left", bottom_left.lane[1]), bottom_left)
+        self.assertEqual(
+            model.index.players_between("left", 0, top_left.lane[0] + 5), [top_left]
+        )
+
+    def test_alien_reach_scores_opposing_side(self):
+        """
+        Test that in a 4-player match an alien reaching a lane costs only that
+        lane's player a life and scores for both opponents.
+        """
+        model = Model(num_players=4)
+        victim = model.get_player(3)
+        alien = Alien()
+        alien.x, alien.y = victim.x, victim.y
+        model.check_alien_reach(alien)
+        self.assertFalse(alien.alive)
+        self.assertEqual(victim.health, 2)
+        self.assertEqual(model.get_player(1).health, 3)
+        self.assertEqual([model.get_player(pid).score for pid in (2, 4)], [1, 1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+"""
+test_pacing.py
+
+Unit tests for the FramePacer and WindowState classes in pacing.py.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+import pygame
+from pacing import FramePacer, WindowState
+
+
+class TestFramePacer(unittest.TestCase):
+    """
+    Unit tests for the FramePacer class.
+    """
+
+    def setUp(self):
+        """
+        Initialize Pygame and a dummy display so the event queue is available.
+        """
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        pygame.event.clear()
+        self.pacer = FramePacer(fps=30, idle_timeout=10)
+
+    def test_wait_times_out_with_no_events(self):
+        """
+        Test that wait returns an empty list when nothing arrives before the timeout.
+        """
+        self.assertEqual(self.pacer.wait(), [])
+
+    def test_wait_drains_all_pending_events(self):
+        """
+        Test that wait returns the event that woke it plus everything queued behind it.
+        """
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_a}))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_b}))
+        events = self.pacer.wait()
+        self.assertEqual([event.key for event in events], [pygame.K_a, pygame.K_b])
+
+    def test_tick_caps_frame_rate(self):
+        """
+        Test that consecutive ticks are spaced at least one frame apart.
+        """
+        self.pacer.tick()
+        self.assertGreaterEqual(self.pacer.tick(), 1000 // 30 - 1)
+
+    def tearDown(self):
+        """
+        Quit Pygame after each test.
+        """
+        pygame.quit()
+
+
+class TestWindowState(unittest.TestCase):
+    """
+    Unit tests for the WindowState class.
+    """
+
+    def test_pauses_while_unfocused_or_minimized(self):
+        """
+        Test that losing focus or minimizing pauses, and only undoing both resumes.
+        """
+        window = WindowState()
+        self.assertFalse(window.paused)
+        self.assertTrue(window.handle(pygame.event.Event(pygame.WINDOWFOCUSLOST)))
+        self.assertTrue(window.handle(pygame.event.Event(pygame.WINDOWMINIMIZED)))
+        self.assertTrue(window.paused)
+        window.handle(pygame.event.Event(pygame.WINDOWRESTORED))
+        self.assertTrue(window.paused)
+        window.handle(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+        self.assertFalse(window.paused)
+
+    def test_other_events_are_ignored(self):
+        """
+        Test that unrelated events do not change the state.
+        """
+        window = WindowState()
+        event = pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_a})
+        self.assertFalse(window.handle(event))
+        self.assertFalse(window.paused)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+test_particles.py
+
+Unit tests for the ParticleSystem class in particles.py.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+from unittest.mock import MagicMock
+import pygame
+from particles import ParticleSystem
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestParticleSystem(unittest.TestCase):
+    """
+    Unit tests for the ParticleSystem class.
+    """
+
+    def setUp(self):
+        """
+        Set up a small particle system with a fixed seed.
+        """
+        self.particles = ParticleSystem(capacity=100, seed=1)
+
+    def test_budget_is_never_exceeded(self):
+        """
+        Test that bursts beyond the capacity are dropped rather than stored.
+        """
+        for _ in range(10):
+            self.particles.burst(100, 100, killed=True)
+        self.assertEqual(self.particles.count, 100)
+        self.assertEqual(self.particles.dropped, 10 * 48 - 100)
+
+    def test_expired_particles_are_compacted(self):
+        """
+        Test that particles disappear once their lifetime runs out.
+        """
+        self.particles.burst(100, 100, killed=False)
+        self.assertEqual(self.particles.count, 12)
+        for _ in range(18):
+            self.particles.update()
+        self.assertEqual(self.particles.count, 0)
+
+    def test_draw_submits_one_batch(self):
+        """
+        Test that all live particles are drawn with a single blits call.
+        """
+        self.particles.burst(100, 100, killed=True)
+        surface = MagicMock()
+        drawn = self.particles.draw(surface)
+        self.assertEqual(drawn, 48)
+        surface.blits.assert_called_once()
+        self.assertEqual(len(surface.blits.call_args[0][0]), 48)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+test_profiler.py
+
+Unit tests for the ProfileCapture in profiler.py.
+"""
+
+import json
+import os
+import pstats
+import tempfile
+import time
+import unittest
+from profiler import ProfileCapture
+
+
+def busy_frame(seconds=0.002):
+    """
+    Spin for a while, standing in for a frame's work.
+    """
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class TestProfileCapture(unittest.TestCase):
+    """
+    Tests for starting, ending and writing captures.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.capture = ProfileCapture(self.tmp.name, interval=0.001)
+
+    def test_timed_capture_writes_reports(self):
+        """
+        Test that a timed capture ends by itself and writes loadable stats,
+        collapsed stacks rooted at the entity counts, and a summary.
+        """
+        self.assertTrue(self.capture.start(seconds=0.1))
+        self.assertFalse(self.capture.start(seconds=0.1))
+        paths = None
+        frames = 0
+        while paths is None:
+            busy_frame()
+            frames += 1
+            paths = self.capture.observe(aliens=frames % 25, bullets=3)
+        self.assertFalse(self.capture.active)
+        stats_path, stacks_path, summary_path = paths
+
+        stats = pstats.Stats(stats_path)
+        self.assertTrue(any(function[2] == "busy_frame" for function in stats.stats))
+        with open(stacks_path, encoding="utf-8") as stacks_file:
+            lines = stacks_file.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, samples = line.rsplit(" ", 1)
+            self.assertGreater(int(samples), 0)
+            self.assertRegex(
+                stack.split(";")[0], r"^(aliens=\d+-\d+ bullets=0-9|counts=unknown)$"
+            )
+        self.assertTrue(any("busy_frame (test_profiler.py" in line for line in lines))
+        with open(summary_path, encoding="utf-8") as summary_file:
+            summary = json.load(summary_file)
+        self.assertEqual(summary["frames"], frames)
+        self.assertEqual(summary["counts"]["bullets"], {"min": 3, "mean": 3, "max": 3})
+
+    def test_match_capture_ends_after_matches(self):
+        """
+        Test that a match-limited capture ends when its last match finishes.
+        """
+        self.capture.start(matches=2)
+        busy_frame()
+        self.assertIsNone(self.capture.match_finished())
+        paths = self.capture.match_finished()
+        self.assertEqual(len(paths), 3)
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    def test_unarmed_capture_does_nothing(self):
+        """
+        Test that stopping an idle capture writes nothing.
+        """
+        self.assertFalse(self.capture.active)
+        self.assertEqual(self.capture.stop(), [])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
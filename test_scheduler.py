@@ -0,0 +1,105 @@
+"""
+test_scheduler.py
+
+Unit tests for the TimerWheel in scheduler.py and the timed events the Model
+runs on it.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+import pygame
+from model import ALIEN_SPAWN_TICKS, SHOT_DELAY_TICKS, Model
+from scheduler import TimerWheel
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestTimerWheel(unittest.TestCase):
+    """
+    Tests for scheduling, dispatch, cancellation and inspection.
+    """
+
+    def setUp(self):
+        self.wheel = TimerWheel(size=8)
+
+    def test_fires_on_due_tick(self):
+        """
+        Test that a timer is handed back exactly on the tick it is due.
+        """
+        self.wheel.schedule(3, "boom", 7)
+        fired = [[timer.args for timer in self.wheel.advance()] for _ in range(4)]
+        self.assertEqual(fired, [[], [], [(7,)], []])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_delay_longer_than_wheel(self):
+        """
+        Test that a timer more than one revolution out waits for its own tick.
+        """
+        self.wheel.schedule(20, "late")
+        ticks = [self.wheel.tick for _ in range(20) if self.wheel.advance()]
+        self.assertEqual(ticks, [20])
+
+    def test_cancel_and_pending(self):
+        """
+        Test that cancelled timers never fire and pending lists the rest, soonest first.
+        """
+        doomed = self.wheel.schedule(2, "expire", 1)
+        self.wheel.schedule(5, "expire", 2)
+        self.wheel.schedule(1, "spawn")
+        self.wheel.cancel(doomed)
+        self.wheel.cancel(doomed)
+        self.assertEqual(len(self.wheel), 2)
+        self.assertEqual(self.wheel.pending(), [(1, "spawn", ()), (5, "expire", (2,))])
+        self.assertEqual(self.wheel.pending("expire"), [(5, "expire", (2,))])
+        fired = [timer.kind for _ in range(5) for timer in self.wheel.advance()]
+        self.assertEqual(fired, ["spawn", "expire"])
+
+    def test_copy_is_independent(self):
+        """
+        Test that cancelling a timer in a copy leaves the original scheduled.
+        """
+        self.wheel.schedule(2, "spawn")
+        twin = self.wheel.copy()
+        twin.cancel(twin.slots[2][0])
+        self.assertEqual(len(self.wheel.pending()), 1)
+        self.assertEqual(twin.pending(), [])
+
+
+class TestModelTimers(unittest.TestCase):
+    """
+    Tests for the Model's spawn and cooldown timers.
+    """
+
+    def setUp(self):
+        self.model = Model()
+
+    def test_spawns_on_schedule(self):
+        """
+        Test that aliens spawn every ALIEN_SPAWN_TICKS ticks.
+        """
+        for _ in range(ALIEN_SPAWN_TICKS - 1):
+            self.model.update()
+        self.assertEqual(len(self.model.aliens), 0)
+        self.model.update()
+        self.assertEqual(len(self.model.aliens), 1)
+        self.assertEqual(
+            self.model.timers.pending("spawn"), [(ALIEN_SPAWN_TICKS, "spawn", ())]
+        )
+
+    def test_shot_cooldown(self):
+        """
+        Test that a player can fire again only once the reload timer has fired.
+        """
+        self.model.add_bullet(1)
+        self.model.add_bullet(1)
+        self.assertEqual(len(self.model.bullets), 1)
+        for _ in range(SHOT_DELAY_TICKS):
+            self.model.update()
+        self.model.add_bullet(1)
+        self.assertEqual(len(self.model.bullets), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
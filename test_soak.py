@@ -0,0 +1,55 @@
+"""
+test_soak.py
+
+Unit tests for the soak harness in soak.py.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import unittest
+from collections import Counter
+import pygame
+from soak import Sample, check_growth, count_objects, run_soak
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestSoak(unittest.TestCase):
+    """
+    Unit tests for the soak harness helpers.
+    """
+
+    def test_count_objects_finds_untracked_surfaces(self):
+        """
+        Test that surfaces held by a container are counted even though the
+        garbage collector does not track them.
+        """
+        before = count_objects()["Surface"]
+        held = [pygame.Surface((4, 4)) for _ in range(3)]
+        self.assertEqual(count_objects()["Surface"], before + len(held))
+
+    def test_check_growth_flags_each_threshold(self):
+        """
+        Test that every threshold that is passed produces a failure message.
+        """
+        report = {
+            "baseline": Sample(0, 100, 100, Counter(Alien=1)),
+            "final": Sample(10, 500, 100, Counter(Alien=50)),
+        }
+        failures = check_growth(report, 200, 200, 10)
+        self.assertEqual(len(failures), 2)
+        self.assertTrue(any("RSS" in failure for failure in failures))
+        self.assertTrue(any("Alien" in failure for failure in failures))
+
+    def test_short_soak_collects_samples(self):
+        """
+        Test that a short soak run samples at the requested interval.
+        """
+        report = run_soak(4, sample_every=2, warmup=1, max_ticks=100)
+        self.assertEqual([entry.match for entry in report["samples"]], [0, 2, 4])
+        self.assertEqual(check_growth(report, 2**24, 2**22, 200), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+test_spectate.py
+
+Unit tests for the spectator broadcast encoding and server in spectate.py,
+using local stand-in clients.
+"""
+
+# pylint: disable=no-member,undefined-variable,protected-access
+
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+import pygame
+from ai import HeuristicDriver, RandomDriver, simulate_tick
+from model import Model
+from spectate import (
+    BroadcastServer,
+    SpectatorState,
+    _Spectator,
+    _render_state,
+    encode_delta,
+    encode_keyframe,
+    snapshot,
+)
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestSpectate(unittest.TestCase):
+    """
+    Unit tests for delta encoding and fan-out.
+    """
+
+    def setUp(self):
+        """
+        Set up a bot match stepped tick by tick.
+        """
+        patcher = patch("pygame.image.load", return_value=pygame.Surface((50, 50)))
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.model = Model()
+        self.model.rng.seed(7)
+        self.drivers = [RandomDriver(1), HeuristicDriver(2)]
+
+    def test_deltas_reproduce_the_model(self):
+        """
+        Test that a keyframe followed by deltas rebuilds the exact server state.
+        """
+        state = SpectatorState()
+        previous = snapshot(self.model)
+        state.apply(json.loads(encode_keyframe(0, previous, ["A", "B"])))
+        for _ in range(600):
+            simulate_tick(self.model, self.drivers)
+            current = snapshot(self.model)
+            state.apply(json.loads(encode_delta(self.model.tick, previous, current)))
+            self.assertEqual(state.as_state(), current)
+            previous = current
+
+    @patch("pygame.display.flip")
+    def test_render_match_with_more_players(self, mock_flip):
+        """
+        Test that a spectator can draw a match with more than two players.
+        """
+        model = Model(num_players=4)
+        state = SpectatorState()
+        names = ["A", "B", "CPU 3", "CPU 4"]
+        state.apply(json.loads(encode_keyframe(0, snapshot(model), names)))
+        self.assertEqual(len(state.players), 4)
+        with patch("view.screen", pygame.Surface((800, 600))):
+            _render_state(state)
+        self.assertTrue(mock_flip.called)
+
+    def test_slow_spectator_skips_to_keyframe(self):
+        """
+        Test that a frame the spectator has not taken yet is replaced by a keyframe.
+        """
+        spectator = _Spectator(MagicMock())
+        spectator.needs_keyframe = False
+        spectator.offer(b"delta1", lambda: b"key1")
+        spectator.offer(b"delta2", lambda: b"key2")
+        self.assertEqual(spectator.pending, b"key2")
+        self.assertEqual(spectator.frames_skipped, 1)
+
+    def test_many_spectators_receive_the_match(self):
+        """
+        Test that a crowd of local spectators all converge on the final state.
+        """
+        asyncio.run(self._broadcast_to_crowd(100, 120))
+
+    async def _broadcast_to_crowd(self, crowd, ticks):
+        server = BroadcastServer(port=0)
+        await server.start()
+        connections = [
+            await asyncio.open_connection("127.0.0.1", server.port)
+            for _ in range(crowd)
+        ]
+        while len(server.spectators) < crowd:
+            await asyncio.sleep(0.01)
+
+        for _ in range(ticks):
+            simulate_tick(self.model, self.drivers)
+            server.publish(self.model.tick, snapshot(self.model))
+            await asyncio.sleep(0)
+        final = snapshot(self.model)
+
+        async def follow(reader):
+            state = SpectatorState()
+            while state.tick != self.model.tick:
+                state.apply(json.loads(await reader.readline()))
+            return state.as_state()
+
+        states = await asyncio.wait_for(
+            asyncio.gather(*(follow(reader) for reader, _ in connections)), 30
+        )
+        for _, writer in connections:
+            writer.close()
+        await server.stop()
+        for state in states:
+            self.assertEqual(state, final)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+test_statehash.py
+
+Unit tests for the Model's incremental state hash and the stream helpers in
+statehash.py.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import assets
+from model import Model
+from statehash import first_divergence, load_hashes, record, save_hashes
+
+# pylint: disable=protected-access
+
+
+def play(model, ticks):
+    """
+    Run a model for some ticks with both players moving and shooting.
+    """
+    for _ in range(ticks):
+        for player in model.players:
+            player.dy = 3 if (model.tick // 40) % 2 else -3
+            player.shoot = model.tick % 7 == 0
+        model.fire_pending()
+        model.update()
+
+
+class TestStateHash(unittest.TestCase):
+    """
+    Tests for the hash the Model maintains as its state changes.
+    """
+
+    def seeded_model(self, seed=5, **kwargs):
+        """
+        Make a model with a seeded RNG, so its ticks are reproducible.
+        """
+        model = Model(**kwargs)
+        model.alien_spawn_ticks = 10
+        model.rng.seed(seed)
+        model.rehash()
+        return model
+
+    def test_incremental_hash_matches_full_recompute(self):
+        """
+        Test that the incrementally kept hash equals a recomputation from
+        scratch through spawns, shots, hits and removals.
+        """
+        for mode in ("classic", "swarm"):
+            model = self.seeded_model(alien_mode=mode)
+            for _ in range(30):
+                play(model, 10)
+                self.assertEqual(model.state_hash, model.full_state_hash())
+
+    def test_same_seed_gives_same_stream(self):
+        """
+        Test that two runs from the same seed record identical hash streams.
+        """
+        first = self.seeded_model()
+        second = self.seeded_model()
+        play(first, 200)
+        play(second, 200)
+        self.assertEqual(len(first.hashes), 200)
+        self.assertEqual(first.hashes, second.hashes)
+        self.assertIsNone(first_divergence(first.hashes, second.hashes))
+
+    def test_first_divergence_finds_changed_tick(self):
+        """
+        Test that a change to one run is located at the tick it shows up in,
+        and that the streams never agree again.
+        """
+        first = self.seeded_model()
+        second = self.seeded_model()
+        play(first, 50)
+        play(second, 50)
+        second.player1.score += 1
+        play(first, 100)
+        play(second, 100)
+        self.assertEqual(first_divergence(first.hashes, second.hashes), 50)
+        self.assertNotEqual(first.hashes[-1], second.hashes[-1])
+
+    def test_clone_continues_the_stream(self):
+        """
+        Test that a clone's next tick hashes the same as the original's.
+        """
+        model = self.seeded_model()
+        play(model, 60)
+        twin = model.clone()
+        self.assertEqual(len(twin.hashes), 0)
+        twin.update()
+        model.update()
+        self.assertEqual(twin.hashes[0], model.hashes[-1])
+
+
+class TestHashStreams(unittest.TestCase):
+    """
+    Tests for comparing and storing hash streams.
+    """
+
+    def test_first_divergence(self):
+        """
+        Test the first differing index for equal, diverging and truncated streams.
+        """
+        stream = list(range(100))
+        self.assertIsNone(first_divergence(stream, list(stream)))
+        changed = stream[:37] + [-1] * 63
+        self.assertEqual(first_divergence(stream, changed), 37)
+        self.assertEqual(first_divergence(stream, stream[:60]), 60)
+
+    def test_save_and_load(self):
+        """
+        Test that a stream survives a round trip through a file.
+        """
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        model = Model()
+        play(model, 30)
+        save_hashes(path, model.hashes)
+        self.assertEqual(load_hashes(path), model.hashes)
+
+    def test_record_runs_headless_without_bundle(self):
+        """
+        Test that a match records with no display and no built asset bundle,
+        as on a fresh checkout.
+        """
+        with patch.object(assets, "_bundle", False), patch.dict(
+            assets._sprites, clear=True
+        ), patch("pygame.display.get_surface", return_value=None):
+            hashes = record(seed=3, ticks=200)
+        self.assertEqual(len(hashes), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
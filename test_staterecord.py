@@ -0,0 +1,101 @@
+"""
+test_staterecord.py
+
+Unit tests for the columnar StateRecorder and StateRecording in staterecord.py.
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from model import Model
+from staterecord import StateRecorder, StateRecording
+
+
+class TestStateRecord(unittest.TestCase):
+    """
+    Tests for recording matches and reading them back by tick range.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "match")
+        self.model = Model()
+        self.model.rng.seed(3)
+        self.model.alien_spawn_ticks = 5
+        # Tiny files so recording has to grow them several times
+        self.recorder = StateRecorder(self.path, initial_ticks=4, initial_entities=4)
+        self.expected = {}
+
+    def play(self, ticks):
+        """
+        Run and record some ticks, remembering what each one looked like.
+        """
+        for _ in range(ticks):
+            for player in self.model.players:
+                player.shoot = self.model.tick % 9 == 0
+            self.model.fire_pending()
+            self.model.update()
+            self.recorder.record(self.model)
+            self.expected[self.model.tick] = (
+                [(p.x, p.y, p.health, p.score) for p in self.model.players],
+                [(a.alien_id, a.x, a.y, a.health) for a in self.model.aliens],
+                [(b.bullet_id, b.x, b.y, b.player_id) for b in self.model.bullets],
+            )
+
+    def test_round_trip_by_tick_range(self):
+        """
+        Test that a slice of ticks reads back exactly what was recorded.
+        """
+        self.play(200)
+        self.recorder.close()
+        recording = StateRecording(self.path)
+        self.assertEqual(len(recording), 200)
+
+        players = recording.players(150, 160)
+        self.assertEqual(players["player_x"].shape, (10, 2))
+        offsets, aliens = recording.entities("alien", 150, 160)
+        bullet_offsets, bullets = recording.entities("bullet", 150, 160)
+        self.assertGreater(offsets[-1], 0)
+        self.assertGreater(bullet_offsets[-1], 0)
+        for i, tick in enumerate(range(150, 160)):
+            want_players, want_aliens, want_bullets = self.expected[tick]
+            got_players = [
+                tuple(players[name][i][p] for name in players) for p in range(2)
+            ]
+            self.assertEqual(got_players, want_players)
+            rows = slice(offsets[i], offsets[i + 1])
+            got_aliens = list(zip(*(aliens[name][rows].tolist() for name in aliens)))
+            self.assertEqual(got_aliens, want_aliens)
+            rows = slice(bullet_offsets[i], bullet_offsets[i + 1])
+            got_bullets = list(zip(*(bullets[name][rows].tolist() for name in bullets)))
+            self.assertEqual(got_bullets, want_bullets)
+
+    def test_reads_are_zero_copy(self):
+        """
+        Test that columns come back as views of the mapped files.
+        """
+        self.play(140)
+        self.recorder.close()
+        recording = StateRecording(self.path)
+        _, aliens = recording.entities("alien", 110, 120)
+        self.assertGreater(len(aliens["alien_x"]), 0)
+        self.assertIsInstance(recording.players(110, 120)["player_y"], np.memmap)
+        self.assertIsInstance(aliens["alien_x"], np.memmap)
+
+    def test_flushed_recording_is_readable_while_open(self):
+        """
+        Test that an analysis can open a recording that is still being written.
+        """
+        self.play(30)
+        self.recorder.flush()
+        recording = StateRecording(self.path)
+        self.assertEqual(recording.ticks.tolist(), list(range(1, 31)))
+        self.play(10)
+        self.recorder.close()
+        self.assertEqual(len(StateRecording(self.path)), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+test_swarm.py
+
+Unit tests for the Flock steering in swarm.py and the Model's swarm alien mode.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import time
+import unittest
+import numpy as np
+import pygame
+from model import Model
+from settings import SWARM_WAVE_SIZE
+from swarm import Flock
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+class TestFlock(unittest.TestCase):
+    """
+    Tests for the vectorized steering rules.
+    """
+
+    def setUp(self):
+        self.flock = Flock(radius=80, cohesion=0.0, alignment=0.0)
+
+    def test_separation_pushes_crowded_aliens_apart(self):
+        """
+        Test that two aliens sharing a cell steer away from each other.
+        """
+        pos = np.array([[100.0, 100.0], [110.0, 100.0]])
+        vel = np.array([[0.0, 2.0], [0.0, 2.0]])
+        new_vel = self.flock.steer(pos, vel)
+        self.assertLess(new_vel[0, 0], 0)
+        self.assertGreater(new_vel[1, 0], 0)
+
+    def test_alignment_matches_neighbours(self):
+        """
+        Test that an alien turns towards the heading of its neighbours.
+        """
+        flock = Flock(radius=80, separation=0.0, cohesion=0.0, alignment=0.5)
+        pos = np.array([[100.0, 100.0], [180.0, 100.0], [180.0, 140.0]])
+        vel = np.array([[0.0, 2.0], [2.0, 0.0], [2.0, 0.0]])
+        new_vel = flock.steer(pos, vel)
+        self.assertGreater(new_vel[0, 0], 0)
+
+    def test_distant_aliens_ignore_each_other(self):
+        """
+        Test that aliens more than a block of cells apart keep their velocity.
+        """
+        pos = np.array([[100.0, 100.0], [900.0, 700.0]])
+        vel = np.array([[2.0, 0.0], [-2.0, 0.0]])
+        np.testing.assert_allclose(self.flock.steer(pos, vel), vel)
+
+    def test_speed_is_limited(self):
+        """
+        Test that steering never leaves the allowed speed range.
+        """
+        rng = np.random.default_rng(1)
+        pos = rng.uniform(0, 300, (500, 2))
+        vel = rng.uniform(-5, 5, (500, 2))
+        speed = np.hypot(*Flock().steer(pos, vel).T)
+        self.assertTrue(np.all(speed <= 3.0 + 1e-9))
+        self.assertTrue(np.all(speed >= 1.0 - 1e-9))
+
+    def test_thousand_aliens_steer_quickly(self):
+        """
+        Test that a 1,000-alien swarm steers well inside a frame.
+        """
+        rng = np.random.default_rng(2)
+        pos = rng.uniform(0, 800, (1000, 2))
+        vel = rng.uniform(-2, 2, (1000, 2))
+        flock = Flock()
+        start = time.perf_counter()
+        for _ in range(10):
+            flock.steer(pos, vel)
+        self.assertLess((time.perf_counter() - start) / 10, 0.010)
+
+
+class TestSwarmModel(unittest.TestCase):
+    """
+    Tests for the Model running in swarm mode.
+    """
+
+    def test_spawn_releases_a_wave(self):
+        """
+        Test that a spawn timer releases a whole wave of flying aliens.
+        """
+        model = Model(alien_mode="swarm")
+        while not model.aliens:
+            model.update()
+        self.assertEqual(len(model.aliens), SWARM_WAVE_SIZE)
+        for _ in range(30):
+            model.update()
+        self.assertTrue(any(alien.speed_y for alien in model.aliens))
+
+    def test_classic_mode_has_no_flock(self):
+        """
+        Test that classic aliens keep flying straight.
+        """
+        model = Model()
+        self.assertIsNone(model.flock)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,13 @@ This module contains unit tests for the rendering functions defined in view.py.
 """
 
 import unittest
+from unittest.mock import patch
 import pygame
 from model import Model
 import view
-from settings import WIDTH, HEIGHT
+from settings import HEIGHT, WIDTH
 
-# pylint: disable=no-member,undefined-variable
+# pylint: disable=no-member,undefined-variable,protected-access
 
 
 class TestViewFunctions(unittest.TestCase):
@@ -24,6 +25,7 @@ class TestViewFunctions(unittest.TestCase):
         """
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.font = pygame.font.SysFont(None, 36)
         self.model = Model()
 
     def test_draw_player_does_not_crash(self):
@@ -35,6 +37,82 @@ class TestViewFunctions(unittest.TestCase):
         except Exception as e:
             self.fail(f"draw_player() raised an exception: {e}")
 
+    def test_render_batches_each_layer(self):
+        """
+        Test that render draws each entity layer with a single blits call and
+        counts the sprites it submitted.
+        """
+        for _ in range(5):
+            self.model.spawn_alien()
+        self.model.bullets = []
+        with patch("view.screen", self.screen), patch("view.font", self.font):
+            view.render(self.model, "One", "Two")
+        # background, players, aliens and the score overlay
+        self.assertEqual(view.frame_stats["draw_calls"], 4)
+        self.assertEqual(view.frame_stats["sprites"], 1 + 2 + 5 + 8)
+
+    def test_render_culls_off_screen_aliens(self):
+        """
+        Test that aliens entirely outside the viewport are not submitted.
+        """
+        self.model.spawn_alien()
+        self.model.spawn_alien()
+        self.model.aliens[0].x = -100
+        with patch("view.screen", self.screen), patch("view.font", self.font):
+            view.render(self.model, "One", "Two")
+        self.assertEqual(view.frame_stats["culled"], 1)
+
+    def test_render_with_camera_skips_hidden_chunks(self):
+        """
+        Test that with a camera, aliens in chunks outside the view are never
+        considered and visible ones are drawn relative to the camera.
+        """
+        self.model.spawn_alien()
+        self.model.spawn_alien()
+        near, far = self.model.aliens
+        near.x, far.x = 900, 100
+        for alien in self.model.aliens:
+            self.model.alien_chunks.relocate(alien)
+        self.model.bullets = []
+        camera = view.Camera(width=400, height=HEIGHT)
+        camera.follow(WIDTH, HEIGHT // 2)
+        self.assertEqual(camera.rect(), (WIDTH - 400, 0, WIDTH, HEIGHT))
+        with patch("view.screen", self.screen), patch("view.font", self.font):
+            view.render(self.model, "One", "Two", camera=camera)
+        # background, player 2, one alien and the score overlay; player 1 is culled
+        self.assertEqual(view.frame_stats["sprites"], 1 + 1 + 1 + 8)
+        self.assertEqual(view.frame_stats["culled"], 1)
+
+    def test_render_name_cache_is_bounded(self):
+        """
+        Test that rendered names from many matches do not accumulate.
+        """
+        with patch("view.font", self.font), patch.dict(view._text_cache, clear=True):
+            for match in range(3 * view.TEXT_CACHE_LIMIT):
+                view._render_name(f"Player {match}")
+                self.assertLessEqual(len(view._text_cache), view.TEXT_CACHE_LIMIT)
+            self.assertIn(f"Player {match}", view._text_cache)
+
+    def test_render_split_screen_shows_both_sides(self):
+        """
+        Test that players too far apart to share the screen each get half of it,
+        with the background scrolled to each camera.
+        """
+        self.model.bullets = []
+        self.model.player2.x = 4150
+        with patch("view.WORLD_WIDTH", 4200):
+            cameras = view.cameras_for(self.model.players)
+            view.follow_players(cameras, self.model.players)
+        self.assertEqual(len(cameras), 2)
+        self.assertEqual(cameras[1].rect()[:3:2], (3700, 4200))
+        self.assertEqual(cameras[1].screen_rect().left, WIDTH // 2)
+        with patch("view.screen", self.screen), patch("view.font", self.font):
+            view.render(self.model, "One", "Two", camera=cameras)
+        # One background tile on the left; the right view starts mid-tile, so
+        # two there. Each player is drawn in its own half only.
+        self.assertEqual(view.frame_stats["sprites"], 1 + 1 + 2 + 1 + 8)
+        self.assertEqual(view.frame_stats["culled"], 2)
+
     def tearDown(self):
         """
         Quit Pygame after each test.
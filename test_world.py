@@ -0,0 +1,253 @@
+"""
+test_world.py
+
+Unit tests for the ChunkGrid and BulletLanes spatial stores in world.py and
+the Model's reduced-rate simulation of chunks away from the players.
+"""
+
+# pylint: disable=no-member,undefined-variable
+
+import random
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import pygame
+from model import Model
+from world import BulletLanes, ChunkGrid
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+
+def _entity(x, y):
+    """
+    Make a bare object the grid can store.
+    """
+    return SimpleNamespace(x=x, y=y, chunk=None)
+
+
+class TestChunkGrid(unittest.TestCase):
+    """
+    Tests for bucketing, moving and querying entities.
+    """
+
+    def setUp(self):
+        self.grid = ChunkGrid(chunk_size=100)
+
+    def test_insert_and_query(self):
+        """
+        Test that a query only returns entities from chunks overlapping the rectangle.
+        """
+        near = _entity(50, 50)
+        far = _entity(950, 50)
+        self.grid.insert(near)
+        self.grid.insert(far)
+        self.assertEqual(near.chunk, (0, 0))
+        self.assertEqual(self.grid.query(0, 0, 150, 150), [near])
+        self.assertEqual(len(self.grid), 2)
+
+    def test_relocate_moves_between_chunks(self):
+        """
+        Test that relocating an entity that crossed a boundary updates its chunk.
+        """
+        entity = _entity(90, 10)
+        self.grid.insert(entity)
+        entity.x = 110
+        self.grid.relocate(entity)
+        self.assertEqual(entity.chunk, (1, 0))
+        self.assertNotIn((0, 0), self.grid.chunks)
+        self.assertEqual(self.grid.query(100, 0, 199, 99), [entity])
+
+    def test_remove(self):
+        """
+        Test that removed entities leave the grid and empty chunks are dropped.
+        """
+        entity = _entity(10, 10)
+        self.grid.insert(entity)
+        self.grid.remove(entity)
+        self.grid.remove(entity)
+        self.assertEqual(self.grid.chunks, {})
+        self.assertIsNone(entity.chunk)
+
+
+def _bullet(x, y, speed):
+    """
+    Make a bare object the lanes can store.
+    """
+    return SimpleNamespace(x=x, y=y, speed=speed)
+
+
+class TestBulletLanes(unittest.TestCase):
+    """
+    Tests for keeping bullets in sorted lanes and finding opposing ones that meet.
+    """
+
+    def setUp(self):
+        self.lanes = BulletLanes(lane_height=10, width=20)
+
+    def advance(self, steps):
+        """
+        Move bullets by some ticks' worth each, as the Model does.
+        """
+        moved = []
+        for bullet, count in steps:
+            start = bullet.x
+            bullet.x += bullet.speed * count
+            self.lanes.move(bullet, start)
+            moved.append((bullet, start))
+        return moved
+
+    def test_lanes_stay_sorted_by_x(self):
+        """
+        Test that bullets are kept in x order per lane and direction, also when
+        one overtakes another with a long step, and that emptied lanes are
+        dropped.
+        """
+        bullets = [_bullet(x, 25, 10) for x in (300, 100, 200)]
+        for bullet in bullets:
+            self.lanes.insert(bullet)
+        self.lanes.insert(_bullet(150, 25, -10))
+        rightward, leftward = self.lanes.lanes[2]
+        self.assertEqual([bullet.x for bullet in rightward], [100, 200, 300])
+        self.advance([(bullets[1], 12)])
+        self.assertEqual([bullet.x for bullet in rightward], [200, 220, 300])
+        self.assertEqual(self.lanes.max_step, 120)
+        self.assertEqual(len(leftward), 1)
+        self.assertEqual(len(self.lanes), 4)
+        for bullet in bullets + leftward[:]:
+            self.lanes.remove(bullet)
+        self.assertEqual(self.lanes.lanes, {})
+
+    def test_crossing_found_across_lanes_without_tunnelling(self):
+        """
+        Test that bullets meeting from adjacent lanes, or passing through each
+        other within one move, are paired, while ones already past are not.
+        """
+        met = (_bullet(90, 19, 10), _bullet(120, 11, -10))
+        passed_this_tick = (_bullet(390, 50, 10), _bullet(380, 52, -10))
+        long_step = (_bullet(560, 60, 10), _bullet(600, 62, -10))
+        passed_before = (_bullet(690, 80, 10), _bullet(660, 80, -10))
+        missed = (_bullet(890, 100, 10), _bullet(910, 110, -10))
+        pairs = (met, passed_this_tick, long_step, passed_before, missed)
+        for pair in pairs:
+            for bullet in pair:
+                self.lanes.insert(bullet)
+        steps = [(bullet, 1) for pair in pairs for bullet in pair]
+        # A far bullet jumps four ticks through one that did not move
+        steps[4:6] = [(long_step[0], 4)]
+        moved = self.advance(steps)
+        self.assertEqual(
+            self.lanes.crossings(moved), [met, passed_this_tick, long_step]
+        )
+
+    def test_crossings_agree_with_all_pairs(self):
+        """
+        Test that only bullets that met are paired, each bullet at most once,
+        and that no meeting pair is left with both bullets unpaired, with
+        bullets moving one step, several or none.
+        """
+        rng = random.Random(5)
+        bullets = [
+            _bullet(
+                rng.randrange(0, 2000), rng.randrange(0, 300), rng.choice((10, -10))
+            )
+            for _ in range(600)
+        ]
+        for bullet in bullets:
+            self.lanes.insert(bullet)
+        moved = self.advance([(bullet, rng.choice((0, 1, 1, 4))) for bullet in bullets])
+        pairs = self.lanes.crossings(moved)
+        for lane in self.lanes.lanes.values():
+            for members in lane:
+                self.assertEqual(members, sorted(members, key=lambda b: b.x))
+        starts = {id(bullet): start for bullet, start in moved}
+
+        def meet(right, left):
+            return (
+                abs(right.y - left.y) < 10
+                and right.x - left.x > -20
+                and starts[id(right)] - starts[id(left)] < 20
+            )
+
+        self.assertGreater(len(pairs), 10)
+        used = [id(bullet) for pair in pairs for bullet in pair]
+        self.assertEqual(len(used), len(set(used)))
+        self.assertTrue(all(meet(right, left) for right, left in pairs))
+        for right in bullets:
+            for left in bullets:
+                if right.speed > 0 > left.speed and meet(right, left):
+                    self.assertTrue(id(right) in used or id(left) in used)
+
+
+class TestChunkedModel(unittest.TestCase):
+    """
+    Tests for the Model's use of chunks.
+    """
+
+    def setUp(self):
+        patcher = patch("pygame.time.get_ticks", return_value=0)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.model = Model()
+        self.model.spawn_alien()
+        self.alien = self.model.aliens[0]
+        self.alien.speed_x = 2
+
+    def test_far_chunks_move_in_larger_steps(self):
+        """
+        Test that an alien away from the players moves every few ticks, covering
+        the same distance overall.
+        """
+        start = self.alien.x
+        positions = []
+        with patch("model.ACTIVE_CHUNK_RADIUS", 0), patch("model.FAR_TICK_STRIDE", 4):
+            for _ in range(4):
+                self.model.update()
+                positions.append(self.alien.x)
+        self.assertEqual(positions[-1], start + 8)
+        self.assertEqual(len(set(positions)), 2)
+
+    def test_far_aliens_move_at_one_speed_both_ways(self):
+        """
+        Test that far aliens crossing into other chunk columns cover the same
+        distance whichever way they fly.
+        """
+        self.alien.x = 400
+        leftward = self.model.spawn_alien()
+        leftward.x = 600
+        leftward.speed_x = -2
+        for alien in (self.alien, leftward):
+            self.model.alien_chunks.relocate(alien)
+        with patch("model.ACTIVE_CHUNK_RADIUS", 0):
+            for _ in range(100):
+                self.model.update()
+        self.assertEqual((self.alien.x, leftward.x), (600, 400))
+
+    def test_focus_keeps_chunk_at_full_rate(self):
+        """
+        Test that the focus region is simulated every tick.
+        """
+        start = self.alien.x
+        y = self.alien.y
+        self.model.focus = [(start - 10, y - 10, start + 10, y + 10)]
+        with patch("model.ACTIVE_CHUNK_RADIUS", 0):
+            self.model.update()
+        self.assertEqual(self.alien.x, start + 2)
+
+    def test_shot_down_alien_leaves_grid(self):
+        """
+        Test that an alien killed by a bullet is removed from the grid and list.
+        """
+        self.alien.health = 1
+        self.model.player1.y = self.alien.y
+        self.alien.x = self.model.player1.x + 15
+        self.model.alien_chunks.relocate(self.alien)
+        self.model.player1.last_shot_time = -1000
+        self.model.add_bullet(1)
+        self.model.update()
+        self.assertEqual(self.model.aliens, [])
+        self.assertEqual(len(self.model.alien_chunks), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,20 +5,49 @@ Handles all rendering logic for Cosmic Clash. This includes drawing players, bul
 backgrounds, health indicators, and scores on the screen. All Pygame screen blitting and
 graphic manipulation is centralized here.
 
+Sprites come pre-scaled from the asset bundle (see assets.py). Each frame, every layer (players, bullets, aliens,
+hearts) is built as one (surface, dest) sequence, culled against the viewport, and
+submitted with a single Surface.blits call. Counts for the last frame are kept in
+`frame_stats`.
+
+When the arena is larger than the window, a Camera selects the slice of the world
+that is drawn; aliens and bullets are then fetched only from the model chunks
+the camera overlaps, so drawing cost follows what is on screen, not world size.
+If the two sides are too far apart to share the screen, it is split with one
+camera per side. The background scrolls with each camera.
+
+Classes:
+    Camera: Viewport into the world, shown in a rectangle of the screen.
+
 Functions:
+    scaled_sprite(image, size): Returns a cached scaled copy of an image.
+    cameras_for(players): Makes one camera, or a split screen, that shows every side.
+    follow_players(cameras, players): Points the cameras at the players.
     draw_player(player): Renders the given player to the screen.
     draw_bullet(bullet): Renders a bullet object.
     draw_alien(alien): Renders an alien object.
     draw_lives(health, x, y): Draws green/red heart icons based on player health.
     draw_score(player1, player2, name1, name2): Displays names and remaining lives.
-    render(model, name1, name2): Central rendering function combining all elements.
+    render(model, name1, name2, effects, camera, present): Central rendering function combining
+        all elements. The camera may be a list of cameras for a split screen, and present=False
+        leaves the frame on the screen surface without flipping it.
     quit_game(): Exits the game and closes Pygame.
 """
 
 # pylint: disable=no-member,undefined-variable
 
 import pygame
-from settings import WIDTH, HEIGHT
+from assets import load_sprite
+from settings import (
+    ALIEN_SIZE,
+    BULLET_SIZE,
+    HEART_SIZE,
+    HEIGHT,
+    PLAYER_SIZE,
+    WIDTH,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
 
 pygame.init()
 
@@ -30,14 +59,219 @@ pygame.display.set_caption("Cosmic Clash")
 clock = pygame.time.Clock()
 font = pygame.font.SysFont(None, 36)
 
+_scaled_cache = {}
+_text_cache = {}
+
+# Most rendered names kept; the cache is emptied when it would grow past this,
+# so names from earlier matches do not pile up
+TEXT_CACHE_LIMIT = 16
+
+# Draw calls, sprites submitted and sprites culled in the last rendered frame
+frame_stats = {"draw_calls": 0, "sprites": 0, "culled": 0}
+
+# When set, the background image is replaced by a plain fill, which costs about
+# half as much; the quality governor sets it on slow machines
+flat_background = False
+BACKGROUND_COLOR = (5, 5, 20)
+
+
+def scaled_sprite(image, size):
+    """
+    Returns an image scaled to the given size, scaling it only the first time.
+    Images already at that size are returned as they are.
+
+    Args:
+        image (pygame.Surface): Source image.
+        size (tuple): Target (width, height).
+
+    Returns:
+        pygame.Surface: The scaled image.
+    """
+    key = (image, size)
+    sprite = _scaled_cache.get(key)
+    if sprite is None:
+        if image.get_size() == size:
+            sprite = image
+        else:
+            sprite = pygame.transform.scale(image, size)
+        _scaled_cache[key] = sprite
+    return sprite
+
+
 # Load images
-player1_img = pygame.image.load("assets/player1.png").convert_alpha()
-player2_img = pygame.image.load("assets/player2.png").convert_alpha()
-alien_img = pygame.image.load("assets/alien.png").convert_alpha()
-background_img = pygame.image.load("assets/space.jpg").convert()
-green_heart_img = pygame.image.load("assets/greenh.png").convert_alpha()
-red_heart_img = pygame.image.load("assets/redh.png").convert_alpha()
-bullet_img = pygame.image.load("assets/bullets.png").convert_alpha()
+background_sprite = load_sprite("background")
+player_sprites = {1: load_sprite("player1"), 2: load_sprite("player2")}
+bullet_sprite = load_sprite("bullet")
+green_heart_sprite = load_sprite("green_heart")
+red_heart_sprite = load_sprite("red_heart")
+
+
+def _render_name(name):
+    """
+    Renders a player name once and reuses the text surface on later frames.
+
+    Args:
+        name (str): Text to render.
+
+    Returns:
+        pygame.Surface: The rendered text.
+    """
+    text = _text_cache.get(name)
+    if text is None:
+        if len(_text_cache) >= TEXT_CACHE_LIMIT:
+            _text_cache.clear()
+        text = font.render(name, True, (255, 255, 255))
+        _text_cache[name] = text
+    return text
+
+
+class Camera:
+    """
+    Viewport into the world, kept inside the arena, shown in a rectangle of
+    the screen.
+
+    Attributes:
+        x (int): World x-coordinate of the left edge of the view.
+        y (int): World y-coordinate of the top edge of the view.
+        width (int): Width of the view.
+        height (int): Height of the view.
+        left (int): Screen x-coordinate the view is drawn at.
+        top (int): Screen y-coordinate the view is drawn at.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, left=0, top=0):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+
+    def follow(self, x, y):
+        """
+        Centres the view on a world point, stopping at the arena edges.
+
+        Args:
+            x (float): World x-coordinate.
+            y (float): World y-coordinate.
+        """
+        self.x = int(max(0, min(x - self.width // 2, WORLD_WIDTH - self.width)))
+        self.y = int(max(0, min(y - self.height // 2, WORLD_HEIGHT - self.height)))
+
+    def rect(self):
+        """
+        Returns the world region in view.
+
+        Returns:
+            tuple: (left, top, right, bottom) in world coordinates.
+        """
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+    def screen_rect(self):
+        """
+        Returns the part of the screen the view is drawn in.
+
+        Returns:
+            pygame.Rect: The rectangle.
+        """
+        return pygame.Rect(self.left, self.top, self.width, self.height)
+
+
+def cameras_for(players):
+    """
+    Makes the cameras that keep every player on screen: one covering the
+    whole screen if all players fit in it together, otherwise a split screen
+    with the left half showing the left side and the right half the right.
+
+    Args:
+        players (list): The match's players.
+
+    Returns:
+        list: The cameras.
+    """
+    xs = [player.x for player in players]
+    if max(xs) - min(xs) + PLAYER_SIZE[0] <= SCREEN_WIDTH:
+        return [Camera()]
+    half = SCREEN_WIDTH // 2
+    return [Camera(half), Camera(SCREEN_WIDTH - half, left=half)]
+
+
+def follow_players(cameras, players):
+    """
+    Points the cameras at the action: a single camera at the middle of all
+    the players, split cameras each at the middle of their side's players.
+
+    Args:
+        cameras (list): Cameras made by cameras_for.
+        players (list): The match's players.
+    """
+    if len(cameras) == 1:
+        groups = [players]
+    else:
+        groups = [
+            [player for player in players if player.side == side]
+            for side in ("left", "right")
+        ]
+    for camera, group in zip(cameras, groups):
+        camera.follow(
+            sum(player.x for player in group) / len(group),
+            sum(player.y for player in group) / len(group),
+        )
+
+
+def _build_layer(entities, sprite_for, size, batch, origin=(0, 0), bounds=None):
+    """
+    Appends a (surface, topleft) pair for each entity that overlaps the viewport.
+
+    Args:
+        entities (iterable): Objects with x, y centre coordinates.
+        sprite_for (callable): Returns the sprite to draw for an entity.
+        size (tuple): On-screen (width, height) of the sprite.
+        batch (list): Sequence the pairs are appended to.
+        origin (tuple): World coordinates of the top-left corner of the screen.
+        bounds (pygame.Rect): Part of the screen being drawn. Defaults to all of it.
+
+    Returns:
+        int: Number of entities culled.
+    """
+    width, height = size
+    half_width, half_height = width // 2, height // 2
+    origin_x, origin_y = origin
+    if bounds is None:
+        view_left, view_top, view_right, view_bottom = 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT
+    else:
+        view_left, view_top = bounds.left, bounds.top
+        view_right, view_bottom = bounds.right, bounds.bottom
+    culled = 0
+    for entity in entities:
+        left = int(entity.x) - half_width - origin_x
+        top = int(entity.y) - half_height - origin_y
+        if (
+            left >= view_right
+            or top >= view_bottom
+            or left + width <= view_left
+            or top + height <= view_top
+        ):
+            culled += 1
+            continue
+        batch.append((sprite_for(entity), (left, top)))
+    return culled
+
+
+def _heart_batch(health, x, y, batch):
+    """
+    Appends the three heart icons of one player to a blit sequence.
+
+    Args:
+        health (int): Current health (0 to 3).
+        x (int): X-position to start drawing.
+        y (int): Y-position to draw the hearts.
+        batch (list): Sequence the pairs are appended to.
+    """
+    step = HEART_SIZE[0] + 5
+    for i in range(3):
+        heart = green_heart_sprite if i < health else red_heart_sprite
+        batch.append((heart, (x + i * step, y)))
 
 
 def draw_player(player):
@@ -47,10 +281,8 @@ def draw_player(player):
     Args:
         player (Player): The player object containing position and ID.
     """
-    img = player1_img if player.player_id == 1 else player2_img
-    scaled_img = pygame.transform.scale(img, (50, 50))
-    rect = scaled_img.get_rect(center=(int(player.x), int(player.y)))
-    screen.blit(scaled_img, rect)
+    sprite = player_sprites[1 if player.player_id == 1 else 2]
+    screen.blit(sprite, sprite.get_rect(center=(int(player.x), int(player.y))))
 
 
 def draw_bullet(bullet):
@@ -60,9 +292,9 @@ def draw_bullet(bullet):
     Args:
         bullet (Bullet): The bullet object with x, y coordinates.
     """
-    scaled_bullet = pygame.transform.scale(bullet_img, (20, 10))
-    rect = scaled_bullet.get_rect(center=(int(bullet.x), int(bullet.y)))
-    screen.blit(scaled_bullet, rect)
+    screen.blit(
+        bullet_sprite, bullet_sprite.get_rect(center=(int(bullet.x), int(bullet.y)))
+    )
 
 
 def draw_alien(alien):
@@ -72,9 +304,8 @@ def draw_alien(alien):
     Args:
         alien (Alien): The alien object to render.
     """
-    scaled_alien = pygame.transform.scale(alien.image, (60, 60))
-    rect = scaled_alien.get_rect(center=(int(alien.x), int(alien.y)))
-    screen.blit(scaled_alien, rect)
+    sprite = scaled_sprite(alien.image, ALIEN_SIZE)
+    screen.blit(sprite, sprite.get_rect(center=(int(alien.x), int(alien.y))))
 
 
 def draw_lives(health, x, y):
@@ -86,13 +317,9 @@ def draw_lives(health, x, y):
         x (int): X-position to start drawing.
         y (int): Y-position to draw the hearts.
     """
-    heart_size = 30
-    for i in range(3):
-        heart_img = green_heart_img if i < health else red_heart_img
-        screen.blit(
-            pygame.transform.scale(heart_img, (heart_size, heart_size)),
-            (x + i * (heart_size + 5), y),
-        )
+    batch = []
+    _heart_batch(health, x, y, batch)
+    screen.blits(batch, doreturn=False)
 
 
 def draw_score(player1, player2, name1, name2):
@@ -104,16 +331,118 @@ def draw_score(player1, player2, name1, name2):
         player2 (Player): Player 2 instance.
         name1 (str): Player 1 name.
         name2 (str): Player 2 name.
+
+    Returns:
+        tuple: (draw calls, sprites) issued.
     """
-    text1 = font.render(name1, True, (255, 255, 255))
-    text2 = font.render(name2, True, (255, 255, 255))
-    screen.blit(text1, (10, 10))
-    draw_lives(player1.get_health(), 10, 50)
-    screen.blit(text2, (SCREEN_WIDTH - 150, 10))
-    draw_lives(player2.get_health(), SCREEN_WIDTH - 150, 50)
+    batch = [
+        (_render_name(name1), (10, 10)),
+        (_render_name(name2), (SCREEN_WIDTH - 150, 10)),
+    ]
+    _heart_batch(player1.get_health(), 10, 50, batch)
+    _heart_batch(player2.get_health(), SCREEN_WIDTH - 150, 50, batch)
+    screen.blits(batch, doreturn=False)
+    return 1, len(batch)
 
 
-def render(model, name1, name2):
+def _render_view(model, effects, camera):
+    """
+    Draws the background, entities and effects of one view.
+
+    Args:
+        model (Model): The current game state.
+        effects (ParticleSystem): Particles drawn above the entities, if any.
+        camera (Camera): View into the world, or None for the top-left of the
+            world on the whole screen, considering every entity.
+
+    Returns:
+        tuple: (draw calls, sprites, culled) for the view.
+    """
+    if camera is None:
+        origin = (0, 0)
+        bounds = screen.get_rect()
+        aliens, bullets = model.aliens, model.bullets
+    else:
+        origin = (camera.x - camera.left, camera.y - camera.top)
+        bounds = camera.screen_rect()
+        left, top, right, bottom = camera.rect()
+        reach = ALIEN_SIZE[0]
+        aliens = model.alien_chunks.query(
+            left - reach, top - reach, right + reach, bottom + reach
+        )
+        bullets = model.bullet_chunks.query(
+            left - reach, top - reach, right + reach, bottom + reach
+        )
+    screen.set_clip(bounds)
+
+    if flat_background:
+        screen.fill(BACKGROUND_COLOR, bounds)
+        background = 0
+    else:
+        # Tile the background so it scrolls with the camera
+        tile_width, tile_height = background_sprite.get_size()
+        tiles = [
+            (background_sprite, (tile_x, tile_y))
+            for tile_y in range(
+                bounds.top - (origin[1] + bounds.top) % tile_height,
+                bounds.bottom,
+                tile_height,
+            )
+            for tile_x in range(
+                bounds.left - (origin[0] + bounds.left) % tile_width,
+                bounds.right,
+                tile_width,
+            )
+        ]
+        screen.blits(tiles, doreturn=False)
+        background = len(tiles)
+    draw_calls = 1
+    sprites = background
+    culled = 0
+
+    aliens = [alien for alien in aliens if alien.get_alive()]
+    layers = (
+        (
+            model.players,
+            lambda player: player_sprites[1 if player.side == "left" else 2],
+            PLAYER_SIZE,
+        ),
+        (bullets, lambda bullet: bullet_sprite, BULLET_SIZE),
+        (aliens, lambda alien: scaled_sprite(alien.image, ALIEN_SIZE), ALIEN_SIZE),
+    )
+    for entities, sprite_for, size in layers:
+        batch = []
+        culled += _build_layer(entities, sprite_for, size, batch, origin, bounds)
+        if batch:
+            screen.blits(batch, doreturn=False)
+            draw_calls += 1
+            sprites += len(batch)
+
+    if effects is not None:
+        drawn = effects.draw(screen, origin)
+        if drawn:
+            draw_calls += 1
+            sprites += drawn
+
+    if len(model.players) > 2:
+        # Extra players get their hearts drawn just above their ship
+        batch = []
+        for player in model.players[2:]:
+            _heart_batch(
+                player.get_health(),
+                int(player.x) - PLAYER_SIZE[0] // 2 - origin[0],
+                int(player.y) - PLAYER_SIZE[1] // 2 - HEART_SIZE[1] - origin[1],
+                batch,
+            )
+        screen.blits(batch, doreturn=False)
+        draw_calls += 1
+        sprites += len(batch)
+
+    screen.set_clip(None)
+    return draw_calls, sprites, culled
+
+
+def render(model, name1, name2, effects=None, camera=None, present=True):
     """
     Master rendering function called each frame to update the screen.
 
@@ -121,24 +450,43 @@ def render(model, name1, name2):
         model (Model): The current game state.
         name1 (str): Name of player 1.
         name2 (str): Name of player 2.
+        effects (ParticleSystem): Particles drawn above the entities, if any.
+        camera (Camera | list): View into the world, or a list of views for a
+            split screen. Without one the top-left of the world is drawn and
+            every entity is considered.
+        present (bool): Flip the frame to the window. Headless exports leave
+            it in the screen surface instead.
     """
-    screen.blit(
-        pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0)
-    )
-
-    draw_player(model.player1)
-    draw_player(model.player2)
-
-    for bullet in model.bullets:
-        draw_bullet(bullet)
+    cameras = camera if isinstance(camera, list) else [camera]
+    draw_calls = sprites = culled = 0
+    for view_camera in cameras:
+        view_calls, view_sprites, view_culled = _render_view(
+            model, effects, view_camera
+        )
+        draw_calls += view_calls
+        sprites += view_sprites
+        culled += view_culled
+    for view_camera in cameras[1:]:
+        # Divider between the halves of a split screen
+        pygame.draw.line(
+            screen,
+            (255, 255, 255),
+            (view_camera.left, 0),
+            (view_camera.left, SCREEN_HEIGHT),
+            2,
+        )
+        draw_calls += 1
 
-    for alien in model.aliens:
-        if alien.get_alive():
-            draw_alien(alien)
+    hud_calls, hud_sprites = draw_score(model.player1, model.player2, name1, name2)
+    draw_calls += hud_calls
+    sprites += hud_sprites
 
-    draw_score(model.player1, model.player2, name1, name2)
+    frame_stats["draw_calls"] = draw_calls
+    frame_stats["sprites"] = sprites
+    frame_stats["culled"] = culled
 
-    pygame.display.flip()
+    if present:
+        pygame.display.flip()
 
 
 def quit_game():
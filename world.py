@@ -0,0 +1,268 @@
+"""
+world.py
+
+Spatial storage for the arena. Entities are bucketed into square chunks by
+their world position, so code that only cares about one region of a large
+arena (a bullet's surroundings, the camera's view) touches the few chunks
+that overlap it instead of every entity in the world.
+
+Bullets are also kept in horizontal lanes sorted by x, so the opposing
+bullets a moving bullet may have met are found with a binary search instead
+of testing every pair.
+
+Classes:
+    ChunkGrid: Buckets entities by the chunk their position falls in.
+    BulletLanes: Bullets by height lane and direction, sorted by x.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
+from settings import BULLET_SIZE, CHUNK_SIZE
+
+_by_x = attrgetter("x")
+
+
+class ChunkGrid:
+    """
+    Entities bucketed by chunk. Each stored entity carries a ``chunk``
+    attribute holding the key of the bucket it is in, so moving or removing
+    it never needs a search across buckets.
+
+    Attributes:
+        chunk_size (int): Side of a chunk in world pixels.
+        chunks (dict): (column, row) -> list of entities in that chunk. Empty
+            chunks are dropped.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = {}
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.chunks.values())
+
+    def key_for(self, x, y):
+        """
+        Get the key of the chunk containing a point.
+        Args:
+            x (float): World x-coordinate.
+            y (float): World y-coordinate.
+        Returns:
+            tuple: (column, row).
+        """
+        return int(x) // self.chunk_size, int(y) // self.chunk_size
+
+    def insert(self, entity):
+        """
+        Add an entity to the chunk its position falls in.
+        Args:
+            entity: Object with x and y attributes.
+        """
+        key = self.key_for(entity.x, entity.y)
+        entity.chunk = key
+        self.chunks.setdefault(key, []).append(entity)
+
+    def remove(self, entity):
+        """
+        Take an entity out of the grid. Entities that are not stored are ignored.
+        Args:
+            entity: A previously inserted entity.
+        """
+        bucket = self.chunks.get(getattr(entity, "chunk", None))
+        if bucket is None or entity not in bucket:
+            return
+        bucket.remove(entity)
+        if not bucket:
+            del self.chunks[entity.chunk]
+        entity.chunk = None
+
+    def relocate(self, entity):
+        """
+        Move an entity to a new chunk if its position has left its current one.
+        Args:
+            entity: A previously inserted entity.
+        """
+        key = self.key_for(entity.x, entity.y)
+        if key != entity.chunk:
+            self.remove(entity)
+            entity.chunk = key
+            self.chunks.setdefault(key, []).append(entity)
+
+    def keys_in(self, left, top, right, bottom):
+        """
+        Get the keys of every chunk overlapping a world rectangle, whether or
+        not anything is stored there.
+        Args:
+            left (float): Left edge.
+            top (float): Top edge.
+            right (float): Right edge.
+            bottom (float): Bottom edge.
+        Returns:
+            set: (column, row) keys.
+        """
+        first_col, first_row = self.key_for(left, top)
+        last_col, last_row = self.key_for(right, bottom)
+        return {
+            (col, row)
+            for col in range(first_col, last_col + 1)
+            for row in range(first_row, last_row + 1)
+        }
+
+    def query(self, left, top, right, bottom):
+        """
+        Get the entities stored in the chunks overlapping a world rectangle.
+        The result may include entities just outside the rectangle; callers
+        still run their own exact test.
+        Args:
+            left (float): Left edge.
+            top (float): Top edge.
+            right (float): Right edge.
+            bottom (float): Bottom edge.
+        Returns:
+            list: The entities.
+        """
+        chunks = self.chunks
+        found = []
+        for key in self.keys_in(left, top, right, bottom):
+            bucket = chunks.get(key)
+            if bucket:
+                found.extend(bucket)
+        return found
+
+
+class BulletLanes:
+    """
+    Bullets bucketed into horizontal lanes by height, each lane holding one
+    list per direction of travel sorted by x. Bullets fly straight, so they
+    never change lane, and a move only reorders a list when one bullet
+    overtakes another.
+
+    Attributes:
+        lane_height (int): Height of a lane in world pixels, the bullet
+            height, so bullets close enough to touch are in the same or an
+            adjacent lane.
+        width (int): Bullet width in world pixels.
+        lanes (dict): lane -> (rightward bullets, leftward bullets), both
+            sorted by x. Empty lanes are dropped.
+        max_step (int): Longest single move seen, which bounds how far apart
+            two bullets that met during one tick can be.
+    """
+
+    def __init__(self, lane_height=BULLET_SIZE[1], width=BULLET_SIZE[0]):
+        self.lane_height = lane_height
+        self.width = width
+        self.lanes = {}
+        self.max_step = 0
+
+    def __len__(self):
+        return sum(len(right) + len(left) for right, left in self.lanes.values())
+
+    def _list_for(self, bullet):
+        """
+        Get the lane list a bullet belongs in, creating its lane if needed.
+        Args:
+            bullet: Object with x, y and speed attributes.
+        Returns:
+            list: The bullets of its lane flying its way.
+        """
+        lane = self.lanes.setdefault(int(bullet.y) // self.lane_height, ([], []))
+        return lane[0] if bullet.speed > 0 else lane[1]
+
+    def insert(self, bullet):
+        """
+        Add a bullet to its lane, keeping the lane sorted.
+        Args:
+            bullet: Object with x, y and speed attributes.
+        """
+        insort(self._list_for(bullet), bullet, key=_by_x)
+
+    def move(self, bullet, start):
+        """
+        Keep a bullet's lane sorted after it moved along x.
+        Args:
+            bullet: A previously inserted bullet, at its new x.
+            start (int): Its x before the move.
+        """
+        self.max_step = max(self.max_step, abs(bullet.x - start))
+        members = self._list_for(bullet)
+        # Everything but this bullet is still sorted, so searching for the
+        # lower of its two positions lands at or before it
+        i = bisect_left(members, min(start, bullet.x), key=_by_x)
+        while members[i] is not bullet:
+            i += 1
+        if (i + 1 < len(members) and members[i + 1].x < bullet.x) or (
+            i > 0 and members[i - 1].x > bullet.x
+        ):
+            del members[i]
+            insort(members, bullet, key=_by_x)
+
+    def remove(self, bullet):
+        """
+        Take a bullet out of its lane. Bullets that are not stored are ignored.
+        Args:
+            bullet: A previously inserted bullet.
+        """
+        key = int(bullet.y) // self.lane_height
+        lane = self.lanes.get(key)
+        if lane is None:
+            return
+        members = lane[0] if bullet.speed > 0 else lane[1]
+        if bullet in members:
+            members.remove(bullet)
+            if not lane[0] and not lane[1]:
+                del self.lanes[key]
+
+    def crossings(self, moved):
+        """
+        Find the opposing bullets that met during this tick's moves: their
+        boxes overlap vertically and along x they overlap now or have passed
+        each other, without having been past each other before. Bullets that
+        did not move cannot have met anything new, so only the moved ones are
+        looked up, in the opposing lists of their lane and the two next to it.
+        A bullet meets at most one other, the first it reached.
+        Args:
+            moved (list): (bullet, x before the move) for every bullet that
+                moved this tick, all already passed to move().
+        Returns:
+            list: (rightward, leftward) pairs, in the order of moved.
+        """
+        starts = {id(bullet): start for bullet, start in moved}
+        width = self.width
+        taken = set()
+        pairs = []
+        for bullet, start in moved:
+            if id(bullet) in taken:
+                continue
+            rightward = bullet.speed > 0
+            if rightward:
+                low, high = start - width - self.max_step, bullet.x + width
+            else:
+                low, high = bullet.x - width, start + width + self.max_step
+            key = int(bullet.y) // self.lane_height
+            best, best_gap = None, None
+            for lane_key in (key - 1, key, key + 1):
+                lane = self.lanes.get(lane_key)
+                if lane is None:
+                    continue
+                others = lane[1] if rightward else lane[0]
+                for i in range(bisect_right(others, low, key=_by_x), len(others)):
+                    other = others[i]
+                    if other.x >= high:
+                        break
+                    if (
+                        id(other) in taken
+                        or abs(other.y - bullet.y) >= self.lane_height
+                    ):
+                        continue
+                    right, left = (bullet, other) if rightward else (other, bullet)
+                    # Distance between them before the move; the smallest
+                    # was reached first
+                    gap = starts.get(id(left), left.x) - starts.get(id(right), right.x)
+                    if right.x - left.x > -width and gap > -width:
+                        if best is None or gap < best_gap:
+                            best, best_gap = other, gap
+            if best is not None:
+                taken.add(id(bullet))
+                taken.add(id(best))
+                pairs.append((bullet, best) if rightward else (best, bullet))
+        return pairs